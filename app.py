@@ -2,89 +2,568 @@ import streamlit as st
 import pandas as pd
 import json
 import os
-from json_utils import load_json_file, json_to_dataframe, get_json_structure, validate_json_format
+import tempfile
+import weakref
+from json_utils import load_validated_json_bytes, load_json_dataframe, lazy_json_dataset, get_json_structure, MAX_JSON_SIZE, DEFAULT_MEMORY_BUDGET
+from schema_inference import infer_json_schema
+from data_loaders import lazy_tabular_bytes, lazy_excel_bytes, report_progress, ARROW_AVAILABLE
+from excel_loader import list_excel_sheets
+from parquet_footer import read_parquet_footer, footer_missing_data, footer_column_types
+from lazy_dataset import LazyDataset
 from data_analyzer import DataAnalyzer
-from visualizer import JSONVisualizer
+from compute_backend import ComputeBackend, DuckDBBackend, choose_engine, DUCKDB_AVAILABLE, DUCKDB_EXTENSIONS
+from visualizer import JSONVisualizer, SCATTER_POINT_THRESHOLD
+from data_cache import DataCache, JSON_MEMORY_FACTOR
+from disk_cache import DiskCache
+from dtype_optimizer import DtypeOptimizer
+from instrumentation import Tracer, start_tracing, stop_tracing, span
+from data_pager import PAGE_SIZES, DEFAULT_PAGE_SIZE, sort_order, filter_mask, select_rows, get_page, page_count
 import plotly.graph_objects as go
-import tempfile
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Union, Optional, Callable, Iterator
+from contextlib import contextmanager
 import numpy as np
 
 
-def process_data_file(df: pd.DataFrame, uploaded_file, temp_file_path: str):
+@st.cache_resource
+def get_data_cache() -> DataCache:
+    """Get the process-wide cache of parsed uploads shared by all sessions, backed by the disk cache."""
+    try:
+        disk = DiskCache()
+    except OSError:
+        # Without a writable cache directory, uploads are only cached in memory
+        disk = None
+    return DataCache(disk=disk)
+
+
+def open_stored_dataset(cache_key: str) -> Optional[LazyDataset]:
     """
-    Process a DataFrame and display analysis results.
+    Get the dataset of an upload from memory or from its converted copy on disk.
+    
+    Args:
+        cache_key (str): Key of the upload in the data cache
+        
+    Returns:
+        LazyDataset or None: The dataset, None if the upload was not converted before
+    """
+    data_cache = get_data_cache()
+    dataset = data_cache.get(cache_key, 'dataset')
+    if dataset is None and data_cache.disk is not None:
+        dataset = data_cache.disk.open_dataset(cache_key, 'frame')
+        if dataset is not None:
+            data_cache.put(cache_key, 'dataset', dataset)
+    return dataset
+
+
+def load_dataset(cache_key: str, load: Callable[[], LazyDataset]) -> LazyDataset:
+    """
+    Get the dataset of an upload, loading it from the file only if no converted copy exists.
+    
+    Args:
+        cache_key (str): Key of the upload in the data cache
+        load (callable): Opens the dataset from the uploaded content
+        
+    Returns:
+        LazyDataset: The dataset
+    """
+    dataset = open_stored_dataset(cache_key)
+    if dataset is None:
+        dataset = get_data_cache().get_or_compute(cache_key, 'dataset', load)
+    return dataset
+
+
+def open_duckdb_backend(file_bytes: bytes, file_extension: str) -> DuckDBBackend:
+    """
+    Open an upload with the DuckDB engine, which queries a file on disk.
+    
+    Args:
+        file_bytes (bytes): Uploaded content
+        file_extension (str): Format of the upload
+        
+    Returns:
+        DuckDBBackend: Backend over a temporary copy of the upload, removed with the backend
+    """
+    handle, path = tempfile.mkstemp(suffix=f".{file_extension}", prefix="json-visualizer-")
+    with os.fdopen(handle, 'wb') as f:
+        f.write(file_bytes)
+    try:
+        backend = DuckDBBackend(path, file_extension)
+    except Exception:
+        os.remove(path)
+        raise
+    # The copy is needed as long as the cached backend queries it
+    weakref.finalize(backend, os.remove, path)
+    return backend
+
+
+def display_file_info(uploaded_file, file_size: int):
+    """
+    Display the name and size of the uploaded file.
     
     Args:
-        df (pd.DataFrame): DataFrame to analyze
         uploaded_file: Uploaded file object
-        temp_file_path (str): Path to temporary file
+        file_size (int): Size of the uploaded file in bytes
     """
-    # Display basic information
     st.markdown('<h2 class="sub-header">File Information</h2>', unsafe_allow_html=True)
-    file_size = os.path.getsize(temp_file_path)
     col1, col2 = st.columns(2)
     with col1:
         st.markdown(f'<div class="info-box"><strong>File name:</strong> {uploaded_file.name}</div>', unsafe_allow_html=True)
     with col2:
         st.markdown(f'<div class="info-box"><strong>File size:</strong> {file_size / (1024*1024):.2f} MB</div>', unsafe_allow_html=True)
+
+
+def process_data_file(data: Union[pd.DataFrame, LazyDataset], uploaded_file, file_size: int, cache_key: str,
+                      optimizer: Optional[DtypeOptimizer] = None, footer: Optional[Dict[str, Any]] = None):
+    """
+    Process a DataFrame and display analysis results.
+    
+    Args:
+        data (pd.DataFrame or LazyDataset): Data to analyze
+        uploaded_file: Uploaded file object
+        file_size (int): Size of the uploaded file in bytes
+        cache_key (str): Key of the upload in the data cache
+        optimizer (DtypeOptimizer, optional): Optimizer applied to the loaded data
+        footer (dict, optional): Parquet footer profile of the file (see read_parquet_footer)
+    """
+    display_file_info(uploaded_file, file_size)
+    if isinstance(data, LazyDataset):
+        display_dataset(data, cache_key, optimizer, footer)
+    else:
+        display_analysis(data, cache_key, optimizer=optimizer)
+
+
+def display_dataset(dataset: LazyDataset, cache_key: str, optimizer: Optional[DtypeOptimizer] = None,
+                    footer: Optional[Dict[str, Any]] = None):
+    """
+    Let the user choose which columns to load, then analyze them.
+    
+    Only the selected columns are read from the file; other columns are read
+    when a chart first uses them. With a Parquet footer, even the selected
+    columns are only read by the sections that need their values.
+    
+    Args:
+        dataset (LazyDataset): Dataset over the uploaded file
+        cache_key (str): Key of the upload in the data cache
+        optimizer (DtypeOptimizer, optional): Optimizer applied to the loaded columns
+        footer (dict, optional): Parquet footer profile of the file (see read_parquet_footer)
+    """
+    with st.expander(f"Columns to load ({len(dataset.columns)} available)", expanded=False):
+        chosen = st.multiselect("Columns to read and analyze", dataset.columns, default=dataset.columns, key=f"load_columns_{cache_key}")
+    selection = [col for col in dataset.columns if col in chosen]
+    if not selection:
+        st.markdown('<div class="warning-box">Select at least one column to analyze.</div>', unsafe_allow_html=True)
+        return
+    
+    # Results of a partial selection are cached under their own key
+    analysis_key = cache_key if len(selection) == len(dataset.columns) else DataCache.make_key(cache_key.encode(), columns=selection)
+    if footer is not None:
+        display_footer_analysis(dataset, selection, cache_key, analysis_key, footer)
+        return
+    
+    df = fetch_columns(dataset, selection, cache_key)
+    display_analysis(df, analysis_key, dataset, optimizer)
+
+
+def fetch_columns(dataset: LazyDataset, columns: List[str], cache_key: str) -> pd.DataFrame:
+    """
+    Load columns of a dataset and update its cache entries.
+    
+    Args:
+        dataset (LazyDataset): Dataset over the uploaded file
+        columns (list): Columns to load
+        cache_key (str): Key of the upload in the data cache
+        
+    Returns:
+        pd.DataFrame: The requested columns in source order, even after charts load further columns
+    """
+    with progress_bar("Reading columns"):
+        df = dataset.fetch(columns)
+    # Re-measure the cached dataset now that its columns are loaded
+    get_data_cache().put(cache_key, 'dataset', dataset)
+    if len(dataset.loaded_columns) == len(dataset.columns):
+        # Keep the converted columns on disk so a later upload of the same file skips conversion
+        get_data_cache().persist(cache_key, 'frame', dataset.frame)
+    if len(columns) == len(dataset.columns):
+        return df
+    wanted = set(columns)
+    return df[[col for col in df.columns if col in wanted]]
+
+
+def display_footer_analysis(dataset: LazyDataset, columns: List[str], cache_key: str, analysis_key: str,
+                            footer: Dict[str, Any]):
+    """
+    Display the analysis of a Parquet file, reading column data only where values are needed.
+    
+    The overview, column types and missing data come from the file footer. The
+    preview reads the first rows, summary statistics read the numeric columns, charts
+    read the columns they plot and the complete dataset is read when browsed.
+    
+    Args:
+        dataset (LazyDataset): Dataset over the uploaded file
+        columns (list): Selected columns
+        cache_key (str): Key of the upload in the data cache
+        analysis_key (str): Key of the results for the selected columns
+        footer (dict): Parquet footer profile of the file (see read_parquet_footer)
+    """
+    data_cache = get_data_cache()
+    selected = set(columns)
+    numeric_columns = [col for col in footer['numeric_columns'] if col in selected]
+    categorical_columns = [col for col in footer['categorical_columns'] if col in selected]
     
     # Display data preview
     st.markdown('<h2 class="sub-header">Data Preview</h2>', unsafe_allow_html=True)
-    st.dataframe(df.head(10), width='stretch')
-    
-    # Initialize analyzer and visualizer
-    analyzer = DataAnalyzer(df)
-    visualizer = JSONVisualizer(df)
+    st.dataframe(dataset.sample[columns].head(10), width='stretch')
     
-    # Display basic info
-    info = analyzer.get_basic_info()
     st.markdown('<h2 class="sub-header">Dataset Overview</h2>', unsafe_allow_html=True)
+    display_overview_cards(footer['rows'], len(columns), len(numeric_columns), len(categorical_columns))
+    st.markdown(f'<div class="info-box">Read from the Parquet footer: {footer["rows"]:,} rows in {footer["row_groups"]} row group{"s" if footer["row_groups"] != 1 else ""}. Column data is only read for summary statistics, charts and browsing.</div>', unsafe_allow_html=True)
+    with st.expander("View column types and recorded statistics", expanded=False):
+        st.dataframe(footer_column_types(footer, columns), width='stretch')
+    
+    # Summary statistics need the values of the numeric columns
+    st.markdown('<h2 class="sub-header">Statistical Summary</h2>', unsafe_allow_html=True)
+    section, is_open = lazy_expander("Summary statistics of numeric columns", "summary_section")
+    with section:
+        if is_open:
+            if numeric_columns:
+                summary_stats = data_cache.get_or_compute(
+                    analysis_key, 'summary_statistics',
+                    lambda: DataAnalyzer(fetch_columns(dataset, numeric_columns, cache_key)).get_summary_statistics(),
+                    persist=True)
+                st.dataframe(summary_stats, width='stretch')
+            else:
+                st.markdown('<div class="warning-box">No numeric columns found for summary statistics.</div>', unsafe_allow_html=True)
+    
+    # Null counts are recorded per row group; only columns without them are read
+    st.markdown('<h2 class="sub-header">Missing Data Analysis</h2>', unsafe_allow_html=True)
+    section, is_open = lazy_expander("Missing values per column", "missing_section")
+    with section:
+        if is_open:
+            missing_data = data_cache.get_or_compute(
+                analysis_key, 'missing_data',
+                lambda: footer_missing_data(footer, columns, lambda unknown: fetch_columns(dataset, unknown, cache_key)))
+            if not missing_data.empty:
+                st.dataframe(missing_data, width='stretch')
+            else:
+                st.markdown('<div class="success-box">No missing data found in the dataset.</div>', unsafe_allow_html=True)
+    
+    # Visualization section; charts read the columns they plot, including columns left out of the selection
+    st.markdown('<h2 class="sub-header">Data Visualization</h2>', unsafe_allow_html=True)
+    display_charts(JSONVisualizer(dataset),
+                   numeric_columns + [col for col in footer['numeric_columns'] if col not in selected],
+                   categorical_columns + [col for col in footer['categorical_columns'] if col not in selected],
+                   numeric_columns, footer['rows'])
+    
+    # Show full dataset
+    st.markdown('<h2 class="sub-header">Complete Dataset</h2>', unsafe_allow_html=True)
+    section, is_open = lazy_expander(f"Browse all {footer['rows']:,} rows", "complete_section")
+    with section:
+        if is_open:
+            display_complete_dataset(fetch_columns(dataset, columns, cache_key), analysis_key)
+
+
+def lazy_expander(label: str, key: str) -> Tuple[Any, bool]:
+    """
+    Create an expander that reports whether it is open, so its content is only computed when viewed.
+    
+    Args:
+        label (str): Expander label
+        key (str): Widget key holding the open state
+        
+    Returns:
+        tuple: (expander, whether it is open); Streamlit versions without expander
+            state always report it open
+    """
+    try:
+        expander = st.expander(label, key=key, on_change="rerun")
+    except TypeError:
+        return st.expander(label), True
+    return expander, bool(expander.open)
+
+
+def lazy_tabs(labels: List[str], key: str) -> List[Tuple[Any, bool]]:
+    """
+    Create tabs that report which one is open, so only its content is computed.
+    
+    Args:
+        labels (list): Tab labels
+        key (str): Widget key holding the open tab
+        
+    Returns:
+        list: (tab, whether it is open) per label; Streamlit versions without tab
+            state report every tab open
+    """
+    try:
+        tabs = st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        return [(tab, True) for tab in st.tabs(labels)]
+    return [(tab, bool(tab.open)) for tab in tabs]
+
+
+@contextmanager
+def progress_bar(label: str) -> Iterator[None]:
+    """
+    Show a progress bar while CSV/TSV data is read inside the block, removed afterwards.
+    
+    Args:
+        label (str): Text shown with the bytes and rows read
+    """
+    placeholder = st.empty()
+    
+    def update(bytes_read: int, total_bytes: int, rows_read: int):
+        fraction = min(bytes_read / total_bytes, 1.0) if total_bytes else 0.0
+        placeholder.progress(fraction, text=f"{label}: {bytes_read / (1024 * 1024):.1f} of "
+                                            f"{total_bytes / (1024 * 1024):.1f} MB, {rows_read:,} rows")
+    
+    try:
+        with report_progress(update):
+            yield
+    finally:
+        placeholder.empty()
+
+
+def display_diagnostics(tracer: Tracer):
+    """
+    Display where the time and memory of this run went.
+    
+    Args:
+        tracer (Tracer): Tracer that collected the spans of the run
+    """
+    records = tracer.to_records()
+    with st.expander(f"Performance diagnostics ({len(records)} stages)", expanded=False):
+        if not records:
+            st.markdown('<div class="info-box">Nothing was computed in this run; all results came from the cache.</div>', unsafe_allow_html=True)
+            return
+        mb = 1024 * 1024
+        table = pd.DataFrame({
+            'stage': ['\u2003' * record['depth'] + record['name'] for record in records],
+            'duration (ms)': [record['duration'] * 1000 for record in records],
+            'rows': [record['rows'] for record in records],
+            'MB processed': [record['bytes'] / mb if record['bytes'] is not None else None for record in records],
+            'peak RSS (MB)': [record['peak_rss'] / mb if record['peak_rss'] is not None else None for record in records],
+            'error': [record['error'] for record in records]
+        })
+        top_level = sum(record['duration'] for record in records if record['depth'] == 0)
+        st.markdown(f'<div class="info-box">{top_level:.2f}s spent in instrumented stages</div>', unsafe_allow_html=True)
+        st.dataframe(table, width='stretch', hide_index=True)
+        st.download_button("Download structured log (JSON lines)", tracer.to_json_lines(),
+                           file_name="diagnostics.jsonl", mime="application/x-ndjson")
+
+
+def display_memory_report(optimizer: DtypeOptimizer):
+    """
+    Display the memory saved by dtype optimization.
+    
+    Args:
+        optimizer (DtypeOptimizer): Optimizer applied to the loaded data
+    """
+    report = optimizer.get_report()
+    if not report['memory_before']:
+        return
+    before = report['memory_before'] / (1024*1024)
+    after = report['memory_after'] / (1024*1024)
+    ratio = report['memory_before'] / max(report['memory_after'], 1)
+    st.markdown(f'<div class="info-box"><strong>Memory optimization:</strong> {before:.2f} MB → {after:.2f} MB ({ratio:.1f}x smaller) after compacting {len(report["changes"])} column types</div>', unsafe_allow_html=True)
+    if report['changes']:
+        with st.expander("View column type changes", expanded=False):
+            st.dataframe(pd.DataFrame.from_dict(report['changes'], orient='index', columns=['Before', 'After']), width='stretch')
+
+
+def display_overview_cards(rows: int, columns: int, numeric_columns: int, categorical_columns: int):
+    """
+    Display the row, column and column type counts as metric cards.
+    
+    Args:
+        rows (int): Number of rows
+        columns (int): Number of columns
+        numeric_columns (int): Number of numeric columns
+        categorical_columns (int): Number of categorical columns
+    """
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.markdown(f'''
         <div class="metric-card">
-            <div class="metric-value">{info['shape'][0]}</div>
+            <div class="metric-value">{rows}</div>
             <div class="metric-label">ROWS</div>
         </div>
         ''', unsafe_allow_html=True)
     with col2:
         st.markdown(f'''
         <div class="metric-card">
-            <div class="metric-value">{info['shape'][1]}</div>
+            <div class="metric-value">{columns}</div>
             <div class="metric-label">COLUMNS</div>
         </div>
         ''', unsafe_allow_html=True)
     with col3:
         st.markdown(f'''
         <div class="metric-card">
-            <div class="metric-value">{len(info['numeric_columns'])}</div>
+            <div class="metric-value">{numeric_columns}</div>
             <div class="metric-label">NUMERIC COLS</div>
         </div>
         ''', unsafe_allow_html=True)
     with col4:
         st.markdown(f'''
         <div class="metric-card">
-            <div class="metric-value">{len(info['categorical_columns'])}</div>
+            <div class="metric-value">{categorical_columns}</div>
             <div class="metric-label">CATEGORY COLS</div>
         </div>
         ''', unsafe_allow_html=True)
+
+
+def display_charts(visualizer: JSONVisualizer, numeric_columns: List[str], categorical_columns: List[str],
+                   correlation_columns: List[str], row_count: int):
+    """
+    Display the chart tabs.
+    
+    Args:
+        visualizer (JSONVisualizer): Visualizer of the data
+        numeric_columns (list): Columns offered for histograms and scatter plots
+        categorical_columns (list): Columns offered for bar charts and scatter plot colors
+        correlation_columns (list): Columns of the correlation heatmap
+        row_count (int): Number of rows, which decides the large-data scatter options
+    """
+    # Tabs for different visualizations; only the open tab is built
+    (tab1, open1), (tab2, open2), (tab3, open3), (tab4, open4) = lazy_tabs(["📊 Histograms", "📊 Bar Charts", "📊 Scatter Plots", "📊 Correlation"], "chart_tabs")
+    
+    with tab1:
+        if open1:
+            if numeric_columns:
+                selected_col = st.selectbox("Select a numeric column for histogram", numeric_columns, key="hist")
+                bin_strategies = {"Fixed bin count": "fixed", "Freedman–Diaconis": "fd", "Quantile (equal frequency)": "quantile"}
+                bin_label = st.selectbox("Bin strategy (used for large datasets)", list(bin_strategies), key="hist_bins")
+                if st.button("Generate Histogram", key="hist_btn"):
+                    try:
+                        fig = visualizer.create_histogram(selected_col, bin_strategy=bin_strategies[bin_label])
+                        st.plotly_chart(fig, use_container_width=True)
+                    except Exception as e:
+                        st.markdown(f'<div class="error-box">Error generating histogram: {str(e)}</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="warning-box">No numeric columns available for histograms.</div>', unsafe_allow_html=True)
+    
+    with tab2:
+        if open2:
+            if categorical_columns:
+                selected_col = st.selectbox("Select a categorical column for bar chart", categorical_columns, key="bar")
+                if st.button("Generate Bar Chart", key="bar_btn"):
+                    try:
+                        fig = visualizer.create_bar_chart(selected_col)
+                        st.plotly_chart(fig, use_container_width=True)
+                    except Exception as e:
+                        st.markdown(f'<div class="error-box">Error generating bar chart: {str(e)}</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="warning-box">No categorical columns available for bar charts.</div>', unsafe_allow_html=True)
+    
+    with tab3:
+        if open3:
+            if len(numeric_columns) >= 2:
+                col1, col2 = st.columns(2)
+                x_col = col1.selectbox("X-axis", numeric_columns, key="scatter_x")
+                y_col = col2.selectbox("Y-axis", [col for col in numeric_columns if col != x_col], key="scatter_y")
+                
+                color_col = st.selectbox("Color (optional)", [None] + categorical_columns + numeric_columns, key="scatter_color")
+                if color_col == "None":
+                    color_col = None
+                
+                large_data_mode = None
+                if row_count > SCATTER_POINT_THRESHOLD:
+                    scatter_modes = {"Automatic": None, "Density heatmap": "density", "Downsampled points": "sample"}
+                    mode_label = st.selectbox(f"Rendering for large data (over {SCATTER_POINT_THRESHOLD:,} points)", list(scatter_modes), key="scatter_mode")
+                    large_data_mode = scatter_modes[mode_label]
+                
+                if st.button("Generate Scatter Plot", key="scatter_btn"):
+                    try:
+                        if color_col:
+                            fig = visualizer.create_scatter_plot(x_col, y_col, color_col, large_data_mode=large_data_mode)
+                        else:
+                            fig = visualizer.create_scatter_plot(x_col, y_col, large_data_mode=large_data_mode)
+                        st.plotly_chart(fig, use_container_width=True)
+                    except Exception as e:
+                        st.markdown(f'<div class="error-box">Error generating scatter plot: {str(e)}</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="warning-box">Need at least 2 numeric columns for scatter plots.</div>', unsafe_allow_html=True)
+    
+    with tab4:
+        if open4:
+            if len(correlation_columns) >= 2:
+                if st.button("Generate Correlation Heatmap", key="corr_btn"):
+                    try:
+                        fig = visualizer.create_correlation_heatmap(correlation_columns)
+                        st.plotly_chart(fig, use_container_width=True)
+                    except Exception as e:
+                        st.markdown(f'<div class="error-box">Error generating correlation heatmap: {str(e)}</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="warning-box">Need at least 2 numeric columns for correlation analysis.</div>', unsafe_allow_html=True)
+
+
+def display_analysis(df: Union[pd.DataFrame, ComputeBackend], cache_key: str, dataset: Optional[LazyDataset] = None,
+                     optimizer: Optional[DtypeOptimizer] = None):
+    """
+    Display preview, statistics and visualizations for a DataFrame.
+    
+    Analyzer results are kept in the data cache so widget reruns reuse them.
+    
+    Args:
+        df (pd.DataFrame or ComputeBackend): DataFrame to analyze, or a backend
+            querying the uploaded file in place
+        cache_key (str): Key of the upload in the data cache
+        dataset (LazyDataset, optional): Dataset df was loaded from; charts may then
+            also use its columns that were not loaded
+        optimizer (DtypeOptimizer, optional): Optimizer applied to df, whose memory
+            report is shown with the overview
+    """
+    data_cache = get_data_cache()
+    
+    # Display data preview
+    st.markdown('<h2 class="sub-header">Data Preview</h2>', unsafe_allow_html=True)
+    st.dataframe(df.head(10), width='stretch')
+    
+    # Initialize analyzer and visualizer
+    # Results are stored under the dataset, so the analyzer of a column selection and the
+    # visualizer of the whole dataset share correlations and value counts
+    analyzer = data_cache.get_or_compute(cache_key, 'analyzer', lambda: DataAnalyzer(df, results_key=dataset))
+    visualizer = JSONVisualizer(dataset if dataset is not None else df)
     
-    # Summary statistics
+    # Display basic info; the shape and column types are cheap, unlike the deep memory usage of get_basic_info
+    st.markdown('<h2 class="sub-header">Dataset Overview</h2>', unsafe_allow_html=True)
+    row_count = analyzer.backend.row_count
+    display_overview_cards(row_count, len(analyzer.backend.columns), len(analyzer.numeric_columns), len(analyzer.categorical_columns))
+    if optimizer is not None:
+        display_memory_report(optimizer)
+    
+    # Summary statistics, computed when the section is first opened
     st.markdown('<h2 class="sub-header">Statistical Summary</h2>', unsafe_allow_html=True)
-    summary_stats = analyzer.get_summary_statistics()
-    if not summary_stats.empty:
-        st.dataframe(summary_stats, width='stretch')
-    else:
-        st.markdown('<div class="warning-box">No numeric columns found for summary statistics.</div>', unsafe_allow_html=True)
+    section, is_open = lazy_expander("Summary statistics of numeric columns", "summary_section")
+    with section:
+        if is_open:
+            summary_stats = data_cache.get_or_compute(cache_key, 'summary_statistics', analyzer.get_summary_statistics, persist=True)
+            if not summary_stats.empty:
+                st.dataframe(summary_stats, width='stretch')
+            else:
+                st.markdown('<div class="warning-box">No numeric columns found for summary statistics.</div>', unsafe_allow_html=True)
     
-    # Missing data
+    # Missing data, computed when the section is first opened
     st.markdown('<h2 class="sub-header">Missing Data Analysis</h2>', unsafe_allow_html=True)
-    missing_data = analyzer.get_missing_data_info()
-    if not missing_data.empty:
-        st.dataframe(missing_data, width='stretch')
-    else:
-        st.markdown('<div class="success-box">No missing data found in the dataset.</div>', unsafe_allow_html=True)
+    section, is_open = lazy_expander("Missing values per column", "missing_section")
+    with section:
+        if is_open:
+            missing_data = data_cache.get_or_compute(cache_key, 'missing_data', analyzer.get_missing_data_info, persist=True)
+            if not missing_data.empty:
+                st.dataframe(missing_data, width='stretch')
+            else:
+                st.markdown('<div class="success-box">No missing data found in the dataset.</div>', unsafe_allow_html=True)
+    
+    # Correlations, computed when the section is first opened; the correlation heatmap reuses them
+    st.markdown('<h2 class="sub-header">Correlation Analysis</h2>', unsafe_allow_html=True)
+    section, is_open = lazy_expander("Correlation matrix of numeric columns", "correlation_section")
+    with section:
+        if is_open:
+            correlation_matrix = data_cache.get_or_compute(cache_key, 'correlation_matrix', analyzer.get_correlation_matrix, persist=True)
+            if not correlation_matrix.empty:
+                st.dataframe(correlation_matrix, width='stretch')
+            else:
+                st.markdown('<div class="warning-box">Need at least 2 numeric columns for correlation analysis.</div>', unsafe_allow_html=True)
+    
+    # Account for the reports the analyzer now holds
+    data_cache.put(cache_key, 'analyzer', analyzer)
     
     # Visualization section
     st.markdown('<h2 class="sub-header">Data Visualization</h2>', unsafe_allow_html=True)
@@ -92,70 +571,85 @@ def process_data_file(df: pd.DataFrame, uploaded_file, temp_file_path: str):
     # Get column lists
     numeric_columns = analyzer.numeric_columns
     categorical_columns = analyzer.categorical_columns
+    if dataset is not None and len(df.columns) < len(dataset.columns):
+        # Columns that were not loaded are typed from a sample and read when charted
+        sample_analyzer = data_cache.get_or_compute(cache_key, 'sample_analyzer', lambda: DataAnalyzer(dataset.sample))
+        numeric_columns = numeric_columns + [col for col in sample_analyzer.numeric_columns if col not in df.columns]
+        categorical_columns = categorical_columns + [col for col in sample_analyzer.categorical_columns if col not in df.columns]
     
-    # Tabs for different visualizations
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Histograms", "📊 Bar Charts", "📊 Scatter Plots", "📊 Correlation"])
+    display_charts(visualizer, numeric_columns, categorical_columns, analyzer.numeric_columns, row_count)
     
-    with tab1:
-        if numeric_columns:
-            selected_col = st.selectbox("Select a numeric column for histogram", numeric_columns, key="hist")
-            if st.button("Generate Histogram", key="hist_btn"):
-                try:
-                    fig = visualizer.create_histogram(selected_col)
-                    st.plotly_chart(fig, use_container_width=True)
-                except Exception as e:
-                    st.markdown(f'<div class="error-box">Error generating histogram: {str(e)}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="warning-box">No numeric columns available for histograms.</div>', unsafe_allow_html=True)
+    # Show full dataset
+    st.markdown('<h2 class="sub-header">Complete Dataset</h2>', unsafe_allow_html=True)
+    if isinstance(df, ComputeBackend):
+        st.markdown('<div class="info-box">The file is queried in place by DuckDB and is not loaded; '
+                    'the preview above shows its first rows.</div>', unsafe_allow_html=True)
+    else:
+        display_complete_dataset(df, cache_key)
+
+
+def display_complete_dataset(df: pd.DataFrame, cache_key: str):
+    """
+    Display a DataFrame one page at a time with sorting and filtering.
     
-    with tab2:
-        if categorical_columns:
-            selected_col = st.selectbox("Select a categorical column for bar chart", categorical_columns, key="bar")
-            if st.button("Generate Bar Chart", key="bar_btn"):
-                try:
-                    fig = visualizer.create_bar_chart(selected_col)
-                    st.plotly_chart(fig, use_container_width=True)
-                except Exception as e:
-                    st.markdown(f'<div class="error-box">Error generating bar chart: {str(e)}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="warning-box">No categorical columns available for bar charts.</div>', unsafe_allow_html=True)
+    Only the rows of the current page are sent to the browser. Sort orders and
+    filter results are computed on the server once and kept in the data cache.
     
-    with tab3:
-        if len(numeric_columns) >= 2:
-            col1, col2 = st.columns(2)
-            x_col = col1.selectbox("X-axis", numeric_columns, key="scatter_x")
-            y_col = col2.selectbox("Y-axis", [col for col in numeric_columns if col != x_col], key="scatter_y")
-            
-            color_col = st.selectbox("Color (optional)", [None] + categorical_columns + numeric_columns, key="scatter_color")
-            if color_col == "None":
-                color_col = None
-            
-            if st.button("Generate Scatter Plot", key="scatter_btn"):
-                try:
-                    if color_col:
-                        fig = visualizer.create_scatter_plot(x_col, y_col, color_col)
-                    else:
-                        fig = visualizer.create_scatter_plot(x_col, y_col)
-                    st.plotly_chart(fig, use_container_width=True)
-                except Exception as e:
-                    st.markdown(f'<div class="error-box">Error generating scatter plot: {str(e)}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="warning-box">Need at least 2 numeric columns for scatter plots.</div>', unsafe_allow_html=True)
+    Args:
+        df (pd.DataFrame): DataFrame to display
+        cache_key (str): Key of the upload in the data cache
+    """
+    data_cache = get_data_cache()
+    all_columns = "(all columns)"
+    original_order = "(original order)"
     
-    with tab4:
-        if len(numeric_columns) >= 2:
-            if st.button("Generate Correlation Heatmap", key="corr_btn"):
-                try:
-                    fig = visualizer.create_correlation_heatmap()
-                    st.plotly_chart(fig, use_container_width=True)
-                except Exception as e:
-                    st.markdown(f'<div class="error-box">Error generating correlation heatmap: {str(e)}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="warning-box">Need at least 2 numeric columns for correlation analysis.</div>', unsafe_allow_html=True)
+    def first_page():
+        # Another sort, filter or page size makes the current page number meaningless
+        st.session_state["table_page"] = 1
     
-    # Show full dataset
-    st.markdown('<h2 class="sub-header">Complete Dataset</h2>', unsafe_allow_html=True)
-    st.dataframe(df, width='stretch')
+    col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 1, 1])
+    with col1:
+        filter_text = st.text_input("Filter rows containing", key="table_filter", on_change=first_page)
+    with col2:
+        filter_column = st.selectbox("Filter in", [all_columns] + list(df.columns), key="table_filter_column", on_change=first_page)
+    with col3:
+        sort_column = st.selectbox("Sort by", [original_order] + list(df.columns), key="table_sort", on_change=first_page)
+    with col4:
+        descending = st.checkbox("Descending", value=False, key="table_descending", on_change=first_page)
+    with col5:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key="table_page_size", on_change=first_page)
+    
+    try:
+        order = None
+        if sort_column != original_order:
+            order = data_cache.get_or_compute(cache_key, f'sort_order:{sort_column}:{descending}',
+                                              lambda: sort_order(df, sort_column, ascending=not descending))
+        mask = None
+        if filter_text:
+            column = None if filter_column == all_columns else filter_column
+            # Searching every column depends on which columns are loaded
+            scope = column if column is not None else tuple(df.columns)
+            mask = data_cache.get_or_compute(cache_key, f'filter_mask:{scope!r}:{filter_text}',
+                                             lambda: filter_mask(df, filter_text, column))
+    except ValueError as e:
+        st.markdown(f'<div class="error-box">{str(e)}</div>', unsafe_allow_html=True)
+        return
+    rows = select_rows(len(df), order, mask)
+    n_rows = len(df) if rows is None else len(rows)
+    
+    pages = page_count(n_rows, page_size)
+    if st.session_state.get("table_page", 1) > pages:
+        # The page number outlives its dataset, e.g. after a smaller upload or column selection
+        st.session_state["table_page"] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="table_page")
+    first = (page - 1) * page_size
+    shown = f"Rows {first + 1:,}–{min(first + page_size, n_rows):,} of {n_rows:,}" if n_rows else "No matching rows"
+    if mask is not None:
+        shown += f" (filtered from {len(df):,})"
+    st.caption(shown)
+    page_rows = get_page(df, page - 1, page_size, rows)
+    with span('ui.table_page', rows=len(page_rows)):
+        st.dataframe(page_rows, width='stretch')
 
 
 # Set page configuration
@@ -391,184 +885,101 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Uploads are held in memory whole; the server's upload limit (server.maxUploadSize) caps their size
+UPLOAD_LIMIT_MB = st.get_option("server.maxUploadSize")
+JSON_LIMIT_MB = MAX_JSON_SIZE // (1024 * 1024)
+MEMORY_BUDGET_MB = DEFAULT_MEMORY_BUDGET // (1024 * 1024)
+
 # Title and description
 st.markdown('<h1 class="main-header">📊 Universal Data Analyzer & Visualizer</h1>', unsafe_allow_html=True)
-st.markdown("""
+st.markdown(f"""
 <div style="text-align: center; max-width: 800px; margin: 0 auto 2rem auto; font-size: 1.1rem;">
-    A professional tool for comprehensive analysis and visualization of various data formats up to 24MB in size. 
+    A professional tool for comprehensive analysis and visualization of various data formats up to {UPLOAD_LIMIT_MB}MB in size. 
     Upload your data file to explore its structure, analyze statistics, and create interactive visualizations.
 </div>
 """, unsafe_allow_html=True)
 
 # File uploader - now supporting multiple file types
-uploaded_file = st.file_uploader("Choose a data file (max 24MB)", type=["json", "csv", "xlsx", "xls", "parquet", "tsv"])
+uploaded_file = st.file_uploader(f"Choose a data file (max {UPLOAD_LIMIT_MB}MB)", type=["json", "ndjson", "jsonl", "csv", "xlsx", "xls", "parquet", "tsv"],
+                                 help=f"JSON documents over {JSON_LIMIT_MB}MB and NDJSON logs are streamed; their flattened data may take up to "
+                                      f"{MEMORY_BUDGET_MB:,}MB of memory (set JSON_VISUALIZER_MEMORY_BUDGET_MB to change it)")
+optimize_memory = st.checkbox("Compact column types after loading", value=False,
+                              help="Downcast numbers, store repetitive text as categories and other text as Arrow strings to reduce memory use")
+use_arrow = ARROW_AVAILABLE and st.checkbox("Use Arrow-backed columns", value=False,
+                                            help="Read data straight into Apache Arrow columns: faster CSV parsing, less memory, Arrow compute kernels for statistics and no conversion when tables are displayed")
+dtype_backend = "pyarrow" if use_arrow else None
+engine = 'pandas'
+if DUCKDB_AVAILABLE:
+    engines = {"Automatic": 'auto', "pandas": 'pandas', "DuckDB": 'duckdb'}
+    engine = engines[st.selectbox("Compute engine", list(engines), key="engine",
+                                  help="DuckDB queries CSV, TSV, Parquet and NDJSON files in place with a vectorized, multi-threaded engine "
+                                       "instead of loading them into pandas; Automatic uses it for large files")]
+show_diagnostics = st.checkbox("Show performance diagnostics", value=False,
+                               help="Time each loading, analysis and chart stage of this run and report rows, bytes and peak memory")
+# Spans are only collected while diagnostics are shown
+tracer = start_tracing() if show_diagnostics else None
+if tracer is None:
+    stop_tracing()
 
 if uploaded_file is not None:
-    # Create a temporary file to store the uploaded content
+    # Uploaded content is parsed straight from memory, without a temporary file
     file_extension = uploaded_file.name.split('.')[-1].lower()
+    with span('upload.read') as current:
+        file_bytes = uploaded_file.getvalue()
+        if current is not None:
+            current.bytes = len(file_bytes)
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        temp_file_path = tmp_file.name
+    # Parsed data and analysis results are cached by content hash across reruns
+    data_cache = get_data_cache()
+    cache_key = DataCache.make_key(file_bytes, file_extension=file_extension, optimize_dtypes=optimize_memory,
+                                   dtype_backend=dtype_backend)
+    optimizer = data_cache.get_or_compute(cache_key, 'optimizer', DtypeOptimizer) if optimize_memory else None
     
     try:
-        if file_extension == "json":
+        if file_extension in DUCKDB_EXTENSIONS and choose_engine(uploaded_file.name, file_extension, engine, size=len(file_bytes)) == 'duckdb':
+            # Query the file in place; results are cached apart from those of the pandas engine
+            engine_key = DataCache.make_key(file_bytes, file_extension=file_extension, engine='duckdb')
+            try:
+                backend = data_cache.get_or_compute(engine_key, 'backend', lambda: open_duckdb_backend(file_bytes, file_extension))
+                display_file_info(uploaded_file, len(file_bytes))
+                display_analysis(backend, engine_key)
+            except Exception as e:
+                st.markdown(f'<div class="error-box"><div class="problem-title">DuckDB Processing Error:</div>{str(e)}</div>', unsafe_allow_html=True)
+                st.markdown('<div class="solution-box"><div class="solution-title">How to resolve DuckDB processing issues:</div><ul><li>Select the pandas compute engine, which reads more file variants</li><li>Ensure the file has a header row and UTF-8 encoding</li></ul></div>', unsafe_allow_html=True)
+        
+        elif file_extension == "json" and len(file_bytes) <= MAX_JSON_SIZE:
             # Handle JSON files
-            # Validate JSON format
-            if not validate_json_format(temp_file_path):
-                st.markdown('<div class="error-box">Invalid JSON format. Please upload a valid JSON file.</div>', unsafe_allow_html=True)
+            # Load and validate JSON in a single parse
+            json_data, json_error = data_cache.get(cache_key, 'document'), None
+            # A file converted before is restored from the disk cache without parsing it
+            converted = data_cache.restore(cache_key, ['structure', 'schema']) and open_stored_dataset(cache_key) is not None
+            if json_data is None and not converted:
+                json_data, json_error = load_validated_json_bytes(file_bytes)
+                if json_error is None:
+                    data_cache.put(cache_key, 'document', json_data, size=len(file_bytes) * JSON_MEMORY_FACTOR)
+            if json_error is not None:
+                if json_error['line'] is not None:
+                    st.markdown(f'<div class="error-box">Invalid JSON format at line {json_error["line"]}, column {json_error["column"]}: {json_error["message"]}</div>', unsafe_allow_html=True)
+                else:
+                    st.markdown(f'<div class="error-box">Invalid JSON file: {json_error["message"]}</div>', unsafe_allow_html=True)
                 st.markdown('<div class="solution-box"><div class="solution-title">How to fix JSON format issues:</div><ul><li>Ensure your file contains valid JSON syntax</li><li>Check for missing commas, brackets, or quotes</li><li>Use a JSON validator to identify syntax errors</li><li>Ensure the file encoding is UTF-8</li></ul></div>', unsafe_allow_html=True)
             else:
-                # Load JSON data
-                json_data = load_json_file(temp_file_path)
-                
-                # Display basic information
-                st.markdown('<h2 class="sub-header">File Information</h2>', unsafe_allow_html=True)
-                file_size = os.path.getsize(temp_file_path)
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown(f'<div class="info-box"><strong>File name:</strong> {uploaded_file.name}</div>', unsafe_allow_html=True)
-                with col2:
-                    st.markdown(f'<div class="info-box"><strong>File size:</strong> {file_size / (1024*1024):.2f} MB</div>', unsafe_allow_html=True)
+                display_file_info(uploaded_file, len(file_bytes))
                 
                 # Display JSON structure
                 st.markdown('<h2 class="sub-header">Data Structure</h2>', unsafe_allow_html=True)
                 with st.expander("View JSON structure details", expanded=False):
-                    structure = get_json_structure(json_data)
+                    structure = data_cache.get_or_compute(cache_key, 'structure', lambda: get_json_structure(json_data), persist=True)
                     st.json(structure)
+                with st.expander("View inferred schema (all records)", expanded=False):
+                    schema = data_cache.get_or_compute(cache_key, 'schema', lambda: infer_json_schema(json_data), persist=True)
+                    st.json(schema)
                 
                 # Convert to DataFrame
                 try:
-                    df = json_to_dataframe(json_data)
-                    
-                    # Display data preview
-                    st.markdown('<h2 class="sub-header">Data Preview</h2>', unsafe_allow_html=True)
-                    st.dataframe(df.head(10), width='stretch')
-                    
-                    # Initialize analyzer and visualizer
-                    analyzer = DataAnalyzer(df)  # Use generic analyzer
-                    visualizer = JSONVisualizer(df)
-                    
-                    # Process data (same as before)
-                    # Display basic info
-                    info = analyzer.get_basic_info()
-                    st.markdown('<h2 class="sub-header">Dataset Overview</h2>', unsafe_allow_html=True)
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1:
-                        st.markdown(f'''
-                        <div class="metric-card">
-                            <div class="metric-value">{info['shape'][0]}</div>
-                            <div class="metric-label">ROWS</div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                    with col2:
-                        st.markdown(f'''
-                        <div class="metric-card">
-                            <div class="metric-value">{info['shape'][1]}</div>
-                            <div class="metric-label">COLUMNS</div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                    with col3:
-                        st.markdown(f'''
-                        <div class="metric-card">
-                            <div class="metric-value">{len(info['numeric_columns'])}</div>
-                            <div class="metric-label">NUMERIC COLS</div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                    with col4:
-                        st.markdown(f'''
-                        <div class="metric-card">
-                            <div class="metric-value">{len(info['categorical_columns'])}</div>
-                            <div class="metric-label">CATEGORY COLS</div>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                    
-                    # Summary statistics
-                    st.markdown('<h2 class="sub-header">Statistical Summary</h2>', unsafe_allow_html=True)
-                    summary_stats = analyzer.get_summary_statistics()
-                    if not summary_stats.empty:
-                        st.dataframe(summary_stats, width='stretch')
-                    else:
-                        st.markdown('<div class="warning-box">No numeric columns found for summary statistics.</div>', unsafe_allow_html=True)
-                    
-                    # Missing data
-                    st.markdown('<h2 class="sub-header">Missing Data Analysis</h2>', unsafe_allow_html=True)
-                    missing_data = analyzer.get_missing_data_info()
-                    if not missing_data.empty:
-                        st.dataframe(missing_data, width='stretch')
-                    else:
-                        st.markdown('<div class="success-box">No missing data found in the dataset.</div>', unsafe_allow_html=True)
+                    dataset = load_dataset(cache_key, lambda: lazy_json_dataset(json_data, schema=schema, transform=optimizer, dtype_backend=dtype_backend))
                     
-                    # Visualization section
-                    st.markdown('<h2 class="sub-header">Data Visualization</h2>', unsafe_allow_html=True)
-                    
-                    # Get column lists
-                    numeric_columns = analyzer.numeric_columns
-                    categorical_columns = analyzer.categorical_columns
-                    
-                    # Tabs for different visualizations
-                    tab1, tab2, tab3, tab4 = st.tabs(["📊 Histograms", "📊 Bar Charts", "📊 Scatter Plots", "📊 Correlation"])
-                    
-                    with tab1:
-                        if numeric_columns:
-                            selected_col = st.selectbox("Select a numeric column for histogram", numeric_columns, key="hist")
-                            if st.button("Generate Histogram", key="hist_btn"):
-                                try:
-                                    fig = visualizer.create_histogram(selected_col)
-                                    st.plotly_chart(fig, use_container_width=True)
-                                except Exception as e:
-                                    st.markdown(f'<div class="error-box">Error generating histogram: {str(e)}</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<div class="warning-box">No numeric columns available for histograms.</div>', unsafe_allow_html=True)
-                    
-                    with tab2:
-                        if categorical_columns:
-                            selected_col = st.selectbox("Select a categorical column for bar chart", categorical_columns, key="bar")
-                            if st.button("Generate Bar Chart", key="bar_btn"):
-                                try:
-                                    fig = visualizer.create_bar_chart(selected_col)
-                                    st.plotly_chart(fig, use_container_width=True)
-                                except Exception as e:
-                                    st.markdown(f'<div class="error-box">Error generating bar chart: {str(e)}</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<div class="warning-box">No categorical columns available for bar charts.</div>', unsafe_allow_html=True)
-                    
-                    with tab3:
-                        if len(numeric_columns) >= 2:
-                            col1, col2 = st.columns(2)
-                            x_col = col1.selectbox("X-axis", numeric_columns, key="scatter_x")
-                            y_col = col2.selectbox("Y-axis", [col for col in numeric_columns if col != x_col], key="scatter_y")
-                            
-                            color_col = st.selectbox("Color (optional)", [None] + categorical_columns + numeric_columns, key="scatter_color")
-                            if color_col == "None":
-                                color_col = None
-                            
-                            if st.button("Generate Scatter Plot", key="scatter_btn"):
-                                try:
-                                    if color_col:
-                                        fig = visualizer.create_scatter_plot(x_col, y_col, color_col)
-                                    else:
-                                        fig = visualizer.create_scatter_plot(x_col, y_col)
-                                    st.plotly_chart(fig, use_container_width=True)
-                                except Exception as e:
-                                    st.markdown(f'<div class="error-box">Error generating scatter plot: {str(e)}</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<div class="warning-box">Need at least 2 numeric columns for scatter plots.</div>', unsafe_allow_html=True)
-                    
-                    with tab4:
-                        if len(numeric_columns) >= 2:
-                            if st.button("Generate Correlation Heatmap", key="corr_btn"):
-                                try:
-                                    fig = visualizer.create_correlation_heatmap()
-                                    st.plotly_chart(fig, use_container_width=True)
-                                except Exception as e:
-                                    st.markdown(f'<div class="error-box">Error generating correlation heatmap: {str(e)}</div>', unsafe_allow_html=True)
-                        else:
-                            st.markdown('<div class="warning-box">Need at least 2 numeric columns for correlation analysis.</div>', unsafe_allow_html=True)
-                    
-                    # Show full dataset
-                    st.markdown('<h2 class="sub-header">Complete Dataset</h2>', unsafe_allow_html=True)
-                    st.dataframe(df, width='stretch')
+                    display_dataset(dataset, cache_key, optimizer)
                     
                 except Exception as e:
                     st.markdown(f'<div class="error-box"><div class="problem-title">Data Processing Error:</div>{str(e)}</div>', unsafe_allow_html=True)
@@ -586,8 +997,9 @@ if uploaded_file is not None:
                                     <ul>
                                         <li>Try flattening your JSON structure before uploading</li>
                                         <li>Convert complex objects to strings before analysis</li>
-                                        <li>Use the "Raw JSON Data" view below to see your data structure</li>
+                                        <li>Use the JSON view below to see your data structure</li>
                                         <li>Consider preprocessing your data to simplify nested structures</li>
+                                        <li>Enable "Use Arrow-backed columns" so columns are stored in Arrow format from the start</li>
                                     </ul>
                                 </li>
                             </ul>
@@ -641,27 +1053,58 @@ if uploaded_file is not None:
                         </div>
                         ''', unsafe_allow_html=True)
                     
-                    # Still show the raw JSON structure
-                    st.markdown('<h3 class="section-header">Raw JSON Data</h3>', unsafe_allow_html=True)
-                    st.json(json_data)
+                    # Still show the raw JSON structure; an upload restored from the disk cache
+                    # was not parsed, so only its stored structure is available
+                    if json_data is not None:
+                        st.markdown('<h3 class="section-header">Raw JSON Data</h3>', unsafe_allow_html=True)
+                        st.json(json_data)
+                    else:
+                        st.markdown('<h3 class="section-header">JSON Structure</h3>', unsafe_allow_html=True)
+                        st.json(structure)
             
+        elif file_extension in ["json", "ndjson", "jsonl"]:
+            # Handle large JSON arrays and NDJSON logs by flattening them in batches
+            # instead of decoding the whole document into Python objects
+            try:
+                def load_streamed():
+                    df = load_json_dataframe(file_bytes, lines=file_extension != "json", dtype_backend=dtype_backend)
+                    return optimizer(df) if optimizer is not None else df
+                df = data_cache.get_or_compute(cache_key, 'dataframe', load_streamed, persist=True)
+                
+                # Process with generic analyzer
+                process_data_file(df, uploaded_file, len(file_bytes), cache_key, optimizer)
+                
+            except Exception as e:
+                st.markdown(f'<div class="error-box"><div class="problem-title">JSON Streaming Error:</div>{str(e)}</div>', unsafe_allow_html=True)
+                st.markdown(f'''
+                <div class="solution-box">
+                    <div class="solution-title">How to resolve large JSON processing issues:</div>
+                    <ul>
+                        <li><strong>Top-level array:</strong> JSON files over {JSON_LIMIT_MB}MB must contain an array of records at the top level</li>
+                        <li><strong>NDJSON:</strong> Ensure every non-empty line of a .ndjson/.jsonl file is one complete JSON value</li>
+                        <li><strong>Memory budget:</strong> If the flattened data exceeds the {MEMORY_BUDGET_MB:,}MB memory budget, try with a smaller extract or raise JSON_VISUALIZER_MEMORY_BUDGET_MB</li>
+                        <li><strong>Encoding:</strong> Make sure the file is saved with UTF-8 encoding</li>
+                    </ul>
+                </div>
+                ''', unsafe_allow_html=True)
+                
         elif file_extension == "csv":
             # Handle CSV files
             try:
                 # Read CSV file
-                df = pd.read_csv(temp_file_path)
+                dataset = load_dataset(cache_key, lambda: lazy_tabular_bytes(file_bytes, "csv", transform=optimizer, dtype_backend=dtype_backend))
                 
                 # Process with generic analyzer
-                process_data_file(df, uploaded_file, temp_file_path)
+                process_data_file(dataset, uploaded_file, len(file_bytes), cache_key, optimizer)
                 
             except Exception as e:
                 st.markdown(f'<div class="error-box"><div class="problem-title">CSV Processing Error:</div>{str(e)}</div>', unsafe_allow_html=True)
-                st.markdown('''
+                st.markdown(f'''
                 <div class="solution-box">
                     <div class="solution-title">How to resolve CSV processing issues:</div>
                     <ul>
                         <li><strong>File format:</strong> Ensure your file is in valid CSV format</li>
-                        <li><strong>File size:</strong> Check that your file is under 24MB</li>
+                        <li><strong>File size:</strong> Check that your file is under the {UPLOAD_LIMIT_MB}MB upload limit</li>
                         <li><strong>Encoding:</strong> Make sure the file is saved with UTF-8 encoding</li>
                         <li><strong>Structure:</strong> Ensure the CSV has a proper header row</li>
                         <li><strong>Special characters:</strong> Check for unescaped quotes or special characters</li>
@@ -672,20 +1115,31 @@ if uploaded_file is not None:
         elif file_extension in ["xlsx", "xls"]:
             # Handle Excel files
             try:
-                # Read Excel file
-                df = pd.read_excel(temp_file_path)
-                
-                # Process with generic analyzer
-                process_data_file(df, uploaded_file, temp_file_path)
+                # List the sheets without reading their cells
+                sheet_names = data_cache.get_or_compute(cache_key, 'sheets', lambda: list_excel_sheets(file_bytes, file_extension), persist=True)
+                sheets = sheet_names[:1]
+                if len(sheet_names) > 1:
+                    chosen = st.multiselect(f"Sheets to analyze ({len(sheet_names)} in workbook)", sheet_names,
+                                            default=sheet_names[:1], key=f"sheets_{cache_key}")
+                    sheets = [name for name in sheet_names if name in chosen]
+                if not sheets:
+                    st.markdown('<div class="warning-box">Select at least one sheet to analyze.</div>', unsafe_allow_html=True)
+                else:
+                    # Each choice of sheets is a dataset of its own; several sheets are read in parallel
+                    sheets_key = cache_key if sheets == sheet_names[:1] else DataCache.make_key(cache_key.encode(), sheets=sheets)
+                    dataset = load_dataset(sheets_key, lambda: lazy_excel_bytes(file_bytes, file_extension, sheets, transform=optimizer, dtype_backend=dtype_backend))
+                    
+                    # Process with generic analyzer
+                    process_data_file(dataset, uploaded_file, len(file_bytes), sheets_key, optimizer)
                 
             except Exception as e:
                 st.markdown(f'<div class="error-box"><div class="problem-title">Excel Processing Error:</div>{str(e)}</div>', unsafe_allow_html=True)
-                st.markdown('''
+                st.markdown(f'''
                 <div class="solution-box">
                     <div class="solution-title">How to resolve Excel processing issues:</div>
                     <ul>
                         <li><strong>File format:</strong> Ensure your file is in valid Excel format (.xlsx or .xls)</li>
-                        <li><strong>File size:</strong> Check that your file is under 24MB</li>
+                        <li><strong>File size:</strong> Check that your file is under the {UPLOAD_LIMIT_MB}MB upload limit</li>
                         <li><strong>Sheet selection:</strong> Make sure the Excel file has data in its sheets</li>
                         <li><strong>Protected files:</strong> Ensure the file is not password protected</li>
                         <li><strong>Corrupted files:</strong> Try opening the file in Excel to check if it's corrupted</li>
@@ -696,20 +1150,23 @@ if uploaded_file is not None:
         elif file_extension == "parquet":
             # Handle Parquet files
             try:
-                # Read Parquet file
-                df = pd.read_parquet(temp_file_path)
+                # Open the Parquet file; its footer describes the data without reading it
+                dataset = load_dataset(cache_key, lambda: lazy_tabular_bytes(file_bytes, "parquet", transform=optimizer, dtype_backend=dtype_backend))
+                footer = None
+                if ARROW_AVAILABLE:
+                    footer = data_cache.get_or_compute(cache_key, 'parquet_footer', lambda: read_parquet_footer(file_bytes, dtype_backend))
                 
                 # Process with generic analyzer
-                process_data_file(df, uploaded_file, temp_file_path)
+                process_data_file(dataset, uploaded_file, len(file_bytes), cache_key, optimizer, footer)
                 
             except Exception as e:
                 st.markdown(f'<div class="error-box"><div class="problem-title">Parquet Processing Error:</div>{str(e)}</div>', unsafe_allow_html=True)
-                st.markdown('''
+                st.markdown(f'''
                 <div class="solution-box">
                     <div class="solution-title">How to resolve Parquet processing issues:</div>
                     <ul>
                         <li><strong>File format:</strong> Ensure your file is in valid Parquet format</li>
-                        <li><strong>File size:</strong> Check that your file is under 24MB</li>
+                        <li><strong>File size:</strong> Check that your file is under the {UPLOAD_LIMIT_MB}MB upload limit</li>
                         <li><strong>Schema issues:</strong> The Parquet file may have an incompatible schema</li>
                         <li><strong>Corrupted files:</strong> The file may be corrupted or incomplete</li>
                     </ul>
@@ -720,19 +1177,19 @@ if uploaded_file is not None:
             # Handle TSV files
             try:
                 # Read TSV file
-                df = pd.read_csv(temp_file_path, sep='\t')
+                dataset = load_dataset(cache_key, lambda: lazy_tabular_bytes(file_bytes, "tsv", transform=optimizer, dtype_backend=dtype_backend))
                 
                 # Process with generic analyzer
-                process_data_file(df, uploaded_file, temp_file_path)
+                process_data_file(dataset, uploaded_file, len(file_bytes), cache_key, optimizer)
                 
             except Exception as e:
                 st.markdown(f'<div class="error-box"><div class="problem-title">TSV Processing Error:</div>{str(e)}</div>', unsafe_allow_html=True)
-                st.markdown('''
+                st.markdown(f'''
                 <div class="solution-box">
                     <div class="solution-title">How to resolve TSV processing issues:</div>
                     <ul>
                         <li><strong>File format:</strong> Ensure your file is in valid TSV format</li>
-                        <li><strong>File size:</strong> Check that your file is under 24MB</li>
+                        <li><strong>File size:</strong> Check that your file is under the {UPLOAD_LIMIT_MB}MB upload limit</li>
                         <li><strong>Encoding:</strong> Make sure the file is saved with UTF-8 encoding</li>
                         <li><strong>Structure:</strong> Ensure the TSV has a proper header row</li>
                         <li><strong>Special characters:</strong> Check for unescaped tabs or special characters</li>
@@ -744,23 +1201,21 @@ if uploaded_file is not None:
     
     except Exception as e:
         st.markdown(f'<div class="error-box"><div class="problem-title">File Processing Error:</div>{str(e)}</div>', unsafe_allow_html=True)
-        st.markdown('''
+        st.markdown(f'''
         <div class="solution-box">
             <div class="solution-title">How to resolve file processing issues:</div>
             <ul>
                 <li><strong>File format:</strong> Ensure your file is in a supported format</li>
-                <li><strong>File size:</strong> Check that your file is under 24MB</li>
+                <li><strong>File size:</strong> Check that your file is under the {UPLOAD_LIMIT_MB}MB upload limit</li>
                 <li><strong>Encoding:</strong> Make sure the file is saved with UTF-8 encoding</li>
                 <li><strong>Permissions:</strong> Ensure the file is not open in another application</li>
             </ul>
         </div>
         ''', unsafe_allow_html=True)
-    
-    finally:
-        # Clean up temporary file
-        if os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
 else:
     st.markdown('<div class="info-box" style="text-align: center; padding: 2rem;">Please upload a data file to begin analysis.</div>', unsafe_allow_html=True)
     st.markdown('<h2 class="sub-header">Sample Data</h2>', unsafe_allow_html=True)
-    st.markdown('<div class="info-box">To get started, you can use the sample data provided in <code>sample_data.json</code> or <code>sample_data.csv</code> in this directory.</div>', unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown('<div class="info-box">To get started, you can use the sample data provided in <code>sample_data.json</code> or <code>sample_data.csv</code> in this directory.</div>', unsafe_allow_html=True)
+
+if tracer is not None:
+    display_diagnostics(tracer)
@@ -0,0 +1,400 @@
+import argparse
+import glob
+import hashlib
+import html
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+from json_utils import (load_json_file, load_json_dataframe, json_to_dataframe, get_json_structure,
+                        infer_json_schema_stream, MAX_JSON_SIZE)
+from schema_inference import infer_json_schema
+from data_loaders import load_tabular_file, iter_tabular_batches, TABULAR_EXTENSIONS
+from data_analyzer import DataAnalyzer
+from compute_backend import ComputeBackend, DuckDBBackend, choose_engine, ENGINES
+from incremental_stats import ChunkedBackend
+
+
+# Extensions of the JSON formats the profiler reads
+JSON_EXTENSIONS = ["json", "ndjson", "jsonl"]
+
+# Extensions of the formats that can be profiled chunk by chunk
+CHUNKED_EXTENSIONS = ["csv", "tsv"]
+
+REPORT_FORMATS = ["json", "html"]
+
+
+def expand_paths(patterns: List[str]) -> List[str]:
+    """
+    Expand file names and glob patterns into a sorted list of supported files.
+
+    Args:
+        patterns (list): Paths or glob patterns ('**' matches nested directories)
+
+    Returns:
+        list: Matching files, each listed once
+    """
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            extension = path.rsplit('.', 1)[-1].lower()
+            if os.path.isfile(path) and extension in JSON_EXTENSIONS + TABULAR_EXTENSIONS:
+                paths.add(path)
+    return sorted(paths)
+
+
+def load_file(path: str, dtype_backend: Optional[str] = None,
+              max_json_size: Optional[int] = MAX_JSON_SIZE) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Load a data file the way the app does.
+
+    JSON documents up to max_json_size are parsed whole, so their structure and
+    schema can be reported; larger JSON arrays and NDJSON files are streamed.
+
+    Args:
+        path (str): Path to the file
+        dtype_backend (str, optional): "pyarrow" for Arrow-backed columns
+        max_json_size (int, optional): Largest JSON document parsed whole
+
+    Returns:
+        tuple: (DataFrame, dict with 'structure' and/or 'schema' for JSON input)
+
+    Raises:
+        ValueError: If the format is not supported or the data cannot be loaded
+    """
+    extension = path.rsplit('.', 1)[-1].lower()
+    if extension in TABULAR_EXTENSIONS:
+        return load_tabular_file(path, extension, dtype_backend=dtype_backend), {}
+    if extension not in JSON_EXTENSIONS:
+        raise ValueError(f"Unsupported file format: {extension}")
+    if extension == "json" and (max_json_size is None or os.path.getsize(path) <= max_json_size):
+        data = load_json_file(path, max_size=max_json_size)
+        details = {'structure': get_json_structure(data), 'schema': infer_json_schema(data)}
+        return json_to_dataframe(data, schema=details['schema'], dtype_backend=dtype_backend), details
+    lines = extension != "json"
+    details = {'schema': infer_json_schema_stream(path, lines=lines)}
+    return load_json_dataframe(path, lines=lines, dtype_backend=dtype_backend), details
+
+
+def profile_dataframe(df: Union[pd.DataFrame, ComputeBackend], n_jobs: int = 1) -> Dict[str, Any]:
+    """
+    Collect the DataAnalyzer reports shown in the app.
+
+    Args:
+        df (pd.DataFrame or ComputeBackend): DataFrame to profile, or a backend over the data
+        n_jobs (int): Workers for column-level analysis
+
+    Returns:
+        dict: 'basic_info', 'column_types', 'summary_statistics', 'missing_data',
+            'categorical_summary' and 'correlation_matrix'
+    """
+    analyzer = DataAnalyzer(df, n_jobs=n_jobs)
+    return {
+        'basic_info': analyzer.get_basic_info(),
+        'column_types': analyzer.get_column_types(),
+        'summary_statistics': analyzer.get_summary_statistics(),
+        'missing_data': analyzer.get_missing_data_info(),
+        'categorical_summary': analyzer.get_categorical_summary(),
+        'correlation_matrix': analyzer.get_correlation_matrix()
+    }
+
+
+def profile_chunks(chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Collect the DataAnalyzer reports from chunks of rows, without holding them all in memory.
+
+    Summary statistics, missing data and correlations are accumulated exactly, except
+    for quantiles of long columns; unique counts and top values of categorical columns
+    are estimated with sketches (see DataAnalyzer.get_categorical_summary).
+
+    Args:
+        chunks (iterable): DataFrame chunks, e.g. from data_loaders.iter_tabular_batches
+
+    Returns:
+        dict: The reports of profile_dataframe
+    """
+    return profile_dataframe(ChunkedBackend(chunks))
+
+
+def profile_file(path: str, dtype_backend: Optional[str] = None, max_json_size: Optional[int] = MAX_JSON_SIZE,
+                 n_jobs: int = 1, chunked: bool = False, engine: str = 'auto') -> Dict[str, Any]:
+    """
+    Load and profile one file.
+
+    Args:
+        path (str): Path to the file
+        dtype_backend (str, optional): "pyarrow" for Arrow-backed columns
+        max_json_size (int, optional): Largest JSON document parsed whole
+        n_jobs (int): Workers for column-level analysis
+        chunked (bool): Profile CSV and TSV files block by block with profile_chunks
+            instead of loading them whole
+        engine (str): 'pandas', 'duckdb' to query Parquet, CSV, TSV and NDJSON files
+            in place, or 'auto' (see compute_backend.choose_engine)
+
+    Returns:
+        dict: JSON-serializable report with 'file', 'format' and 'size', plus the
+            analyzer reports, or 'error' if the file could not be profiled
+    """
+    report = {
+        'file': path,
+        'format': path.rsplit('.', 1)[-1].lower(),
+        'size': os.path.getsize(path) if os.path.exists(path) else None
+    }
+    try:
+        if choose_engine(path, report['format'], engine) == 'duckdb':
+            report.update(profile_dataframe(DuckDBBackend(path, report['format'])))
+            return to_jsonable(report)
+        if chunked and report['format'] in CHUNKED_EXTENSIONS:
+            report.update(profile_chunks(iter_tabular_batches(path, report['format'], dtype_backend=dtype_backend)))
+            return to_jsonable(report)
+        df, details = load_file(path, dtype_backend=dtype_backend, max_json_size=max_json_size)
+        report.update(details)
+        report.update(profile_dataframe(df, n_jobs=n_jobs))
+    except Exception as e:
+        report['error'] = f"{type(e).__name__}: {str(e)}"
+    return to_jsonable(report)
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Convert analyzer results to plain JSON values.
+
+    DataFrames become {index: {column: value}} mappings, Series and dicts become
+    dicts with string keys, NumPy scalars become Python numbers and NaN becomes None.
+
+    Args:
+        value: Value to convert
+
+    Returns:
+        Value that json.dumps accepts with allow_nan=False
+    """
+    if isinstance(value, pd.DataFrame):
+        return {str(index): to_jsonable(row.to_dict()) for index, row in value.iterrows()}
+    if isinstance(value, pd.Series):
+        return to_jsonable(value.to_dict())
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if pd.isna(value):
+        return None
+    return str(value)
+
+
+def render_html_report(report: Dict[str, Any]) -> str:
+    """
+    Render a profile report as a standalone HTML page.
+
+    Args:
+        report (dict): Result of profile_file
+
+    Returns:
+        str: HTML document
+    """
+    title = html.escape(os.path.basename(report['file']))
+    parts = [f"<h1>{title}</h1>",
+             f"<p>{html.escape(report['file'])} &middot; {html.escape(report['format'].upper())} &middot; "
+             f"{(report['size'] or 0) / (1024 * 1024):.2f} MB</p>"]
+    if 'error' in report:
+        parts.append(f'<div class="error-box">{html.escape(report["error"])}</div>')
+    else:
+        info = report['basic_info']
+        parts.append('<h2>Dataset Overview</h2>')
+        parts.append(f"<p>{info['shape'][0]} rows &middot; {info['shape'][1]} columns &middot; "
+                     f"{len(info['numeric_columns'])} numeric &middot; {len(info['categorical_columns'])} categorical &middot; "
+                     f"{(info['memory_usage'] or 0) / (1024 * 1024):.2f} MB in memory</p>")
+        parts.append('<h2>Column Types</h2>')
+        parts.append(_html_table(pd.DataFrame({'type': report['column_types']})))
+        for heading, key in [('Statistical Summary', 'summary_statistics'), ('Missing Data', 'missing_data'),
+                             ('Correlation Matrix', 'correlation_matrix')]:
+            if report[key]:
+                parts.append(f'<h2>{heading}</h2>')
+                parts.append(_html_table(pd.DataFrame.from_dict(report[key], orient='index')))
+        if report['categorical_summary']:
+            parts.append('<h2>Categorical Summary</h2>')
+            rows = {col: {'unique values': summary['unique_values'],
+                          'top values': ', '.join(f"{value} ({count})" for value, count in summary['top_values'].items())
+                          if isinstance(summary['top_values'], dict) else summary['top_values']}
+                    for col, summary in report['categorical_summary'].items()}
+            parts.append(_html_table(pd.DataFrame.from_dict(rows, orient='index')))
+    for heading, key in [('Data Structure', 'structure'), ('Inferred Schema', 'schema')]:
+        if key in report:
+            parts.append(f'<h2>{heading}</h2>')
+            parts.append(f"<pre>{html.escape(json.dumps(report[key], indent=2))}</pre>")
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title} - Data Profile</title>
+<style>
+    body {{ font-family: sans-serif; margin: 2rem; color: #2d3748; }}
+    h1 {{ color: #1f3a5f; }}
+    h2 {{ color: #2c5282; border-bottom: 1px solid #e2e8f0; }}
+    table {{ border-collapse: collapse; }}
+    th, td {{ border: 1px solid #e2e8f0; padding: 0.3rem 0.6rem; text-align: right; }}
+    pre {{ background: #f7fafc; padding: 1rem; overflow-x: auto; }}
+    .error-box {{ background: #fed7d7; border-left: 4px solid #e53e3e; padding: 1rem; }}
+</style>
+</head>
+<body>
+{chr(10).join(parts)}
+</body>
+</html>
+"""
+
+
+def _html_table(df: pd.DataFrame) -> str:
+    """Render a small DataFrame as an HTML table."""
+    return df.to_html(border=0, na_rep='', float_format=lambda value: f"{value:.4g}")
+
+
+def report_names(paths: List[str]) -> Dict[str, str]:
+    """
+    Choose a unique report file name (without extension) for each input file.
+
+    Args:
+        paths (list): Input files
+
+    Returns:
+        dict: Report name per path; files sharing a name get a hash of their path appended
+    """
+    counts: Dict[str, int] = {}
+    for path in paths:
+        counts[os.path.basename(path)] = counts.get(os.path.basename(path), 0) + 1
+    names = {}
+    for path in paths:
+        name = os.path.basename(path)
+        if counts[name] > 1:
+            name += '-' + hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=4).hexdigest()
+        names[path] = name
+    return names
+
+
+def _profile_and_write(path: str, name: str, output_dir: str, formats: List[str],
+                       dtype_backend: Optional[str], max_json_size: Optional[int], n_jobs: int,
+                       chunked: bool = False, engine: str = 'auto') -> Dict[str, Any]:
+    """Profile one file, write its reports and return a short summary (runs in a worker)."""
+    report = profile_file(path, dtype_backend=dtype_backend, max_json_size=max_json_size, n_jobs=n_jobs,
+                          chunked=chunked, engine=engine)
+    outputs = []
+    if 'json' in formats:
+        outputs.append(os.path.join(output_dir, name + '.json'))
+        with open(outputs[-1], 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, allow_nan=False)
+    if 'html' in formats:
+        outputs.append(os.path.join(output_dir, name + '.html'))
+        with open(outputs[-1], 'w', encoding='utf-8') as f:
+            f.write(render_html_report(report))
+    summary = {'file': path, 'reports': outputs}
+    if 'error' in report:
+        summary['error'] = report['error']
+    else:
+        summary['rows'], summary['columns'] = report['basic_info']['shape']
+    return summary
+
+
+def profile_files(paths: List[str], output_dir: str, formats: Optional[List[str]] = None, workers: int = 1,
+                  dtype_backend: Optional[str] = None, max_json_size: Optional[int] = MAX_JSON_SIZE,
+                  n_jobs: int = 1, chunked: bool = False, engine: str = 'auto') -> List[Dict[str, Any]]:
+    """
+    Profile files and write a report per file plus a summary.json index.
+
+    Args:
+        paths (list): Files to profile
+        output_dir (str): Directory for the reports, created if missing
+        formats (list, optional): Report formats from REPORT_FORMATS; both if omitted
+        workers (int): Files profiled in parallel by separate processes; -1 uses all CPU cores
+        dtype_backend (str, optional): "pyarrow" for Arrow-backed columns
+        max_json_size (int, optional): Largest JSON document parsed whole
+        n_jobs (int): Workers for column-level analysis within each file
+        chunked (bool): Profile CSV and TSV files block by block (see profile_file)
+        engine (str): Compute engine per file (see profile_file)
+
+    Returns:
+        list: Per-file summaries ('file', 'reports' and 'rows'/'columns' or 'error'),
+            in the order of paths
+
+    Raises:
+        ValueError: If a report format is unknown
+    """
+    formats = REPORT_FORMATS if formats is None else formats
+    unknown = [fmt for fmt in formats if fmt not in REPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown report format '{unknown[0]}'. Choose from: {', '.join(REPORT_FORMATS)}")
+    os.makedirs(output_dir, exist_ok=True)
+    names = report_names(paths)
+    task = partial(_profile_and_write, output_dir=output_dir, formats=formats, dtype_backend=dtype_backend,
+                   max_json_size=max_json_size, n_jobs=n_jobs, chunked=chunked, engine=engine)
+    workers = (os.cpu_count() or 1) if workers == -1 else max(1, workers)
+    if workers == 1 or len(paths) < 2:
+        summaries = [task(path, names[path]) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            summaries = list(executor.map(task, paths, [names[path] for path in paths]))
+    with open(os.path.join(output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summaries, f, indent=2)
+    return summaries
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Arguments; sys.argv[1:] if omitted
+
+    Returns:
+        int: Exit status, 1 if any file failed or none matched
+    """
+    parser = argparse.ArgumentParser(description="Profile JSON, NDJSON, CSV, TSV, Excel and Parquet files without the web UI.")
+    parser.add_argument('paths', nargs='+', help="Files or glob patterns ('**' matches nested directories)")
+    parser.add_argument('-o', '--output', default='reports', help="Directory for the reports (default: reports)")
+    parser.add_argument('-f', '--format', nargs='+', choices=REPORT_FORMATS, default=REPORT_FORMATS,
+                        help="Report formats to write (default: json html)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="Files profiled in parallel; -1 uses all CPU cores (default: 1)")
+    parser.add_argument('--arrow', action='store_true', help="Load data into Arrow-backed columns")
+    parser.add_argument('--max-json-size', type=int, default=MAX_JSON_SIZE,
+                        help="Largest JSON document in bytes parsed whole; larger ones are streamed without a structure report")
+    parser.add_argument('--chunked', action='store_true',
+                        help="Profile CSV and TSV files block by block in bounded memory; quantiles, unique counts "
+                             "and top values are then approximate")
+    parser.add_argument('--engine', choices=ENGINES, default='auto',
+                        help="Compute engine: duckdb queries Parquet, CSV, TSV and NDJSON files in place; auto uses it "
+                             "for large files when installed (default: auto)")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        print("No supported files matched", file=sys.stderr)
+        return 1
+    summaries = profile_files(paths, args.output, formats=args.format, workers=args.workers,
+                              dtype_backend="pyarrow" if args.arrow else None, max_json_size=args.max_json_size,
+                              chunked=args.chunked, engine=args.engine)
+    failed = 0
+    for summary in summaries:
+        if 'error' in summary:
+            failed += 1
+            print(f"FAILED {summary['file']}: {summary['error']}", file=sys.stderr)
+        else:
+            print(f"{summary['file']}: {summary['rows']} rows x {summary['columns']} columns")
+    print(f"Profiled {len(summaries) - failed} of {len(summaries)} files into {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
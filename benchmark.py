@@ -0,0 +1,461 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from json_utils import load_json_file, json_to_dataframe
+from data_analyzer import DataAnalyzer
+from visualizer import JSONVisualizer
+from results_store import ResultsStore
+
+
+# Approximate size of each generated JSON document
+SCALES = {
+    '1MB': 1024 * 1024,
+    '100MB': 100 * 1024 * 1024,
+    '1GB': 1024 * 1024 * 1024
+}
+
+# Records generated and written at a time
+GENERATE_BATCH_SIZE = 10000
+
+# Operations slower or larger than the baseline by more than this fraction are reported as regressions
+DEFAULT_REGRESSION_THRESHOLD = 0.1
+
+CITIES = ["New York", "London", "Tokyo", "Paris", "Berlin", "Sydney", "Toronto", "Mumbai", "Seoul", "Madrid"]
+
+
+def _wide_record(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Flat record with 200 fields of mixed types."""
+    record = {'id': index}
+    for field in range(50):
+        record[f'int_{field}'] = rng.randint(0, 1000)
+        record[f'float_{field}'] = rng.random() * 100
+        record[f'label_{field}'] = rng.choice(CITIES)
+        record[f'flag_{field}'] = rng.random() < 0.5
+    return record
+
+
+def _nested_record(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Record with objects nested six levels deep and arrays of objects."""
+    return {
+        'id': index,
+        'user': {
+            'name': f"user{rng.randint(0, 5000)}",
+            'profile': {
+                'age': rng.randint(18, 90),
+                'location': {
+                    'city': rng.choice(CITIES),
+                    'geo': {
+                        'lat': rng.uniform(-90, 90),
+                        'lon': rng.uniform(-180, 180),
+                        'accuracy': {'meters': rng.random() * 50, 'source': rng.choice(["gps", "wifi", "ip"])}
+                    }
+                }
+            }
+        },
+        'orders': [{'sku': f"sku{rng.randint(0, 200)}", 'amount': round(rng.random() * 500, 2)}
+                   for _ in range(rng.randint(0, 4))],
+        'tags': [rng.choice(["new", "vip", "churned", "trial"]) for _ in range(rng.randint(0, 3))],
+        'score': rng.random() if rng.random() < 0.9 else None
+    }
+
+
+def _high_cardinality_record(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Record whose string fields have mostly distinct values."""
+    return {
+        'id': index,
+        'session': f"{rng.getrandbits(64):016x}",
+        'email': f"user{rng.randint(0, 10 ** 7)}@example.com",
+        'city': f"city{rng.randint(0, 20000)}",
+        'country': rng.choice(CITIES),
+        'value': rng.gauss(100, 15),
+        'count': rng.randint(0, 10 ** 6)
+    }
+
+
+def _numeric_record(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Record of numeric measurements with a single low-cardinality label."""
+    record = {'id': index, 'group': rng.choice(CITIES)}
+    for field in range(20):
+        record[f'x{field}'] = rng.gauss(field, 1 + field)
+    for field in range(10):
+        record[f'n{field}'] = rng.randint(-10 ** 6, 10 ** 6)
+    return record
+
+
+# Synthetic record generators by dataset name
+GENERATORS: Dict[str, Callable[[random.Random, int], Dict[str, Any]]] = {
+    'wide': _wide_record,
+    'nested': _nested_record,
+    'high_cardinality': _high_cardinality_record,
+    'numeric': _numeric_record
+}
+
+
+def generate_records(kind: str, target_bytes: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate synthetic records whose JSON encoding is about target_bytes long.
+
+    Args:
+        kind (str): Dataset name from GENERATORS
+        target_bytes (int): Approximate size of the JSON array of all records
+        seed (int): Random seed; the same seed gives the same records
+
+    Yields:
+        dict: Records
+
+    Raises:
+        ValueError: If the dataset name is unknown
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown dataset '{kind}'. Choose from: {', '.join(GENERATORS)}")
+    make = GENERATORS[kind]
+    rng = random.Random(seed)
+    written = 2
+    index = 0
+    while written < target_bytes:
+        record = make(rng, index)
+        written += len(json.dumps(record)) + 2
+        index += 1
+        yield record
+
+
+def write_dataset(kind: str, scale: str, data_dir: str, seed: int = 0) -> str:
+    """
+    Write a synthetic JSON dataset to disk unless it already exists.
+
+    Args:
+        kind (str): Dataset name from GENERATORS
+        scale (str): Size name from SCALES
+        data_dir (str): Directory for generated files
+        seed (int): Random seed
+
+    Returns:
+        str: Path of the dataset file
+
+    Raises:
+        ValueError: If the scale is unknown
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}'. Choose from: {', '.join(SCALES)}")
+    path = os.path.join(data_dir, f"{kind}-{scale}-seed{seed}.json")
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    partial_path = path + '.partial'
+    with open(partial_path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        first = True
+        batch = []
+        for record in generate_records(kind, SCALES[scale], seed):
+            batch.append(json.dumps(record))
+            if len(batch) >= GENERATE_BATCH_SIZE:
+                f.write(('' if first else ',\n') + ',\n'.join(batch))
+                first, batch = False, []
+        if batch:
+            f.write(('' if first else ',\n') + ',\n'.join(batch))
+        f.write(']')
+    # Only complete files are reused by later runs
+    os.replace(partial_path, path)
+    return path
+
+
+def measure(run: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None,
+            repeat: int = 3, memory: bool = True) -> Dict[str, Any]:
+    """
+    Time a function and measure its peak memory allocation.
+
+    Setup runs before every call and is not timed, so each call starts from the
+    same state (e.g. an empty results store).
+
+    Args:
+        run (callable): Function to measure, called with the result of setup
+        setup (callable, optional): Prepares the argument of run
+        repeat (int): Timed calls
+        memory (bool): Make one extra call under tracemalloc for the peak of
+            Python and NumPy allocations
+
+    Returns:
+        dict: 'min_seconds', 'median_seconds', 'times' and 'peak_bytes' (None
+            without memory measurement)
+    """
+    times = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        run(argument)
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        argument = setup() if setup is not None else None
+        tracemalloc.start()
+        try:
+            run(argument)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        'min_seconds': min(times),
+        'median_seconds': statistics.median(times),
+        'times': times,
+        'peak_bytes': peak
+    }
+
+
+# Analyzer methods measured, with their arguments given the analyzer
+ANALYZER_CALLS: Dict[str, Callable[[DataAnalyzer], Any]] = {
+    'numeric_columns': lambda analyzer: analyzer.numeric_columns,
+    'categorical_columns': lambda analyzer: analyzer.categorical_columns,
+    'get_basic_info': lambda analyzer: analyzer.get_basic_info(),
+    'get_column_types': lambda analyzer: analyzer.get_column_types(),
+    'get_summary_statistics': lambda analyzer: analyzer.get_summary_statistics(),
+    'get_categorical_summary': lambda analyzer: analyzer.get_categorical_summary(),
+    'get_value_counts': lambda analyzer: analyzer.get_value_counts(analyzer.categorical_columns),
+    'get_missing_data_info': lambda analyzer: analyzer.get_missing_data_info(),
+    'get_correlation_matrix': lambda analyzer: analyzer.get_correlation_matrix(),
+    'get_data_sample': lambda analyzer: analyzer.get_data_sample()
+}
+
+# Visualizer methods measured, given the visualizer, two numeric columns and a categorical column
+VISUALIZER_CALLS: Dict[str, Callable[[JSONVisualizer, str, str, str], Any]] = {
+    'create_histogram': lambda v, x, y, c: v.create_histogram(x),
+    'create_binned_histogram': lambda v, x, y, c: v.create_binned_histogram(x),
+    'create_bar_chart': lambda v, x, y, c: v.create_bar_chart(c),
+    'create_pie_chart': lambda v, x, y, c: v.create_pie_chart(c),
+    'create_scatter_plot': lambda v, x, y, c: v.create_scatter_plot(x, y),
+    'create_density_plot': lambda v, x, y, c: v.create_density_plot(x, y),
+    'create_box_plot': lambda v, x, y, c: v.create_box_plot(x),
+    'create_correlation_heatmap': lambda v, x, y, c: v.create_correlation_heatmap(),
+    'create_line_chart': lambda v, x, y, c: v.create_line_chart(x, y)
+}
+
+
+def benchmark_dataset(path: str, repeat: int = 3, memory: bool = True,
+                      operations: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Benchmark loading, flattening, analysis and chart rendering of one JSON file.
+
+    Rendering ('render.*') measures serializing each figure to the JSON sent
+    to the browser.
+
+    Args:
+        path (str): JSON file
+        repeat (int): Timed calls per operation
+        memory (bool): Also measure peak allocations
+        operations (list, optional): Only run operations whose name contains one
+            of these strings
+
+    Returns:
+        dict: 'rows' and 'columns' of the flattened data and 'operations', one
+            result per operation: 'operation' plus the fields of measure(), or
+            'skipped' with a reason
+    """
+    def wanted(name: str) -> bool:
+        return operations is None or any(part in name for part in operations)
+
+    results = []
+
+    def record(name: str, run: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None):
+        if not wanted(name):
+            return
+        try:
+            results.append({'operation': name, **measure(run, setup, repeat=repeat, memory=memory)})
+        except Exception as e:
+            results.append({'operation': name, 'skipped': f"{type(e).__name__}: {str(e)}"})
+
+    record('load_json_file', lambda _: load_json_file(path, max_size=None))
+    data = load_json_file(path, max_size=None)
+    record('json_to_dataframe', lambda _: json_to_dataframe(data))
+    df = json_to_dataframe(data)
+    del data
+
+    record('DataAnalyzer.__init__', lambda _: DataAnalyzer(df, results_store=ResultsStore()))
+    for name, call in ANALYZER_CALLS.items():
+        # A fresh results store keeps every call from being served from the cache
+        record(f'DataAnalyzer.{name}', call, lambda: DataAnalyzer(df, results_store=ResultsStore()))
+
+    summary = {'rows': len(df), 'columns': len(df.columns), 'operations': results}
+    analyzer = DataAnalyzer(df, results_store=ResultsStore())
+    numeric = analyzer.numeric_columns
+    categorical = analyzer.categorical_columns
+    if len(numeric) < 2 or not categorical:
+        return summary
+    x, y, c = numeric[1], numeric[2 % len(numeric)], categorical[0]
+    for name, call in VISUALIZER_CALLS.items():
+        record(f'JSONVisualizer.{name}', lambda v, call=call: call(v, x, y, c),
+               lambda: JSONVisualizer(df, results_store=ResultsStore()))
+        record(f'render.{name}', lambda fig: fig.to_json(),
+               lambda call=call: call(JSONVisualizer(df, results_store=ResultsStore()), x, y, c))
+    return summary
+
+
+def environment_info() -> Dict[str, Any]:
+    """
+    Describe the code and machine the benchmark ran on.
+
+    Returns:
+        dict: 'commit' (None outside a git checkout), 'timestamp', 'python',
+            'pandas', 'numpy', 'platform' and 'cpu_count'
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run_benchmarks(datasets: List[str], scales: List[str], data_dir: str, repeat: int = 3, memory: bool = True,
+                   operations: Optional[List[str]] = None, seed: int = 0,
+                   progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Benchmark every combination of dataset and scale.
+
+    Args:
+        datasets (list): Names from GENERATORS
+        scales (list): Names from SCALES
+        data_dir (str): Directory for generated files, reused across runs
+        repeat (int): Timed calls per operation
+        memory (bool): Also measure peak allocations
+        operations (list, optional): Only run operations containing one of these strings
+        seed (int): Random seed of the generators
+        progress (callable, optional): Called with a message before each dataset
+
+    Returns:
+        dict: {'environment': environment_info(), 'results': [...]} where each
+            result has 'dataset', 'scale', 'file_bytes', 'rows', 'columns' and
+            the fields of benchmark_dataset
+    """
+    results = []
+    for kind in datasets:
+        for scale in scales:
+            if progress is not None:
+                progress(f"{kind} @ {scale}")
+            path = write_dataset(kind, scale, data_dir, seed)
+            summary = benchmark_dataset(path, repeat=repeat, memory=memory, operations=operations)
+            for result in summary['operations']:
+                results.append({'dataset': kind, 'scale': scale, 'file_bytes': os.path.getsize(path),
+                                'rows': summary['rows'], 'columns': summary['columns'], **result})
+    return {'environment': environment_info(), 'results': results}
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare two benchmark runs operation by operation.
+
+    Args:
+        current (dict): Result of run_benchmarks
+        baseline (dict): Earlier result of run_benchmarks
+        threshold (float): Relative increase in median time or peak memory
+            reported as a regression
+
+    Returns:
+        list: For each operation measured in both runs, 'dataset', 'scale',
+            'operation', 'time_ratio', 'memory_ratio' (None if not measured)
+            and 'regression'
+    """
+    def key(result):
+        return result['dataset'], result['scale'], result['operation']
+
+    before = {key(result): result for result in baseline['results'] if 'skipped' not in result}
+    comparison = []
+    for result in current['results']:
+        old = before.get(key(result))
+        if old is None or 'skipped' in result:
+            continue
+        time_ratio = result['median_seconds'] / old['median_seconds'] if old['median_seconds'] else None
+        memory_ratio = None
+        if result['peak_bytes'] is not None and old['peak_bytes']:
+            memory_ratio = result['peak_bytes'] / old['peak_bytes']
+        comparison.append({
+            'dataset': result['dataset'],
+            'scale': result['scale'],
+            'operation': result['operation'],
+            'time_ratio': time_ratio,
+            'memory_ratio': memory_ratio,
+            'regression': any(ratio is not None and ratio > 1 + threshold for ratio in (time_ratio, memory_ratio))
+        })
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Arguments; sys.argv[1:] if omitted
+
+    Returns:
+        int: Exit status, 1 if a comparison found regressions
+    """
+    parser = argparse.ArgumentParser(description="Benchmark loading, flattening, analysis and rendering on synthetic JSON data.")
+    parser.add_argument('-d', '--datasets', nargs='+', choices=list(GENERATORS), default=list(GENERATORS),
+                        help="Synthetic datasets to benchmark (default: all)")
+    parser.add_argument('-s', '--scales', nargs='+', choices=list(SCALES), default=['1MB'],
+                        help="Dataset sizes (default: 1MB)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="Timed calls per operation (default: 3)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc peak memory measurement")
+    parser.add_argument('-k', '--operations', nargs='+',
+                        help="Only run operations whose name contains one of these strings")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed of the generators (default: 0)")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'json-visualizer-benchmarks'),
+                        help="Directory for generated datasets, reused across runs")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="Results file (default: benchmark_results.json)")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative slowdown or memory growth reported as a regression (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.datasets, args.scales, args.data_dir, repeat=args.repeat, memory=not args.no_memory,
+                            operations=args.operations, seed=args.seed,
+                            progress=lambda message: print(f"Benchmarking {message}...", file=sys.stderr))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'dataset':<18}{'scale':<7}{'operation':<44}{'median s':>10}{'peak MB':>10}")
+    for result in report['results']:
+        if 'skipped' in result:
+            print(f"{result['dataset']:<18}{result['scale']:<7}{result['operation']:<44}  skipped: {result['skipped']}")
+            continue
+        peak = f"{result['peak_bytes'] / (1024 * 1024):.1f}" if result['peak_bytes'] is not None else '-'
+        print(f"{result['dataset']:<18}{result['scale']:<7}{result['operation']:<44}{result['median_seconds']:>10.4f}{peak:>10}")
+    print(f"Results written to {args.output}")
+
+    if args.compare is None:
+        return 0
+    with open(args.compare, encoding='utf-8') as f:
+        baseline = json.load(f)
+    comparison = compare_results(report, baseline, args.threshold)
+    regressions = [entry for entry in comparison if entry['regression']]
+    for entry in regressions:
+        memory = f", memory x{entry['memory_ratio']:.2f}" if entry['memory_ratio'] is not None else ''
+        time_ratio = f"x{entry['time_ratio']:.2f}" if entry['time_ratio'] is not None else '-'
+        print(f"REGRESSION {entry['dataset']} {entry['scale']} {entry['operation']}: time {time_ratio}{memory}")
+    print(f"{len(regressions)} of {len(comparison)} operations regressed against {baseline['environment'].get('commit')}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,565 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from sketches import CategoricalSketch
+from results_store import ResultsStore, default_results_store
+
+try:
+    import duckdb
+except ImportError:  # Every dataset is then analyzed with pandas
+    duckdb = None
+
+# Whether engine="duckdb" can be used
+DUCKDB_AVAILABLE = duckdb is not None
+
+ENGINES = ['auto', 'pandas', 'duckdb']
+
+# Formats DuckDB queries in place, without loading them into pandas
+DUCKDB_EXTENSIONS = ['parquet', 'csv', 'tsv', 'ndjson', 'jsonl']
+
+# Files at least this large are analyzed with DuckDB when the engine is "auto"
+DUCKDB_MIN_BYTES = int(os.environ.get('JSON_VISUALIZER_DUCKDB_MB', 256)) * 1024 * 1024  # 256MB
+
+# Upper bound on the number of bins produced by data-driven strategies
+MAX_BINS = 1000
+
+BIN_STRATEGIES = ['fixed', 'fd', 'quantile']
+
+# Statistics reported by describe(), in pandas order
+DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def compute_histogram_bins(values: np.ndarray, bins: int = 50,
+                           strategy: str = 'fixed') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute histogram counts and bin edges for numeric values.
+
+    Args:
+        values (np.ndarray): Numeric values; NaN and infinite values are ignored
+        bins (int): Number of bins for the 'fixed' and 'quantile' strategies
+        strategy (str): 'fixed' (equal-width bins), 'fd' (Freedman-Diaconis bin
+            width) or 'quantile' (equal-frequency bins)
+
+    Returns:
+        tuple: (counts, edges) as returned by np.histogram
+    """
+    if strategy not in BIN_STRATEGIES:
+        raise ValueError(f"Unknown bin strategy '{strategy}'. Use one of: {', '.join(BIN_STRATEGIES)}")
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    if strategy == 'quantile':
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)))
+        if len(edges) < 2:
+            edges = np.array([values[0], values[0] + 1.0])
+        return np.histogram(values, bins=edges)
+    if strategy == 'fd':
+        q75, q25 = np.percentile(values, [75, 25])
+        width = 2 * (q75 - q25) / np.cbrt(len(values))
+        value_range = values.max() - values.min()
+        if width > 0 and value_range > 0:
+            bins = int(min(MAX_BINS, max(1, np.ceil(value_range / width))))
+    return np.histogram(values, bins=bins)
+
+
+def choose_engine(path: str, file_extension: Optional[str] = None, engine: str = 'auto',
+                  size: Optional[int] = None) -> str:
+    """
+    Choose the compute engine for a data file.
+
+    Args:
+        path (str): Path or name of the file
+        file_extension (str, optional): Format override; inferred from the path if omitted
+        engine (str): 'pandas', 'duckdb', or 'auto' for DuckDB on files of at least
+            DUCKDB_MIN_BYTES in a format it reads (when installed) and pandas otherwise
+        size (int, optional): Size of the file in bytes, e.g. of an upload that is
+            not on disk yet; read from the path if omitted
+
+    Returns:
+        str: 'pandas' or 'duckdb'
+
+    Raises:
+        ValueError: If the engine is unknown, or DuckDB is requested but not installed
+            or cannot read the format
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Use one of: {', '.join(ENGINES)}")
+    file_extension = (file_extension or path.rsplit('.', 1)[-1]).lower()
+    if engine == 'duckdb':
+        if duckdb is None:
+            raise ValueError("The DuckDB engine requires the duckdb package")
+        if file_extension not in DUCKDB_EXTENSIONS:
+            raise ValueError(f"The DuckDB engine cannot read {file_extension} files. Supported: {', '.join(DUCKDB_EXTENSIONS)}")
+        return 'duckdb'
+    if (engine == 'auto' and duckdb is not None and file_extension in DUCKDB_EXTENSIONS
+            and (size if size is not None else os.path.getsize(path)) >= DUCKDB_MIN_BYTES):
+        return 'duckdb'
+    return 'pandas'
+
+
+def _is_hashable_column(series: pd.Series) -> bool:
+    """Check whether a column's values can be used for categorical analysis."""
+    try:
+        # Test with a small sample of values
+        sample_values = series.dropna().head(5)
+        for val in sample_values:
+            if pd.notna(val):
+                # Try to hash the value to check if it's hashable
+                hash(val)
+        return True
+    except (TypeError, ValueError):
+        # Columns with unhashable types like lists or other complex objects
+        return False
+
+
+def _sketch_categorical_column(series: pd.Series, chunk_size: int = 1000000) -> Dict[str, Any]:
+    """Get the approximate unique count and top values of one categorical column."""
+    try:
+        chunks = (series.iloc[start:start + chunk_size].to_frame() for start in range(0, len(series), chunk_size))
+        return CategoricalSketch.from_chunks(chunks).get_categorical_summary()[series.name]
+    except Exception:
+        # Handle case where value_counts fails
+        return {
+            'unique_values': 'Unable to compute',
+            'top_values': 'Unable to compute'
+        }
+
+
+def _value_counts(series: pd.Series) -> Optional[pd.Series]:
+    """Get value counts of one column, or None if its values are not hashable."""
+    try:
+        counts = series.value_counts()
+    except Exception:
+        return None
+    # Categorical columns also list categories that do not occur
+    return counts[counts > 0]
+
+
+def _count_missing(series: pd.Series) -> int:
+    """Count missing values in one column."""
+    return int(series.isnull().sum())
+
+
+def _describe_column(series: pd.Series) -> pd.Series:
+    """Get describe() statistics of one numeric column."""
+    return series.describe()
+
+
+class ComputeBackend(ABC):
+    """Engine that computes the statistics and chart aggregations of one dataset.
+
+    DataAnalyzer and JSONVisualizer express their reports through these operations,
+    so the same reports run on a pandas DataFrame (PandasBackend) or on an embedded
+    query engine over the data file itself (DuckDBBackend). Results have the shapes
+    pandas gives: describe() frames, value_counts() series and corr() matrices.
+    """
+
+    name = 'base'
+
+    # Whether value_counts() is available; categorical summaries are otherwise always approximate
+    exact_value_counts = True
+
+    @property
+    @abstractmethod
+    def columns(self) -> List[str]:
+        """All columns, in dataset order."""
+
+    @property
+    @abstractmethod
+    def row_count(self) -> int:
+        """Number of rows."""
+
+    @abstractmethod
+    def column_types(self) -> Dict[str, str]:
+        """Get the type name of every column."""
+
+    @abstractmethod
+    def numeric_columns(self) -> List[str]:
+        """Get the numeric columns (booleans excluded, as in pandas' select_dtypes)."""
+
+    @abstractmethod
+    def categorical_columns(self) -> List[str]:
+        """Get the text and categorical columns whose values can be counted."""
+
+    def memory_usage(self) -> Optional[int]:
+        """Get the bytes the dataset occupies in memory, None if it is not loaded."""
+        return None
+
+    @abstractmethod
+    def describe(self, columns: List[str]) -> pd.DataFrame:
+        """
+        Get count, mean, std, min, quartiles and max of numeric columns.
+
+        Args:
+            columns (list): Numeric columns
+
+        Returns:
+            pd.DataFrame: Statistics in the format of DataFrame.describe()
+        """
+
+    @abstractmethod
+    def missing_counts(self) -> pd.Series:
+        """Count the missing values of every column, as int64 indexed by column."""
+
+    @abstractmethod
+    def value_counts(self, columns: List[str]) -> Dict[str, Optional[pd.Series]]:
+        """
+        Get the occurrences of each value of columns, most frequent first.
+
+        Args:
+            columns (list): Column names
+
+        Returns:
+            dict: Value counts per column, None for columns with unhashable values
+        """
+
+    def approximate_categorical_summary(self, columns: List[str], chunk_size: int = 1000000) -> Dict[str, Any]:
+        """
+        Get unique counts and top values of columns, approximately where the engine saves work by it.
+
+        Args:
+            columns (list): Categorical columns
+            chunk_size (int): Rows per chunk for engines that sketch chunks
+
+        Returns:
+            dict: 'unique_values', 'top_values', 'unique_values_error' and
+                'top_values_error' per column (see DataAnalyzer.get_categorical_summary)
+        """
+        # Exact counts, for engines that count without holding the values in memory
+        summary = {}
+        for col, counts in self.value_counts(columns).items():
+            if counts is None:
+                summary[col] = {'unique_values': 'Unable to compute', 'top_values': 'Unable to compute'}
+            else:
+                summary[col] = {'unique_values': len(counts), 'top_values': counts.head(5).to_dict(),
+                                'unique_values_error': 0.0, 'top_values_error': 0}
+        return summary
+
+    @abstractmethod
+    def corr(self, columns: List[str]) -> pd.DataFrame:
+        """
+        Get pairwise Pearson correlations of numeric columns over rows where both are present.
+
+        Args:
+            columns (list): Numeric columns
+
+        Returns:
+            pd.DataFrame: Correlation matrix in the format of DataFrame.corr()
+        """
+
+    def histogram(self, column: str, bins: int = 50, strategy: str = 'fixed') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get histogram counts and bin edges of a numeric column.
+
+        Args:
+            column (str): Numeric column
+            bins (int): Number of bins (see compute_histogram_bins)
+            strategy (str): 'fixed', 'fd' or 'quantile'
+
+        Returns:
+            tuple: (counts, edges) as returned by np.histogram
+        """
+        return compute_histogram_bins(self.to_pandas([column])[column].to_numpy(dtype=float, na_value=np.nan),
+                                      bins, strategy)
+
+    @abstractmethod
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Get the first n rows."""
+
+    @abstractmethod
+    def to_pandas(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Get columns as a pandas DataFrame, e.g. for charts that plot individual rows.
+
+        Args:
+            columns (list, optional): Columns to read; all columns if omitted
+
+        Returns:
+            pd.DataFrame: Every row of the columns
+        """
+
+
+class PandasBackend(ComputeBackend):
+    """Computes on a pandas DataFrame in memory, column by column in parallel when asked."""
+
+    name = 'pandas'
+
+    def __init__(self, df: pd.DataFrame, n_jobs: int = 1, use_processes: bool = False,
+                 results_store: Optional[ResultsStore] = None, results_key: Optional[Any] = None):
+        """
+        Initialize the backend with a DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame to compute on
+            n_jobs (int): Number of workers for column-level work; 1 runs serially,
+                -1 uses all CPU cores
+            use_processes (bool): Use a process pool instead of a thread pool
+                (columns are pickled to the workers)
+            results_store (ResultsStore, optional): Store for value counts and
+                correlations shared with other users of the same DataFrame; the
+                default store if omitted
+            results_key (optional): Object the shared results are stored under, e.g.
+                the LazyDataset df holds columns of, so frames with different column
+                selections of one dataset share results; df itself if omitted
+        """
+        self.df = df
+        self.results_key = results_key if results_key is not None else df
+        self.results_store = results_store if results_store is not None else default_results_store
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+        self.use_processes = use_processes
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.df.columns)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.df)
+
+    def _map_columns(self, func: Callable[[pd.Series], Any], columns: List[str]) -> List[Any]:
+        """
+        Apply a function to each column, in parallel when n_jobs > 1.
+
+        Args:
+            func (callable): Module-level function taking a column Series
+            columns (list): Column names
+
+        Returns:
+            list: Results in the order of columns
+        """
+        if self.n_jobs == 1 or len(columns) < 2:
+            return [func(self.df[col]) for col in columns]
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with executor_class(max_workers=min(self.n_jobs, len(columns))) as executor:
+            return list(executor.map(func, (self.df[col] for col in columns)))
+
+    def column_types(self) -> Dict[str, str]:
+        return self.df.dtypes.astype(str).to_dict()
+
+    def numeric_columns(self) -> List[str]:
+        return list(self.df.select_dtypes(include=[np.number]).columns)
+
+    def categorical_columns(self) -> List[str]:
+        # Filter out columns that contain lists or other non-hashable types
+        object_cols = list(self.df.select_dtypes(include=['object', 'category', 'string']).columns)
+        hashable = self._map_columns(_is_hashable_column, object_cols)
+        return [col for col, ok in zip(object_cols, hashable) if ok]
+
+    def memory_usage(self) -> Optional[int]:
+        return self.df.memory_usage(deep=True).sum()
+
+    def describe(self, columns: List[str]) -> pd.DataFrame:
+        if self.n_jobs == 1:
+            return self.df[columns].describe()
+        return pd.concat(self._map_columns(_describe_column, columns), axis=1)
+
+    def missing_counts(self) -> pd.Series:
+        if self.n_jobs == 1:
+            return self.df.isnull().sum()
+        return pd.Series(self._map_columns(_count_missing, list(self.df.columns)), index=self.df.columns, dtype='int64')
+
+    def value_counts(self, columns: List[str]) -> Dict[str, Optional[pd.Series]]:
+        # Results are shared through the store, e.g. between the categorical summary and bar charts
+        missing = object()
+        counts = {col: self.results_store.get(self.results_key, 'value_counts', (col,), missing) for col in columns}
+        to_compute = [col for col in columns if counts[col] is missing]
+        for col, result in zip(to_compute, self._map_columns(_value_counts, to_compute)):
+            counts[col] = result if result is None else self.results_store.put(self.results_key, 'value_counts', (col,), result)
+        return counts
+
+    def approximate_categorical_summary(self, columns: List[str], chunk_size: int = 1000000) -> Dict[str, Any]:
+        # HyperLogLog/Space-Saving sketches over chunks instead of exact passes
+        summarize = partial(_sketch_categorical_column, chunk_size=chunk_size)
+        return dict(zip(columns, self._map_columns(summarize, columns)))
+
+    def corr(self, columns: List[str]) -> pd.DataFrame:
+        return self.results_store.get_or_compute(self.results_key, 'corr', columns, lambda: self.df[columns].corr())
+
+    def histogram(self, column: str, bins: int = 50, strategy: str = 'fixed') -> Tuple[np.ndarray, np.ndarray]:
+        return compute_histogram_bins(self.df[column].to_numpy(dtype=float, na_value=np.nan), bins, strategy)
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self.df.head(n)
+
+    def to_pandas(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self.df if columns is None else self.df[columns]
+
+
+# DuckDB types counted as numeric (booleans are not, as in pandas)
+_DUCKDB_NUMERIC_TYPES = {'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT',
+                         'UINTEGER', 'UBIGINT', 'UHUGEINT', 'FLOAT', 'DOUBLE', 'DECIMAL'}
+
+_DUCKDB_CATEGORICAL_TYPES = {'VARCHAR', 'ENUM'}
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _sql_identifier(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class DuckDBBackend(ComputeBackend):
+    """Computes with DuckDB's vectorized, multi-threaded engine directly on a data file.
+
+    Parquet, CSV/TSV and NDJSON files are queried in place: every statistic is an
+    aggregate query that reads only the columns it uses, and nothing is loaded into
+    pandas except results and the columns of row-level charts. Nested NDJSON
+    objects stay single struct columns rather than being flattened.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, path: str, file_extension: Optional[str] = None, threads: Optional[int] = None):
+        """
+        Open a data file.
+
+        Args:
+            path (str): Path to a Parquet, CSV, TSV or NDJSON file
+            file_extension (str, optional): Format override; inferred from the path if omitted
+            threads (int, optional): Threads DuckDB may use; all CPU cores if omitted
+
+        Raises:
+            ValueError: If DuckDB is not installed, the format is not supported or
+                the file cannot be read
+        """
+        file_extension = (file_extension or path.rsplit('.', 1)[-1]).lower()
+        # Raises for a missing duckdb package or an unsupported format
+        choose_engine(path, file_extension, 'duckdb')
+        self.path = path
+        self.file_extension = file_extension
+        self._connection = duckdb.connect()
+        # Connections are not safe for concurrent use; queries are serialized (each is multi-threaded)
+        self._lock = threading.Lock()
+        if threads is not None:
+            self._connection.execute(f"SET threads = {int(threads)}")
+        if file_extension == 'parquet':
+            self._source = f"read_parquet({_sql_string(path)})"
+        elif file_extension in ('csv', 'tsv'):
+            delimiter = '\t' if file_extension == 'tsv' else ','
+            self._source = f"read_csv({_sql_string(path)}, header = true, delim = {_sql_string(delimiter)})"
+        else:
+            self._source = f"read_json({_sql_string(path)}, format = 'newline_delimited')"
+        try:
+            described = self._query(f"DESCRIBE SELECT * FROM {self._source}")
+        except duckdb.Error as e:
+            raise ValueError(f"Could not read {path}: {e}") from e
+        self._types: Dict[str, str] = dict(zip(described['column_name'], described['column_type']))
+        self._row_count: Optional[int] = None
+
+    def _query(self, sql: str) -> pd.DataFrame:
+        with self._lock:
+            return self._connection.execute(sql).df()
+
+    def _row(self, sql: str) -> Tuple:
+        with self._lock:
+            return self._connection.execute(sql).fetchone()
+
+    def _base_type(self, column: str) -> str:
+        return self._types[column].split('(')[0]
+
+    def _value(self, column: str) -> str:
+        """SQL expression of a column's values, with NaN counted as missing like in pandas."""
+        identifier = _sql_identifier(column)
+        if self._base_type(column) in ('FLOAT', 'DOUBLE'):
+            return f"(CASE WHEN isnan({identifier}) THEN NULL ELSE {identifier} END)"
+        return identifier
+
+    def _number(self, column: str) -> str:
+        return f"CAST({self._value(column)} AS DOUBLE)"
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._types)
+
+    @property
+    def row_count(self) -> int:
+        if self._row_count is None:
+            # Parquet row counts come from the footer
+            self._row_count = int(self._row(f"SELECT count(*) FROM {self._source}")[0])
+        return self._row_count
+
+    def column_types(self) -> Dict[str, str]:
+        return dict(self._types)
+
+    def numeric_columns(self) -> List[str]:
+        return [col for col in self._types if self._base_type(col) in _DUCKDB_NUMERIC_TYPES]
+
+    def categorical_columns(self) -> List[str]:
+        return [col for col in self._types if self._base_type(col) in _DUCKDB_CATEGORICAL_TYPES]
+
+    def describe(self, columns: List[str]) -> pd.DataFrame:
+        if not columns:
+            return pd.DataFrame()
+        # One scan computes every statistic of every column
+        aggregates = []
+        for col in columns:
+            value = self._number(col)
+            aggregates += [f"count({value})", f"avg({value})", f"stddev_samp({value})", f"min({value})",
+                           f"quantile_cont({value}, 0.25)", f"quantile_cont({value}, 0.5)",
+                           f"quantile_cont({value}, 0.75)", f"max({value})"]
+        row = self._row(f"SELECT {', '.join(aggregates)} FROM {self._source}")
+        values = np.array([np.nan if value is None else float(value) for value in row]).reshape(len(columns), len(DESCRIBE_INDEX))
+        return pd.DataFrame(values.T, index=DESCRIBE_INDEX, columns=columns)
+
+    def missing_counts(self) -> pd.Series:
+        columns = self.columns
+        row = self._row(f"SELECT {', '.join(f'count(*) - count({self._value(col)})' for col in columns)} FROM {self._source}")
+        return pd.Series([int(count) for count in row], index=columns, dtype='int64')
+
+    def value_counts(self, columns: List[str]) -> Dict[str, Optional[pd.Series]]:
+        counts = {}
+        for col in columns:
+            if self._base_type(col) in ('STRUCT', 'MAP', 'UNION') or self._types[col].endswith(']'):
+                # Nested values, which pandas cannot count either
+                counts[col] = None
+                continue
+            value = self._value(col)
+            result = self._query(f"SELECT {value} AS value, count(*) AS count FROM {self._source} "
+                                 f"WHERE {value} IS NOT NULL GROUP BY 1 ORDER BY 2 DESC")
+            series = pd.Series(result['count'].to_numpy(dtype=np.int64), index=pd.Index(result['value'], name=col), name='count')
+            counts[col] = series
+        return counts
+
+    def corr(self, columns: List[str]) -> pd.DataFrame:
+        # corr() skips rows where either value is missing, like pandas' pairwise-complete correlation
+        pairs = [(i, j) for i in range(len(columns)) for j in range(i, len(columns))]
+        row = self._row(f"SELECT {', '.join(f'corr({self._number(columns[i])}, {self._number(columns[j])})' for i, j in pairs)} "
+                        f"FROM {self._source}")
+        matrix = np.full((len(columns), len(columns)), np.nan)
+        for (i, j), value in zip(pairs, row):
+            matrix[i, j] = matrix[j, i] = np.nan if value is None else value
+        return pd.DataFrame(matrix, index=columns, columns=columns)
+
+    def histogram(self, column: str, bins: int = 50, strategy: str = 'fixed') -> Tuple[np.ndarray, np.ndarray]:
+        if strategy != 'fixed':
+            # Data-driven edges need the values; only this column is read
+            return super().histogram(column, bins, strategy)
+        value = self._number(column)
+        low, high = self._row(f"SELECT min({value}), max({value}) FROM {self._source} WHERE isfinite({value})")
+        if low is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        if low == high:
+            # np.histogram widens an empty range by 0.5 on both sides
+            low, high = low - 0.5, high + 0.5
+        edges = np.linspace(low, high, bins + 1)
+        result = self._query(f"SELECT least(CAST(floor(({value} - {low!r}) / {(high - low)!r} * {bins}) AS BIGINT), {bins - 1}) AS bin, "
+                             f"count(*) AS count FROM {self._source} WHERE isfinite({value}) GROUP BY 1")
+        counts = np.zeros(bins, dtype=np.int64)
+        counts[result['bin'].to_numpy(dtype=np.int64)] = result['count'].to_numpy(dtype=np.int64)
+        return counts, edges
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self._query(f"SELECT * FROM {self._source} LIMIT {int(n)}")
+
+    def to_pandas(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        selection = '*' if columns is None else ', '.join(_sql_identifier(col) for col in columns)
+        return self._query(f"SELECT {selection} FROM {self._source}")
@@ -1,45 +1,127 @@
+import functools
+import threading
 import pandas as pd
-import numpy as np
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Callable, Optional, Union, Iterable
+from compute_backend import ComputeBackend, PandasBackend
+from incremental_stats import ChunkedBackend
+from results_store import ResultsStore
+from instrumentation import traced
+
+
+def _analyzed_rows(analyzer: 'DataAnalyzer', *args, **kwargs) -> int:
+    """Rows processed by an analyzer method, recorded with its span."""
+    return analyzer.backend.row_count
+
+
+def _memoized(method: Callable) -> Callable:
+    """Compute a report on first request and return the same result for the same arguments afterwards."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+        result = method(self, *args, **kwargs)
+        with self._lock:
+            return self._results.setdefault(key, result)
+    return wrapper
 
 
 class DataAnalyzer:
-    """Generic analyzer for any data that provides insights and statistics."""
+    """Generic analyzer for any data that provides insights and statistics.
+    
+    Nothing is computed up front: column types are classified on first access
+    and each report is computed on its first request, then reused. Reports are
+    computed by a ComputeBackend: pandas for a DataFrame, or e.g. DuckDB querying
+    a file directly (see compute_backend.choose_engine).
+    """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: Union[pd.DataFrame, ComputeBackend], n_jobs: int = 1, use_processes: bool = False,
+                 results_store: Optional[ResultsStore] = None, results_key: Optional[Any] = None):
         """
-        Initialize the analyzer with a DataFrame.
+        Initialize the analyzer with a DataFrame or a compute backend.
         
         Args:
-            df (pd.DataFrame): DataFrame to analyze
+            df (pd.DataFrame or ComputeBackend): DataFrame to analyze, or a backend
+                over the dataset
+            n_jobs (int): Number of workers for column-level work on a DataFrame;
+                1 runs serially, -1 uses all CPU cores
+            use_processes (bool): Use a process pool instead of a thread pool
+                (columns are pickled to the workers)
+            results_store (ResultsStore, optional): Store for results shared with
+                visualizers of the same DataFrame; the default store if omitted
+            results_key (optional): Object shared results are stored under, e.g. the
+                LazyDataset a DataFrame of selected columns was read from (see
+                PandasBackend); the DataFrame itself if omitted
+        """
+        if isinstance(df, ComputeBackend):
+            self.backend = df
+        else:
+            self.backend = PandasBackend(df, n_jobs=n_jobs, use_processes=use_processes, results_store=results_store,
+                                         results_key=results_key)
+        self._numeric_columns: Optional[List[str]] = None
+        self._categorical_columns: Optional[List[str]] = None
+        self._results: Dict[Tuple, Any] = {}
+        self._lock = threading.RLock()
+    
+    @property
+    def reports(self) -> List[Any]:
+        """Reports computed so far."""
+        with self._lock:
+            return list(self._results.values())
+    
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], **kwargs) -> 'DataAnalyzer':
         """
-        self.df = df
-        self.numeric_columns = self._get_numeric_columns()
-        self.categorical_columns = self._get_categorical_columns()
+        Create an analyzer over data that need not fit in memory, consuming it chunk by chunk.
+        
+        Summary statistics, missing data and correlations match those of the whole
+        data in memory, except for quantiles of long columns; categorical summaries
+        are approximate. The chunks are consumed here and not kept.
+        
+        Args:
+            chunks (iterable): DataFrame chunks, e.g. from data_loaders.iter_tabular_batches
+            **kwargs: Arguments passed to ChunkedBackend, e.g. quantile_capacity
+            
+        Returns:
+            DataAnalyzer: Analyzer of all chunks
+            
+        Raises:
+            ValueError: If there are no chunks
+        """
+        return cls(ChunkedBackend(chunks, **kwargs))
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """The analyzed data as a DataFrame (read in full from backends that query files)."""
+        return self.backend.to_pandas()
     
+    @property
+    def numeric_columns(self) -> List[str]:
+        """Numeric columns (classified on first access)."""
+        if self._numeric_columns is None:
+            self._numeric_columns = self._get_numeric_columns()
+        return self._numeric_columns
+    
+    @property
+    def categorical_columns(self) -> List[str]:
+        """Hashable text and categorical columns (classified on first access)."""
+        if self._categorical_columns is None:
+            self._categorical_columns = self._get_categorical_columns()
+        return self._categorical_columns
+    
+    @traced('analyzer.numeric_columns', rows=_analyzed_rows)
     def _get_numeric_columns(self) -> List[str]:
         """Get list of numeric columns in the DataFrame."""
-        return list(self.df.select_dtypes(include=[np.number]).columns)
+        return self.backend.numeric_columns()
     
+    @traced('analyzer.categorical_columns', rows=_analyzed_rows)
     def _get_categorical_columns(self) -> List[str]:
         """Get list of categorical columns in the DataFrame."""
-        # Filter out columns that contain lists or other non-hashable types
-        categorical_cols = []
-        for col in self.df.select_dtypes(include=['object']).columns:
-            # Check if the column contains hashable values
-            try:
-                # Test with a small sample of values
-                sample_values = self.df[col].dropna().head(5)
-                for val in sample_values:
-                    if pd.notna(val):
-                        # Try to hash the value to check if it's hashable
-                        hash(val)
-                categorical_cols.append(col)
-            except (TypeError, ValueError):
-                # Skip columns with unhashable types like lists or other complex objects
-                continue
-        return categorical_cols
+        return self.backend.categorical_columns()
     
+    @_memoized
+    @traced('analyzer.basic_info', rows=_analyzed_rows)
     def get_basic_info(self) -> Dict[str, Any]:
         """
         Get basic information about the dataset.
@@ -48,14 +130,16 @@ class DataAnalyzer:
             dict: Basic information including shape, columns, etc.
         """
         info = {
-            'shape': self.df.shape,
-            'columns': list(self.df.columns),
+            'shape': (self.backend.row_count, len(self.backend.columns)),
+            'columns': self.backend.columns,
             'numeric_columns': self.numeric_columns,
             'categorical_columns': self.categorical_columns,
-            'memory_usage': self.df.memory_usage(deep=True).sum()
+            'memory_usage': self.backend.memory_usage()
         }
         return info
     
+    @_memoized
+    @traced('analyzer.summary_statistics', rows=_analyzed_rows)
     def get_summary_statistics(self) -> pd.DataFrame:
         """
         Get summary statistics for numeric columns.
@@ -64,32 +148,60 @@ class DataAnalyzer:
             pd.DataFrame: Summary statistics
         """
         if len(self.numeric_columns) > 0:
-            return self.df[self.numeric_columns].describe()
+            return self.backend.describe(self.numeric_columns)
         else:
             return pd.DataFrame()
     
-    def get_categorical_summary(self) -> Dict[str, Any]:
+    @_memoized
+    @traced('analyzer.categorical_summary', rows=_analyzed_rows)
+    def get_categorical_summary(self, approximate: bool = False, chunk_size: int = 1000000) -> Dict[str, Any]:
         """
         Get summary for categorical columns.
         
+        Args:
+            approximate (bool): Use HyperLogLog/Space-Saving sketches over chunks
+                instead of exact nunique() and value_counts() passes; always the
+                case for backends without exact value counts (see from_chunks)
+            chunk_size (int): Rows per chunk in approximate mode
+        
         Returns:
-            dict: Summary of categorical columns
+            dict: Summary of categorical columns; in approximate mode each column
+                also reports 'unique_values_error' and 'top_values_error'
         """
+        if approximate or not self.backend.exact_value_counts:
+            return self.backend.approximate_categorical_summary(self.categorical_columns, chunk_size)
+        
+        # One value_counts() per column gives both the unique count and the top values,
+        # and is shared with bar and pie charts through the results store
         summary = {}
-        for col in self.categorical_columns:
-            try:
-                summary[col] = {
-                    'unique_values': self.df[col].nunique(),
-                    'top_values': self.df[col].value_counts().head(5).to_dict()
-                }
-            except Exception:
-                # Handle case where value_counts fails
+        for col, counts in self.get_value_counts(self.categorical_columns).items():
+            if counts is None:
                 summary[col] = {
                     'unique_values': 'Unable to compute',
                     'top_values': 'Unable to compute'
                 }
+            else:
+                summary[col] = {
+                    'unique_values': len(counts),
+                    'top_values': counts.head(5).to_dict()
+                }
         return summary
     
+    @traced('analyzer.value_counts', rows=_analyzed_rows)
+    def get_value_counts(self, columns: List[str]) -> Dict[str, Optional[pd.Series]]:
+        """
+        Get value counts of columns, reusing results from the shared store for DataFrames.
+        
+        Args:
+            columns (list): Column names
+            
+        Returns:
+            dict: Value counts per column, None for columns with unhashable values
+        """
+        return self.backend.value_counts(columns)
+    
+    @_memoized
+    @traced('analyzer.missing_data_info', rows=_analyzed_rows)
     def get_missing_data_info(self) -> pd.DataFrame:
         """
         Get information about missing data.
@@ -97,8 +209,8 @@ class DataAnalyzer:
         Returns:
             pd.DataFrame: Missing data information
         """
-        missing_data = self.df.isnull().sum()
-        missing_percent = 100 * missing_data / len(self.df)
+        missing_data = self.backend.missing_counts()
+        missing_percent = 100 * missing_data / self.backend.row_count
         
         missing_df = pd.DataFrame({
             'missing_count': missing_data,
@@ -107,6 +219,8 @@ class DataAnalyzer:
         
         return missing_df[missing_df['missing_count'] > 0]
     
+    @_memoized
+    @traced('analyzer.correlation_matrix', rows=_analyzed_rows)
     def get_correlation_matrix(self) -> pd.DataFrame:
         """
         Get correlation matrix for numeric columns.
@@ -115,10 +229,12 @@ class DataAnalyzer:
             pd.DataFrame: Correlation matrix
         """
         if len(self.numeric_columns) > 1:
-            return self.df[self.numeric_columns].corr()
+            return self.backend.corr(self.numeric_columns)
         else:
             return pd.DataFrame()
     
+    @_memoized
+    @traced('analyzer.column_types', rows=_analyzed_rows)
     def get_column_types(self) -> Dict[str, str]:
         """
         Get data types of all columns.
@@ -126,8 +242,9 @@ class DataAnalyzer:
         Returns:
             dict: Column names and their data types
         """
-        return self.df.dtypes.astype(str).to_dict()
+        return self.backend.column_types()
     
+    @traced('analyzer.data_sample', rows=_analyzed_rows)
     def get_data_sample(self, n: int = 5) -> pd.DataFrame:
         """
         Get a sample of the data.
@@ -138,4 +255,4 @@ class DataAnalyzer:
         Returns:
             pd.DataFrame: Sample of the data
         """
-        return self.df.head(n)
\ No newline at end of file
+        return self.backend.head(n)
\ No newline at end of file
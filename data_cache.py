@@ -0,0 +1,225 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from lazy_dataset import LazyDataset
+from data_analyzer import DataAnalyzer
+from compute_backend import PandasBackend
+from disk_cache import DiskCache
+from instrumentation import span
+
+
+# Default memory budget shared by all sessions of one server process
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024  # 512MB
+
+# Decoded JSON documents typically take roughly 10x the size of their source text
+JSON_MEMORY_FACTOR = 10
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: Value to measure
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, LazyDataset):
+        # Only the columns loaded so far take memory; re-put the dataset after fetching more
+        return estimate_size(value.frame) if value.loaded_columns else 0
+    if isinstance(value, DataAnalyzer):
+        # The frame it holds, if any, and the reports computed so far; re-put the analyzer after computing more
+        frame_size = estimate_size(value.backend.df) if isinstance(value.backend, PandasBackend) else 0
+        return frame_size + estimate_size(value.reports)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class DataCache:
+    """LRU cache of parsed uploads and derived results, bounded by a memory budget.
+
+    Entries are keyed by a hash of the uploaded bytes plus loader options. Each entry
+    holds named values (parsed document, DataFrame, analyzer results, ...) that are
+    computed on first use and reused across Streamlit reruns and sessions. Values
+    marked as persistent are also kept in an optional DiskCache, so they survive
+    server restarts and are not recomputed when a known file is uploaded again.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, disk: Optional[DiskCache] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes (int): Approximate memory budget for all entries
+            disk (DiskCache, optional): Persistent tier for values marked as persistent
+        """
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._sizes: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(content: bytes, **options) -> str:
+        """
+        Build a cache key from uploaded content and loader options.
+
+        Args:
+            content (bytes): Raw uploaded bytes
+            **options: Loader options that affect the parsed result
+
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.blake2b(content, digest_size=16)
+        for name in sorted(options):
+            digest.update(f"|{name}={options[name]!r}".encode('utf-8'))
+        return digest.hexdigest()
+
+    @property
+    def total_bytes(self) -> int:
+        """Approximate memory currently held by the cache."""
+        with self._lock:
+            return sum(sum(sizes.values()) for sizes in self._sizes.values())
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: str, name: str, default: Any = None) -> Any:
+        """
+        Get a cached value and mark its entry as recently used.
+
+        Args:
+            key (str): Entry key from make_key
+            name (str): Name of the value within the entry
+            default: Value returned when nothing is cached
+
+        Returns:
+            The cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or name not in entry:
+                return default
+            self._entries.move_to_end(key)
+            return entry[name]
+
+    def put(self, key: str, name: str, value: Any, size: Optional[int] = None) -> Any:
+        """
+        Store a value in an entry and evict least recently used entries if over budget.
+
+        Args:
+            key (str): Entry key from make_key
+            name (str): Name of the value within the entry
+            value: Value to store
+            size (int, optional): Size in bytes, estimated when not given
+
+        Returns:
+            The stored value
+        """
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry[name] = value
+            self._sizes.setdefault(key, {})[name] = size
+            self._entries.move_to_end(key)
+            self._evict()
+        return value
+
+    def get_or_compute(self, key: str, name: str, compute: Callable[[], Any],
+                       size: Optional[int] = None, persist: bool = False) -> Any:
+        """
+        Return a cached value, computing and storing it on a miss.
+
+        Args:
+            key (str): Entry key from make_key
+            name (str): Name of the value within the entry
+            compute (callable): Function producing the value
+            size (int, optional): Size in bytes, estimated when not given
+            persist (bool): Also look the value up in, and store it to, the disk cache
+
+        Returns:
+            The cached or freshly computed value
+        """
+        missing = object()
+        value = self.get(key, name, missing)
+        if value is not missing:
+            return value
+        if persist and self.disk is not None:
+            value = self.disk.get(key, name, missing)
+            if value is not missing:
+                return self.put(key, name, value, size)
+        # Compute outside the lock so other sessions are not blocked
+        with span(f'cache.compute.{name}'):
+            value = compute()
+        if persist:
+            self.persist(key, name, value)
+        return self.put(key, name, value, size)
+
+    def persist(self, key: str, name: str, value: Any):
+        """
+        Store a value in the disk cache unless it is already there.
+
+        Args:
+            key (str): Entry key from make_key
+            name (str): Name of the value within the entry
+            value: Value to store
+        """
+        if self.disk is not None and not self.disk.contains(key, name):
+            self.disk.put(key, name, value)
+
+    def restore(self, key: str, names: List[str]) -> bool:
+        """
+        Load values from the disk cache into memory, unless they are already in memory.
+
+        Args:
+            key (str): Entry key from make_key
+            names (list): Names of the values within the entry
+
+        Returns:
+            bool: True if every value is now in memory
+        """
+        missing = object()
+        for name in names:
+            if self.get(key, name, missing) is not missing:
+                continue
+            value = self.disk.get(key, name, missing) if self.disk is not None else missing
+            if value is missing:
+                return False
+            self.put(key, name, value)
+        return True
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget."""
+        total = sum(sum(sizes.values()) for sizes in self._sizes.values())
+        while total > self.max_bytes and self._entries:
+            key, _ = self._entries.popitem(last=False)
+            total -= sum(self._sizes.pop(key).values())
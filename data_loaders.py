@@ -0,0 +1,482 @@
+import contextvars
+import io
+import os
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Callable, Any, Iterator, Tuple, Union, BinaryIO
+from json_utils import BytesSource
+from lazy_dataset import LazyDataset, DEFAULT_SAMPLE_ROWS
+from excel_loader import read_excel_sheet, read_excel_sheets, list_excel_sheets, list_excel_columns, combine_sheets, SHEET_COLUMN
+from instrumentation import span
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet is then read by whichever engine pandas finds, without footer shortcuts
+    pa = None
+    pq = None
+
+# Whether dtype_backend="pyarrow" can be used
+ARROW_AVAILABLE = pq is not None
+
+
+# File extensions of the tabular formats supported by the loaders
+TABULAR_EXTENSIONS = ["csv", "tsv", "xlsx", "xls", "parquet"]
+
+# Bytes of CSV/TSV text per block; blocks are parsed in parallel threads
+CSV_BLOCK_SIZE = 4 * 1024 * 1024  # 4MB
+
+# Called with (bytes_read, total_bytes, rows_read) as CSV/TSV blocks are parsed
+ProgressCallback = Callable[[int, int, int], None]
+
+_current_progress: contextvars.ContextVar[Optional[ProgressCallback]] = contextvars.ContextVar('progress', default=None)
+
+
+def load_tabular_file(file_path: str, file_extension: Optional[str] = None,
+                      columns: Optional[List[str]] = None, nrows: Optional[int] = None,
+                      dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load a CSV, TSV, Excel or Parquet file into a DataFrame.
+
+    Args:
+        file_path (str): Path to the data file
+        file_extension (str, optional): Format override; inferred from the path if omitted
+        columns (list, optional): Columns to read; other columns are skipped by the reader
+        nrows (int, optional): Number of leading rows to read
+        dtype_backend (str, optional): "pyarrow" for Arrow-backed columns or
+            "numpy_nullable" for nullable dtypes; NumPy dtypes if omitted
+
+    Returns:
+        pd.DataFrame: Loaded data
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the format is not supported
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    if file_extension is None:
+        file_extension = file_path.rsplit('.', 1)[-1]
+    return _read_tabular(file_path, file_extension.lower(), columns, nrows, dtype_backend)
+
+
+def load_tabular_bytes(content: BytesSource, file_extension: str,
+                       columns: Optional[List[str]] = None, nrows: Optional[int] = None,
+                       dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load CSV, TSV, Excel or Parquet data straight from an in-memory buffer.
+
+    Args:
+        content (bytes, memoryview or binary file object): Raw file content
+        file_extension (str): Format of the content (e.g. "csv", "parquet")
+        columns (list, optional): Columns to read; other columns are skipped by the reader
+        nrows (int, optional): Number of leading rows to read
+        dtype_backend (str, optional): "pyarrow" for Arrow-backed columns or
+            "numpy_nullable" for nullable dtypes; NumPy dtypes if omitted
+
+    Returns:
+        pd.DataFrame: Loaded data
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if not hasattr(content, 'read'):
+        # BytesIO shares the buffer of an immutable bytes object instead of copying it
+        content = io.BytesIO(content)
+    return _read_tabular(content, file_extension.lower(), columns, nrows, dtype_backend)
+
+
+def list_tabular_columns(content: BytesSource, file_extension: str) -> List[str]:
+    """
+    List the columns of CSV, TSV, Excel or Parquet data without reading its rows.
+
+    Args:
+        content (bytes, memoryview or binary file object): Raw file content
+        file_extension (str): Format of the content
+
+    Returns:
+        list: Column names in file order
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if not hasattr(content, 'read'):
+        content = io.BytesIO(content)
+    file_extension = file_extension.lower()
+    if file_extension == "parquet" and pq is not None:
+        # The footer schema lists the columns; index columns written by pandas are not data columns
+        schema = pq.ParquetFile(content).schema_arrow
+        index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+        return [name for name in schema.names if name not in index_columns]
+    return list(_read_tabular(content, file_extension, None, 0).columns)
+
+
+def lazy_tabular_bytes(content: bytes, file_extension: str,
+                       initial_columns: Optional[List[str]] = None,
+                       transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                       dtype_backend: Optional[str] = None) -> LazyDataset:
+    """
+    Open CSV, TSV, Excel or Parquet data as a LazyDataset that reads columns on demand.
+
+    Args:
+        content (bytes): Raw file content
+        file_extension (str): Format of the content
+        initial_columns (list, optional): Columns loaded up front
+        transform (callable, optional): Applied to every batch of columns read
+        dtype_backend (str, optional): Backend of the loaded columns (see load_tabular_bytes)
+
+    Returns:
+        LazyDataset: Dataset over the content
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    return LazyDataset(lambda columns: load_tabular_bytes(content, file_extension, columns=columns, dtype_backend=dtype_backend),
+                       list_tabular_columns(content, file_extension),
+                       initial_columns=initial_columns,
+                       load_sample=lambda: load_tabular_bytes(content, file_extension, nrows=DEFAULT_SAMPLE_ROWS,
+                                                              dtype_backend=dtype_backend),
+                       transform=transform)
+
+
+def lazy_excel_bytes(content: bytes, file_extension: str, sheet_names: Optional[List[str]] = None,
+                     initial_columns: Optional[List[str]] = None,
+                     transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                     dtype_backend: Optional[str] = None) -> LazyDataset:
+    """
+    Open sheets of an Excel workbook as a LazyDataset.
+
+    Only header rows are read to list the columns. Each batch of columns is read
+    from the selected sheets in parallel worker processes; since workbooks store
+    cells row by row every batch streams the sheets again, but only the requested
+    columns are kept, so the workbook is never held in memory as a whole.
+
+    Args:
+        content (bytes): Raw file content
+        file_extension (str): "xlsx", "xlsm" or "xls"
+        sheet_names (list, optional): Sheets to load, stacked with a sheet column when
+            several are given (see excel_loader.combine_sheets); the first sheet if omitted
+        initial_columns (list, optional): Columns loaded up front
+        transform (callable, optional): Applied to every batch of columns read
+        dtype_backend (str, optional): Backend of the loaded columns (see load_tabular_bytes)
+
+    Returns:
+        LazyDataset: Dataset over the sheets
+
+    Raises:
+        ValueError: If the content is not a readable workbook or a sheet does not exist
+    """
+    file_extension = file_extension.lower()
+    if sheet_names is None:
+        sheet_names = list_excel_sheets(content, file_extension)[:1]
+
+    def load_columns(columns: List[str]) -> pd.DataFrame:
+        # The sheet column is added by combine_sheets
+        sheet_columns = [col for col in columns if col != SHEET_COLUMN or len(sheet_names) == 1]
+        frames = read_excel_sheets(content, file_extension, sheet_names, columns=sheet_columns,
+                                   dtype_backend=dtype_backend)
+        return combine_sheets(frames)[columns]
+
+    def load_sample() -> pd.DataFrame:
+        return combine_sheets({name: read_excel_sheet(content, file_extension, name, nrows=DEFAULT_SAMPLE_ROWS,
+                                                      dtype_backend=dtype_backend)
+                               for name in sheet_names})
+
+    return LazyDataset(load_columns, list_excel_columns(content, file_extension, sheet_names),
+                       initial_columns=initial_columns, load_sample=load_sample, transform=transform)
+
+
+def iter_tabular_batches(source: Union[str, BytesSource], file_extension: str,
+                         columns: Optional[List[str]] = None, dtype_backend: Optional[str] = None,
+                         block_size: int = CSV_BLOCK_SIZE,
+                         progress: Optional[ProgressCallback] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream CSV or TSV data as DataFrames of consecutive blocks of rows.
+
+    The text is cut into blocks of about block_size bytes at line ends outside quoted
+    values; the blocks ahead of the consumer are parsed in parallel threads and
+    yielded in file order, so only a few blocks are held in memory at once.
+
+    Args:
+        source (str, bytes, memoryview or binary file object): Path or raw content
+        file_extension (str): "csv" or "tsv"
+        columns (list, optional): Columns to read; other columns are skipped by the parser
+        dtype_backend (str, optional): Backend of the columns (see load_tabular_bytes)
+        block_size (int): Approximate bytes of text per block
+        progress (callable, optional): Called after each block with the bytes read,
+            the total bytes and the rows read so far
+
+    Yields:
+        pd.DataFrame: Rows of one block, indexed from 0; the dtypes of a column can
+            differ between blocks (e.g. int64 in one, float64 in one with missing values)
+
+    Raises:
+        ValueError: If the format is not CSV or TSV
+    """
+    file_extension = file_extension.lower()
+    if file_extension not in ["csv", "tsv"]:
+        raise ValueError(f"Chunked reading is only supported for CSV and TSV, not {file_extension}")
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from _iter_csv_blocks(f, os.fstat(f.fileno()).st_size, file_extension,
+                                        columns, dtype_backend, block_size, progress)
+        return
+    if not hasattr(source, 'read'):
+        source = io.BytesIO(source)
+    total_bytes = len(source.getbuffer()) if isinstance(source, io.BytesIO) else 0
+    yield from _iter_csv_blocks(source, total_bytes, file_extension, columns, dtype_backend, block_size, progress)
+
+
+@contextmanager
+def report_progress(callback: ProgressCallback) -> Iterator[None]:
+    """
+    Report the progress of CSV/TSV reads in the current thread (or task) to a callback.
+
+    Args:
+        callback (callable): Called with the bytes read, the total bytes and the rows
+            read so far (see iter_tabular_batches)
+    """
+    token = _current_progress.set(callback)
+    try:
+        yield
+    finally:
+        _current_progress.reset(token)
+
+
+def arrow_types_mapper(dtype_backend: Optional[str]) -> Optional[Callable[[Any], Any]]:
+    """
+    Get the types_mapper that converts Arrow data to the dtypes of a backend.
+
+    Args:
+        dtype_backend (str, optional): "pyarrow", "numpy_nullable" or None for NumPy dtypes
+
+    Returns:
+        callable or None: Mapping from Arrow types to pandas dtypes for Table.to_pandas
+    """
+    return {"pyarrow": pd.ArrowDtype, "numpy_nullable": _nullable_dtype}.get(dtype_backend)
+
+
+def _nullable_dtype(arrow_type) -> Optional[Any]:
+    """Map Arrow types to the pandas nullable dtypes used by the numpy_nullable backend."""
+    if pa.types.is_boolean(arrow_type):
+        return pd.BooleanDtype()
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype()
+    if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type):
+        # e.g. uint8 -> UInt8, float64 -> Float64
+        name = np.dtype(arrow_type.to_pandas_dtype()).name
+        try:
+            return pd.api.types.pandas_dtype(name.replace('uint', 'UInt').replace('int', 'Int').replace('float', 'Float'))
+        except TypeError:
+            return None
+    return None
+
+
+def _read_parquet_row_groups(source, columns: Optional[List[str]] = None,
+                             dtype_backend: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Read the row groups of a Parquet path or BytesIO in parallel threads.
+
+    Returns None for a single row group or another kind of source, which pandas reads directly.
+    """
+    if isinstance(source, io.BytesIO):
+        # Every thread gets its own reader over the same zero-copy buffer
+        buffer = pa.py_buffer(source.getbuffer())
+        open_file = lambda: pq.ParquetFile(pa.BufferReader(buffer))
+    elif isinstance(source, str):
+        open_file = lambda: pq.ParquetFile(source)
+    else:
+        return None
+    num_row_groups = open_file().num_row_groups
+    if num_row_groups < 2:
+        return None
+    
+    def read_row_group(i: int):
+        return open_file().read_row_group(i, columns=columns, use_threads=False, use_pandas_metadata=True)
+    
+    with ThreadPoolExecutor(max_workers=min(num_row_groups, os.cpu_count() or 1)) as executor:
+        table = pa.concat_tables(executor.map(read_row_group, range(num_row_groups)))
+    return table.to_pandas(types_mapper=arrow_types_mapper(dtype_backend))
+
+
+def _read_csv_record(f: BinaryIO) -> bytes:
+    """Read one line, continued until its quotes are balanced (quoted values can span lines)."""
+    record = f.readline()
+    while record.count(b'"') % 2:
+        line = f.readline()
+        if not line:
+            break
+        record += line
+    return record
+
+
+def _split_csv_blocks(f: BinaryIO, block_size: int) -> Iterator[Tuple[bytes, int]]:
+    """Cut the text after the current position into blocks of whole records, with the offset each ends at."""
+    while True:
+        block = f.read(block_size)
+        if not block:
+            return
+        if not block.endswith(b'\n'):
+            block += f.readline()
+        # An odd number of quotes means the block ends inside a quoted value
+        quotes = block.count(b'"')
+        while quotes % 2:
+            line = f.readline()
+            if not line:
+                break
+            block += line
+            quotes += line.count(b'"')
+        yield block, f.tell()
+
+
+def _csv_block_options(file_extension: str, columns: Optional[List[str]],
+                       dtype_backend: Optional[str]) -> dict:
+    """pd.read_csv options for parsing CSV/TSV blocks."""
+    options = {'sep': '\t' if file_extension == "tsv" else ',', 'usecols': columns}
+    if dtype_backend is not None:
+        options['dtype_backend'] = dtype_backend
+    if dtype_backend == "pyarrow":
+        # The Arrow parser builds Arrow columns directly
+        options['engine'] = "pyarrow"
+    return options
+
+
+def _inconsistent_columns(chunks: List[pd.DataFrame], dtype_backend: Optional[str]) -> List[str]:
+    """Columns whose blocks were parsed to dtypes that do not combine like a single read (e.g. numbers, then text)."""
+    inconsistent = []
+    for col in chunks[0].columns:
+        dtypes = list({str(chunk[col].dtype): chunk[col].dtype for chunk in chunks}.values())
+        if len(dtypes) < 2:
+            continue
+        # Integers and floats combine to floats, as in a single read; Arrow columns do not combine
+        numeric = all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in dtypes)
+        if dtype_backend == "pyarrow" or not numeric:
+            inconsistent.append(col)
+    return inconsistent
+
+
+def _iter_csv_blocks(f: BinaryIO, total_bytes: int, file_extension: str, columns: Optional[List[str]],
+                     dtype_backend: Optional[str], block_size: int,
+                     progress: Optional[ProgressCallback]) -> Iterator[pd.DataFrame]:
+    """Parse the blocks of an open CSV/TSV stream in parallel threads, yielding them in order."""
+    header = _read_csv_record(f)
+    # pandas skips blank lines before the header
+    while header and not header.strip():
+        header = _read_csv_record(f)
+    options = _csv_block_options(file_extension, columns, dtype_backend)
+
+    def parse(block: bytes) -> pd.DataFrame:
+        return pd.read_csv(io.BytesIO(header + block), **options)
+
+    workers = os.cpu_count() or 1
+    rows_read = 0
+
+    def finish(future, end: int) -> pd.DataFrame:
+        nonlocal rows_read
+        df = future.result()
+        rows_read += len(df)
+        if progress is not None:
+            progress(end, max(total_bytes, end), rows_read)
+        return df
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Keep one block per worker parsing ahead of the consumer
+        pending = deque()
+        for block, offset in _split_csv_blocks(f, block_size):
+            pending.append((executor.submit(parse, block), offset))
+            if len(pending) > workers:
+                yield finish(*pending.popleft())
+        while pending:
+            yield finish(*pending.popleft())
+
+
+def _read_csv_blocks(source, file_extension: str, columns: Optional[List[str]] = None,
+                     dtype_backend: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Read a whole CSV/TSV path or BytesIO as blocks parsed in parallel threads.
+
+    Returns None for data of a single block, or on a single CPU when no progress is
+    reported, which pandas reads directly.
+    """
+    progress = _current_progress.get()
+    if not isinstance(source, (str, io.BytesIO)) or (progress is None and (os.cpu_count() or 1) < 2):
+        return None
+    size = os.path.getsize(source) if isinstance(source, str) else len(source.getbuffer())
+    if size <= CSV_BLOCK_SIZE:
+        return None
+    chunks = list(iter_tabular_batches(source, file_extension, columns, dtype_backend,
+                                       block_size=CSV_BLOCK_SIZE, progress=progress))
+    if len(chunks) < 2:
+        return None
+    inconsistent = _inconsistent_columns(chunks, dtype_backend)
+    # pandas infers an index when the header is shorter than the rows; it is kept
+    if inconsistent and not isinstance(chunks[0].index, pd.RangeIndex):
+        return None
+    df = pd.concat(chunks, ignore_index=isinstance(chunks[0].index, pd.RangeIndex))
+    del chunks
+    if inconsistent:
+        # Each block inferred these columns from its own values; they are read again
+        # and inferred from all values at once, as a single read_csv would
+        if isinstance(source, io.BytesIO):
+            source.seek(0)
+        options = _csv_block_options(file_extension, inconsistent, dtype_backend)
+        if options.get('engine') != "pyarrow":
+            options['low_memory'] = False
+        reread = pd.read_csv(source, **options)
+        for col in inconsistent:
+            df[col] = reread[col]
+    return df
+
+
+def _read_tabular(source, file_extension: str, columns: Optional[List[str]] = None,
+                  nrows: Optional[int] = None, dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """Read a path or buffer with the reader for its format, recording the read as a span."""
+    with span('tabular.read', format=file_extension, columns=len(columns) if columns is not None else None) as current:
+        df = _read_tabular_format(source, file_extension, columns, nrows, dtype_backend)
+        if current is not None:
+            current.rows = len(df)
+            if isinstance(source, io.BytesIO):
+                current.bytes = len(source.getbuffer())
+            elif isinstance(source, str):
+                current.bytes = os.path.getsize(source)
+        return df
+
+
+def _read_tabular_format(source, file_extension: str, columns: Optional[List[str]] = None,
+                         nrows: Optional[int] = None, dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """Dispatch a path or buffer to the pandas reader for its format, pushing down the projection."""
+    options = {'dtype_backend': dtype_backend} if dtype_backend is not None else {}
+    if file_extension in ["csv", "tsv"]:
+        sep = '\t' if file_extension == "tsv" else ','
+        if nrows is None:
+            df = _read_csv_blocks(source, file_extension, columns, dtype_backend)
+            if df is not None:
+                return df
+            if isinstance(source, io.BytesIO):
+                source.seek(0)
+        if dtype_backend == "pyarrow" and nrows is None:
+            # The multi-threaded Arrow parser builds Arrow columns directly
+            options['engine'] = "pyarrow"
+        return pd.read_csv(source, sep=sep, usecols=columns, nrows=nrows, **options)
+    if file_extension in ["xlsx", "xls"]:
+        # The first sheet, streamed read-only for .xlsx
+        return read_excel_sheet(source, file_extension, columns=columns, nrows=nrows, dtype_backend=dtype_backend)
+    if file_extension == "parquet":
+        if nrows is None and pq is not None:
+            df = _read_parquet_row_groups(source, columns, dtype_backend)
+            if df is not None:
+                return df
+        if nrows is None or pq is None:
+            df = pd.read_parquet(source, columns=columns, **options)
+            return df if nrows is None else df.head(nrows)
+        # Read only the leading record batch instead of the whole file
+        batch = next(pq.ParquetFile(source).iter_batches(batch_size=max(nrows, 1), columns=columns), None)
+        if batch is None:
+            return pd.read_parquet(source, columns=columns, **options)
+        types_mapper = pd.ArrowDtype if dtype_backend == "pyarrow" else None
+        df = batch.to_pandas(types_mapper=types_mapper).head(nrows)
+        return df.convert_dtypes(dtype_backend=dtype_backend) if dtype_backend == "numpy_nullable" else df
+    raise ValueError(f"Unsupported file format: {file_extension}")
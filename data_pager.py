@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow-backed columns cannot occur without pyarrow
+    pa = None
+
+
+# Rows per page offered by the table view
+PAGE_SIZES = [50, 100, 500, 1000]
+DEFAULT_PAGE_SIZE = 100
+
+
+def sort_order(df: pd.DataFrame, column: str, ascending: bool = True) -> np.ndarray:
+    """
+    Get the row positions of a DataFrame sorted by one column.
+
+    The sort is stable and puts missing values last, so the order is the same on
+    every call and can be cached.
+
+    Args:
+        df (pd.DataFrame): DataFrame to sort
+        column (str): Column to sort by
+        ascending (bool): Sort direction
+
+    Returns:
+        np.ndarray: Row positions in sorted order
+
+    Raises:
+        ValueError: If the column does not exist or its values cannot be compared
+    """
+    if column not in df.columns:
+        raise ValueError(f"Column '{column}' not found in data")
+    try:
+        ordered = df[column].reset_index(drop=True).sort_values(ascending=ascending, kind='stable', na_position='last')
+    except TypeError:
+        raise ValueError(f"Column '{column}' contains values that cannot be sorted")
+    return ordered.index.to_numpy()
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """Get the values of a column as text for searching, keeping missing values missing."""
+    if pd.api.types.is_string_dtype(series):
+        return series
+    if isinstance(series.dtype, pd.ArrowDtype):
+        try:
+            # Cast with the Arrow compute kernel instead of formatting each value in Python
+            return series.astype(pd.ArrowDtype(pa.string()))
+        except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+            # Nested values: format them as Python lists and dicts, not NumPy arrays
+            series = pd.Series(series.tolist(), index=series.index, dtype=object)
+    # Numbers, dates and nested values are matched by their text
+    return series.astype(str).where(series.notna())
+
+
+def filter_mask(df: pd.DataFrame, text: str, column: Optional[str] = None) -> np.ndarray:
+    """
+    Find the rows containing a text, ignoring case.
+
+    Args:
+        df (pd.DataFrame): DataFrame to search
+        text (str): Text to look for in the displayed values
+        column (str, optional): Only search this column; every column if omitted
+
+    Returns:
+        np.ndarray: Boolean mask of matching rows
+
+    Raises:
+        ValueError: If the column does not exist
+    """
+    if column is not None and column not in df.columns:
+        raise ValueError(f"Column '{column}' not found in data")
+    mask = np.zeros(len(df), dtype=bool)
+    for col in [column] if column is not None else df.columns:
+        matches = _as_text(df[col]).str.contains(text, case=False, regex=False, na=False)
+        mask |= matches.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def select_rows(n_rows: int, order: Optional[np.ndarray] = None, mask: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """
+    Combine a sort order and a filter mask into the row positions to display.
+
+    Args:
+        n_rows (int): Number of rows in the DataFrame
+        order (np.ndarray, optional): Result of sort_order
+        mask (np.ndarray, optional): Result of filter_mask
+
+    Returns:
+        np.ndarray or None: Row positions, or None for all rows in their original order
+    """
+    if mask is None:
+        return order
+    if order is None:
+        return np.flatnonzero(mask)
+    return order[mask[order]]
+
+
+def get_page(df: pd.DataFrame, page: int, page_size: int = DEFAULT_PAGE_SIZE,
+             rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Get one page of rows, copying only that slice of the DataFrame.
+
+    Args:
+        df (pd.DataFrame): Complete DataFrame
+        page (int): Page number, starting at 0
+        page_size (int): Rows per page
+        rows (np.ndarray, optional): Row positions from select_rows; all rows if omitted
+
+    Returns:
+        pd.DataFrame: Rows of the page, keeping their original index labels
+    """
+    start = max(page, 0) * page_size
+    if rows is None:
+        return df.iloc[start:start + page_size]
+    return df.iloc[rows[start:start + page_size]]
+
+
+def page_count(n_rows: int, page_size: int = DEFAULT_PAGE_SIZE) -> int:
+    """
+    Count the pages needed to show a number of rows (at least one).
+
+    Args:
+        n_rows (int): Number of rows
+        page_size (int): Rows per page
+
+    Returns:
+        int: Number of pages
+    """
+    return max(1, -(-n_rows // page_size))
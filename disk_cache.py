@@ -0,0 +1,268 @@
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+from lazy_dataset import LazyDataset, DEFAULT_SAMPLE_ROWS
+from instrumentation import span
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # DataFrames are then pickled like other values
+    pa = None
+    feather = None
+
+
+# Where converted uploads are kept; shared by every server process using the same directory
+DEFAULT_CACHE_DIR = os.environ.get('JSON_VISUALIZER_CACHE_DIR',
+                                   os.path.join(os.path.expanduser('~'), '.cache', 'json-visualizer'))
+
+# Disk budget for all entries
+DEFAULT_DISK_CACHE_BYTES = int(os.environ.get('JSON_VISUALIZER_CACHE_MB', 2048)) * 1024 * 1024  # 2GB
+
+FRAME_SUFFIX = '.feather'
+VALUE_SUFFIX = '.pkl'
+
+
+def _arrow_dtype(arrow_type) -> Optional[pd.ArrowDtype]:
+    """Map Arrow types to pandas Arrow dtypes, keeping dictionaries as categoricals."""
+    return None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type)
+
+
+def _read_frame(path: str, columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+    """Read a Feather file back into the column types it was written with."""
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    if nrows is not None:
+        table = table.slice(0, nrows)
+    try:
+        return table.to_pandas()
+    except TypeError:
+        # pandas cannot parse the recorded type of nested Arrow columns (e.g. lists of
+        # strings); only Arrow-backed frames have them
+        return table.to_pandas(types_mapper=_arrow_dtype)
+
+
+def _is_columnar(df: pd.DataFrame) -> bool:
+    """Check whether Feather gives back a frame's values unchanged (object columns come back as NumPy arrays)."""
+    return feather is not None and not any(dtype == object for dtype in df.dtypes)
+
+
+class DiskCache:
+    """Persistent LRU cache of converted uploads and analysis results, bounded by a disk budget.
+
+    Entries use the same keys as DataCache (a hash of the uploaded bytes plus loader
+    options), so a known file is recognized across sessions and server restarts. Each
+    entry is a directory of named values: DataFrames are stored as Feather files and
+    read back column by column, other values (and frames with Python object columns)
+    are pickled. The cache directory must
+    only be writable by the server, since pickled values are trusted when loaded.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_DISK_CACHE_BYTES):
+        """
+        Initialize the cache, creating its directory if needed.
+
+        Args:
+            directory (str): Directory holding the entries
+            max_bytes (int): Disk budget for all entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def total_bytes(self) -> int:
+        """Disk space currently used by the cache."""
+        return sum(self._entry_size(key) for key in self._keys())
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.isdir(self._entry_dir(key))
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def contains(self, key: str, name: str) -> bool:
+        """
+        Check whether a value is stored, without loading it.
+
+        Args:
+            key (str): Entry key from DataCache.make_key
+            name (str): Name of the value within the entry
+
+        Returns:
+            bool: True if the value is on disk
+        """
+        return self._find(key, name) is not None
+
+    def get(self, key: str, name: str, default: Any = None) -> Any:
+        """
+        Load a stored value and mark its entry as recently used.
+
+        Args:
+            key (str): Entry key from DataCache.make_key
+            name (str): Name of the value within the entry
+            default: Value returned when nothing is stored
+
+        Returns:
+            The stored value or default
+        """
+        path = self._find(key, name)
+        if path is None:
+            return default
+        try:
+            with span('disk_cache.read', item=name) as current:
+                if path.endswith(FRAME_SUFFIX):
+                    value = _read_frame(path)
+                else:
+                    with open(path, 'rb') as f:
+                        value = pickle.load(f)
+                if current is not None:
+                    current.bytes = os.path.getsize(path)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            # Evicted by another process, or left incomplete by a crash
+            return default
+        self._touch(key)
+        return value
+
+    def open_dataset(self, key: str, name: str) -> Optional[LazyDataset]:
+        """
+        Open a stored DataFrame as a LazyDataset that reads its columns on demand.
+
+        Args:
+            key (str): Entry key from DataCache.make_key
+            name (str): Name of the DataFrame within the entry
+
+        Returns:
+            LazyDataset or None: Dataset over the stored columns, None if nothing is stored
+        """
+        path = self._find(key, name)
+        if path is None:
+            return None
+        if not path.endswith(FRAME_SUFFIX):
+            # Frames Arrow could not represent are pickled and loaded whole
+            df = self.get(key, name)
+            if not isinstance(df, pd.DataFrame):
+                return None
+            return LazyDataset(lambda columns: df[columns], list(df.columns))
+        try:
+            schema = pa.ipc.open_file(path).schema
+        except (OSError, ValueError):
+            return None
+        self._touch(key)
+        index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+        columns = [col for col in schema.names if col not in index_columns]
+        return LazyDataset(lambda selected: _read_frame(path, columns=selected),
+                           columns,
+                           load_sample=lambda: _read_frame(path, nrows=DEFAULT_SAMPLE_ROWS))
+
+    def put(self, key: str, name: str, value: Any) -> bool:
+        """
+        Store a value and evict least recently used entries if over budget.
+
+        Args:
+            key (str): Entry key from DataCache.make_key
+            name (str): Name of the value within the entry
+            value: Value to store; must be picklable unless it is a DataFrame
+
+        Returns:
+            bool: True if the value was stored
+        """
+        entry_dir = self._entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial value
+        fd, tmp_path = tempfile.mkstemp(dir=entry_dir, prefix='.tmp-')
+        try:
+            with span('disk_cache.write', item=name) as current:
+                with os.fdopen(fd, 'wb') as f:
+                    suffix = self._write(value, f)
+                if current is not None:
+                    current.bytes = os.path.getsize(tmp_path)
+            for stale in (FRAME_SUFFIX, VALUE_SUFFIX):
+                if stale != suffix and os.path.exists(os.path.join(entry_dir, name + stale)):
+                    os.remove(os.path.join(entry_dir, name + stale))
+            os.replace(tmp_path, os.path.join(entry_dir, name + suffix))
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        self._touch(key)
+        self._evict()
+        return True
+
+    def clear(self):
+        """Remove all entries."""
+        for key in self._keys():
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def _write(self, value: Any, f) -> str:
+        """Write a value to an open file, returning the suffix of the format used."""
+        if isinstance(value, pd.DataFrame) and _is_columnar(value):
+            try:
+                value.to_feather(f)
+                return FRAME_SUFFIX
+            except (ValueError, TypeError, pa.ArrowException):
+                # e.g. non-string column names
+                f.seek(0)
+                f.truncate()
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return VALUE_SUFFIX
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _find(self, key: str, name: str) -> Optional[str]:
+        """Get the file holding a value, if stored."""
+        for suffix in (FRAME_SUFFIX, VALUE_SUFFIX):
+            path = os.path.join(self._entry_dir(key), name + suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _keys(self) -> List[str]:
+        try:
+            return [name for name in os.listdir(self.directory) if os.path.isdir(self._entry_dir(name))]
+        except OSError:
+            return []
+
+    def _entry_size(self, key: str) -> int:
+        total = 0
+        try:
+            with os.scandir(self._entry_dir(key)) as files:
+                for file in files:
+                    try:
+                        total += file.stat().st_size
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        return total
+
+    def _touch(self, key: str):
+        """Record an access in the entry directory's modification time, used for LRU order."""
+        try:
+            os.utime(self._entry_dir(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget."""
+        with self._lock:
+            entries: Dict[str, float] = {}
+            for key in self._keys():
+                try:
+                    entries[key] = os.path.getmtime(self._entry_dir(key))
+                except OSError:
+                    pass
+            sizes = {key: self._entry_size(key) for key in entries}
+            total = sum(sizes.values())
+            for key in sorted(entries, key=entries.get):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+                total -= sizes[key]
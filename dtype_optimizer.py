@@ -0,0 +1,156 @@
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Tuple
+
+from instrumentation import span
+
+
+# String columns whose distinct values are at most this fraction of their non-null values become categorical
+DEFAULT_CATEGORY_THRESHOLD = 0.5
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow-backed columns cannot occur without pyarrow
+    pa = None
+
+try:
+    # Arrow-backed strings with NaN as missing value, the default string dtype of pandas 3
+    STRING_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)
+except (TypeError, ImportError):
+    # Older pandas or no pyarrow: keep strings as Python objects
+    STRING_DTYPE = None
+
+
+def _optimize_arrow_column(series: pd.Series, downcast: bool) -> pd.Series:
+    """Downcast an Arrow-backed numeric column, keeping it Arrow-backed."""
+    pa_type = series.dtype.pyarrow_dtype
+    if downcast and pa.types.is_integer(pa_type):
+        return pd.to_numeric(series, downcast='unsigned' if pa.types.is_unsigned_integer(pa_type) else 'integer')
+    if downcast and pa.types.is_float64(pa_type):
+        compact = series.astype(pd.ArrowDtype(pa.float32()))
+        # Only keep float32 when every value survives the round trip
+        if compact.astype(series.dtype).equals(series):
+            return compact
+    return series
+
+
+def _optimize_column(series: pd.Series, category_threshold: float, downcast: bool, strings: bool) -> pd.Series:
+    """Convert one column to its most compact lossless dtype."""
+    dtype = series.dtype
+    arrow = isinstance(dtype, pd.ArrowDtype)
+    if arrow and not pa.types.is_string(dtype.pyarrow_dtype) and not pa.types.is_large_string(dtype.pyarrow_dtype):
+        return _optimize_arrow_column(series, downcast)
+    if downcast and isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+        return pd.to_numeric(series, downcast='integer' if dtype.kind == 'i' else 'unsigned')
+    if downcast and isinstance(dtype, np.dtype) and dtype.kind == 'f' and dtype.itemsize > 4:
+        compact = series.astype(np.float32)
+        # Only keep float32 when every value survives the round trip
+        if np.array_equal(compact.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True):
+            return compact
+        return series
+    if strings and (dtype == object or pd.api.types.is_string_dtype(dtype)) and not isinstance(dtype, pd.CategoricalDtype):
+        if pd.api.types.infer_dtype(series, skipna=True) != 'string':
+            return series
+        non_null = series.count()
+        if non_null and series.nunique() <= category_threshold * non_null:
+            return series.astype('category')
+        # Arrow strings are already compact; moving them would leave the Arrow backend
+        if STRING_DTYPE is not None and dtype != STRING_DTYPE and not arrow:
+            return series.astype(STRING_DTYPE)
+    return series
+
+
+def optimize_dtypes(df: pd.DataFrame, category_threshold: float = DEFAULT_CATEGORY_THRESHOLD,
+                    downcast: bool = True, strings: bool = True) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Convert columns to compact dtypes without changing their values.
+
+    Integers are downcast to the smallest integer type holding their range, floats
+    to float32 when that is exact, low-cardinality strings to category and other
+    strings to Arrow-backed strings. Arrow-backed numeric columns are downcast to
+    smaller Arrow types.
+
+    Args:
+        df (pd.DataFrame): DataFrame to optimize
+        category_threshold (float): Maximum ratio of distinct to non-null values for
+            a string column to become categorical
+        downcast (bool): Downcast numeric columns
+        strings (bool): Convert string columns
+
+    Returns:
+        tuple: (optimized DataFrame, report) where the report holds 'memory_before'
+            and 'memory_after' in bytes and 'changes', the old and new dtype of
+            each converted column
+    """
+    memory_before = int(df.memory_usage(deep=True).sum())
+    optimized = {}
+    changes = {}
+    for col in df.columns:
+        series = _optimize_column(df[col], category_threshold, downcast, strings)
+        if series.dtype != df[col].dtype:
+            changes[col] = (str(df[col].dtype), str(series.dtype))
+        optimized[col] = series
+    result = pd.DataFrame(optimized, index=df.index, columns=df.columns) if changes else df
+    report = {
+        'memory_before': memory_before,
+        'memory_after': int(result.memory_usage(deep=True).sum()),
+        'changes': changes
+    }
+    return result, report
+
+
+class DtypeOptimizer:
+    """Reusable dtype optimization stage that keeps a running memory report.
+
+    Instances are callables from DataFrame to DataFrame, so they can be applied to
+    every batch of columns a LazyDataset reads.
+    """
+
+    def __init__(self, category_threshold: float = DEFAULT_CATEGORY_THRESHOLD,
+                 downcast: bool = True, strings: bool = True):
+        """
+        Initialize the optimizer.
+
+        Args:
+            category_threshold (float): Maximum distinct-to-non-null ratio for category columns
+            downcast (bool): Downcast numeric columns
+            strings (bool): Convert string columns
+        """
+        self.category_threshold = category_threshold
+        self.downcast = downcast
+        self.strings = strings
+        self._report = {'memory_before': 0, 'memory_after': 0, 'changes': {}}
+        self._lock = threading.Lock()
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Optimize a DataFrame and add it to the report.
+
+        Args:
+            df (pd.DataFrame): DataFrame to optimize
+
+        Returns:
+            pd.DataFrame: Optimized DataFrame
+        """
+        with span('dtypes.optimize', rows=len(df)):
+            optimized, report = optimize_dtypes(df, self.category_threshold, self.downcast, self.strings)
+        with self._lock:
+            self._report['memory_before'] += report['memory_before']
+            self._report['memory_after'] += report['memory_after']
+            self._report['changes'].update(report['changes'])
+        return optimized
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Get the memory report of everything optimized so far.
+
+        Returns:
+            dict: 'memory_before', 'memory_after' and 'changes' as in optimize_dtypes
+        """
+        with self._lock:
+            return {
+                'memory_before': self._report['memory_before'],
+                'memory_after': self._report['memory_after'],
+                'changes': dict(self._report['changes'])
+            }
@@ -0,0 +1,300 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional, Iterator, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from json_utils import BytesSource
+from instrumentation import span
+
+try:
+    import openpyxl
+except ImportError:  # Workbooks are then read by pd.read_excel with whichever engine pandas finds
+    openpyxl = None
+
+
+# Extensions of the workbook formats openpyxl streams; .xls files are read by pd.read_excel
+STREAMED_EXCEL_EXTENSIONS = ["xlsx", "xlsm"]
+
+# Rows parsed into one DataFrame at a time by iter_excel_batches
+EXCEL_BATCH_ROWS = 50000
+
+# Column naming the sheet of each row when several sheets are loaded together
+SHEET_COLUMN = "sheet"
+
+# Workbook content shared with the worker processes of read_excel_sheets
+_worker_content: Optional[bytes] = None
+
+
+def list_excel_sheets(content: Union[str, BytesSource], file_extension: str = "xlsx") -> List[str]:
+    """
+    List the sheets of a workbook without reading their cells.
+
+    Args:
+        content (str, bytes, memoryview or binary file object): Path or raw file content
+        file_extension (str): "xlsx", "xlsm" or "xls"
+
+    Returns:
+        list: Sheet names in workbook order
+
+    Raises:
+        ValueError: If the content is not a readable workbook
+    """
+    if not _is_streamed(file_extension):
+        with pd.ExcelFile(_as_stream(content)) as workbook:
+            return list(workbook.sheet_names)
+    workbook = _open_workbook(content)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def iter_excel_batches(content: Union[str, BytesSource], sheet_name: Optional[str] = None,
+                       columns: Optional[List[str]] = None, nrows: Optional[int] = None,
+                       dtype_backend: Optional[str] = None,
+                       batch_size: int = EXCEL_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Stream the rows of an .xlsx sheet as DataFrames of at most batch_size rows.
+
+    The workbook is opened read-only, so cells are parsed row by row from the
+    sheet's XML and only their values are kept; no cell objects are built.
+
+    Args:
+        content (str, bytes, memoryview or binary file object): Path or raw .xlsx content
+        sheet_name (str, optional): Sheet to read; the first sheet if omitted
+        columns (list, optional): Columns to keep; other columns are dropped per batch
+        nrows (int, optional): Number of leading rows to read
+        dtype_backend (str, optional): Backend of the columns (see load_tabular_bytes)
+        batch_size (int): Maximum number of rows per DataFrame
+
+    Yields:
+        pd.DataFrame: Batch of rows, indexed from 0; the first row of the sheet names
+            the columns, and the dtypes of a column can differ between batches
+
+    Raises:
+        ValueError: If the content is not a readable workbook or the sheet does not exist
+    """
+    workbook = _open_workbook(content)
+    try:
+        rows = iter(_sheet(workbook, sheet_name).iter_rows(values_only=True))
+        header, body = _split_header(rows)
+        parse = partial(_parse_rows, header, columns=columns, dtype_backend=dtype_backend)
+        batch: List[Tuple[Any, ...]] = []
+        yielded = False
+        for row in _trim_trailing_blank_rows(body, nrows):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield parse(batch)
+                yielded = True
+                batch = []
+        if batch or not yielded:
+            yield parse(batch)
+    finally:
+        workbook.close()
+
+
+def read_excel_sheet(content: Union[str, BytesSource], file_extension: str = "xlsx", sheet_name: Optional[str] = None,
+                     columns: Optional[List[str]] = None, nrows: Optional[int] = None,
+                     dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read one sheet of a workbook into a DataFrame, with the dtypes pd.read_excel infers.
+
+    .xlsx sheets are streamed read-only and their values parsed in a single pass,
+    without the per-cell conversion pd.read_excel does; .xls sheets are read by
+    pd.read_excel.
+
+    Args:
+        content (str, bytes, memoryview or binary file object): Path or raw file content
+        file_extension (str): "xlsx", "xlsm" or "xls"
+        sheet_name (str, optional): Sheet to read; the first sheet if omitted
+        columns (list, optional): Columns to read
+        nrows (int, optional): Number of leading rows to read
+        dtype_backend (str, optional): Backend of the columns (see load_tabular_bytes)
+
+    Returns:
+        pd.DataFrame: Rows of the sheet
+
+    Raises:
+        ValueError: If the content is not a readable workbook or the sheet does not exist
+    """
+    with span('excel.read_sheet', sheet=sheet_name) as current:
+        if not _is_streamed(file_extension):
+            options = {'dtype_backend': dtype_backend} if dtype_backend is not None else {}
+            df = pd.read_excel(_as_stream(content), sheet_name=sheet_name if sheet_name is not None else 0,
+                               nrows=nrows, **options)
+            if columns is not None:
+                # Selecting afterwards skips columns the sheet lacks and keeps its rows when none is left
+                df = df[[col for col in columns if col in df.columns]]
+        else:
+            workbook = _open_workbook(content)
+            try:
+                header, body = _split_header(iter(_sheet(workbook, sheet_name).iter_rows(values_only=True)))
+                # One parse over all rows infers each column from all of its values
+                df = _parse_rows(header, list(_trim_trailing_blank_rows(body, nrows)), columns, dtype_backend)
+            finally:
+                workbook.close()
+        if current is not None:
+            current.rows = len(df)
+        return df
+
+
+def read_excel_sheets(content: bytes, file_extension: str, sheet_names: List[str],
+                      columns: Optional[List[str]] = None, dtype_backend: Optional[str] = None,
+                      workers: int = -1) -> Dict[str, pd.DataFrame]:
+    """
+    Read several sheets of a workbook, each in its own worker process.
+
+    Args:
+        content (bytes): Raw file content
+        file_extension (str): "xlsx", "xlsm" or "xls"
+        sheet_names (list): Sheets to read
+        columns (list, optional): Columns to read; those a sheet lacks are skipped
+        dtype_backend (str, optional): Backend of the columns (see load_tabular_bytes)
+        workers (int): Worker processes; 1 reads the sheets serially, -1 uses all CPU cores
+
+    Returns:
+        dict: DataFrame per sheet, in the order of sheet_names
+    """
+    workers = (os.cpu_count() or 1) if workers == -1 else max(1, workers)
+    read = partial(_read_worker_sheet, file_extension=file_extension, columns=columns, dtype_backend=dtype_backend)
+    with span('excel.read_sheets', sheets=len(sheet_names), workers=min(workers, len(sheet_names))):
+        if workers == 1 or len(sheet_names) < 2:
+            return {name: read(name, content=content) for name in sheet_names}
+        # The workbook is sent to each worker once rather than with every sheet
+        with ProcessPoolExecutor(max_workers=min(workers, len(sheet_names)),
+                                 initializer=_set_worker_content, initargs=(bytes(content),)) as executor:
+            return dict(zip(sheet_names, executor.map(read, sheet_names)))
+
+
+def list_excel_columns(content: Union[str, BytesSource], file_extension: str, sheet_names: List[str]) -> List[str]:
+    """
+    List the columns of sheets from their header rows.
+
+    Args:
+        content (str, bytes, memoryview or binary file object): Path or raw file content
+        file_extension (str): "xlsx", "xlsm" or "xls"
+        sheet_names (list): Sheets to include
+
+    Returns:
+        list: Columns of the first sheet followed by columns only later sheets have,
+            preceded by SHEET_COLUMN for several sheets (see combine_sheets)
+    """
+    columns: List[str] = [SHEET_COLUMN] if len(sheet_names) > 1 else []
+    for name in sheet_names:
+        header = read_excel_sheet(content, file_extension, name, nrows=0)
+        columns.extend(col for col in header.columns if col not in columns)
+    return columns
+
+
+def combine_sheets(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Stack the rows of several sheets into one DataFrame.
+
+    Args:
+        frames (dict): DataFrame per sheet name
+
+    Returns:
+        pd.DataFrame: The single sheet's frame, or the rows of all sheets with their
+            sheet name in a categorical SHEET_COLUMN first; columns missing from a
+            sheet are empty in its rows
+    """
+    if len(frames) == 1:
+        return next(iter(frames.values()))
+    sheets = pd.Categorical([name for name, df in frames.items() for _ in range(len(df))],
+                            categories=list(frames))
+    df = pd.concat([df.drop(columns=SHEET_COLUMN, errors='ignore') for df in frames.values()], ignore_index=True)
+    df.insert(0, SHEET_COLUMN, sheets)
+    return df
+
+
+def _is_streamed(file_extension: str) -> bool:
+    return openpyxl is not None and file_extension.lower() in STREAMED_EXCEL_EXTENSIONS
+
+
+def _as_stream(content: Union[str, BytesSource]):
+    if isinstance(content, str) or hasattr(content, 'read'):
+        return content
+    # BytesIO shares the buffer of an immutable bytes object instead of copying it
+    return io.BytesIO(content)
+
+
+def _open_workbook(content: Union[str, BytesSource]):
+    """Open a workbook for streaming: read-only, cached formula results instead of formulas, no external links."""
+    try:
+        return openpyxl.load_workbook(_as_stream(content), read_only=True, data_only=True, keep_links=False)
+    except Exception as e:
+        raise ValueError(f"Invalid Excel workbook: {e}") from e
+
+
+def _sheet(workbook, sheet_name: Optional[str]):
+    if sheet_name is None:
+        return workbook.worksheets[0]
+    if sheet_name not in workbook.sheetnames:
+        raise ValueError(f"Worksheet '{sheet_name}' not found. Available sheets: {', '.join(workbook.sheetnames)}")
+    return workbook[sheet_name]
+
+
+def _is_blank(row: Tuple[Any, ...]) -> bool:
+    return all(value is None or value == "" for value in row)
+
+
+def _split_header(rows: Iterator[Tuple[Any, ...]]) -> Tuple[List[Any], Iterator[Tuple[Any, ...]]]:
+    """Take the first row as the header, like pd.read_excel (blank cells become "Unnamed: n" columns)."""
+    header = next(rows, None)
+    return ([value if value is not None else "" for value in header] if header is not None else []), rows
+
+
+def _trim_trailing_blank_rows(rows: Iterator[Tuple[Any, ...]], nrows: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+    """Yield up to nrows rows, holding back blank rows until a later row has values (pd.read_excel drops trailing ones)."""
+    if nrows is not None and nrows <= 0:
+        return
+    blank: List[Tuple[Any, ...]] = []
+    count = 0
+    for row in rows:
+        if _is_blank(row):
+            blank.append(row)
+            continue
+        for held in blank + [row]:
+            yield held
+            count += 1
+            if nrows is not None and count >= nrows:
+                return
+        blank = []
+
+
+def _parse_rows(header: List[Any], rows: List[Tuple[Any, ...]], columns: Optional[List[str]] = None,
+                dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """Infer column types from cell values with the parser pd.read_excel uses."""
+    if not header:
+        return pd.DataFrame()
+    options: Dict[str, Any] = {'dtype_backend': dtype_backend} if dtype_backend is not None else {}
+    if columns is not None:
+        # Column names are only known after parsing the header (e.g. "Unnamed: 2" for blank cells)
+        names = list(TextParser([header], header=0).read().columns)
+        columns = [col for col in columns if col in names]
+        if not columns:
+            return pd.DataFrame(index=pd.RangeIndex(len(rows)))
+        options['usecols'] = columns
+    df = TextParser([header] + rows, header=0, **options).read()
+    # pd.read_excel passes empty cells as "", which mixed-type columns hold as NaN rather than None
+    mixed = [col for col, dtype in df.dtypes.items() if dtype == object]
+    if mixed:
+        df[mixed] = df[mixed].fillna(np.nan)
+    return df if columns is None else df[columns]
+
+
+def _set_worker_content(content: bytes):
+    global _worker_content
+    _worker_content = content
+
+
+def _read_worker_sheet(sheet_name: str, file_extension: str, columns: Optional[List[str]], dtype_backend: Optional[str],
+                       content: Optional[bytes] = None) -> pd.DataFrame:
+    """Read one sheet (runs in a worker, where the workbook comes from the initializer)."""
+    return read_excel_sheet(_worker_content if content is None else content, file_extension, sheet_name,
+                            columns=columns, dtype_backend=dtype_backend)
@@ -0,0 +1,441 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Iterable, Optional
+from compute_backend import ComputeBackend, PandasBackend
+from sketches import CategoricalSketch
+
+
+# Number of weighted points each column's quantile summary is compacted to
+DEFAULT_QUANTILE_CAPACITY = 10000
+
+# Rows kept from the first chunks for previews of a chunked dataset
+DEFAULT_HEAD_ROWS = 10
+
+
+class QuantileSummary:
+    """Mergeable approximate quantile summary of a stream of numbers.
+
+    Values are kept exactly until the buffer holds twice the capacity; it is then
+    compacted to `capacity` equally weighted points. Quantiles are exact while no
+    compaction has happened and otherwise accurate to roughly 1/capacity in rank.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_QUANTILE_CAPACITY):
+        """
+        Initialize an empty summary.
+
+        Args:
+            capacity (int): Number of points kept after compaction
+        """
+        self.capacity = capacity
+        self.values = np.empty(0)
+        self.weights = np.empty(0)
+        self.exact = True
+
+    def update(self, values: np.ndarray):
+        """
+        Add non-null values to the summary.
+
+        Args:
+            values (np.ndarray): Values to add
+        """
+        self._extend(values, np.ones(len(values)))
+
+    def merge(self, other: 'QuantileSummary'):
+        """
+        Merge another summary into this one.
+
+        Args:
+            other (QuantileSummary): Summary to merge
+        """
+        self.exact = self.exact and other.exact
+        self._extend(other.values, other.weights)
+
+    def quantile(self, q: float) -> float:
+        """
+        Get an approximate quantile.
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            float: Quantile value, NaN if the summary is empty
+        """
+        if len(self.values) == 0:
+            return np.nan
+        order = np.argsort(self.values, kind='mergesort')
+        values = self.values[order]
+        if self.exact:
+            # Same linear interpolation as pandas.Series.quantile
+            return float(np.quantile(values, q))
+        weights = self.weights[order]
+        positions = np.cumsum(weights) - weights / 2
+        return float(np.interp(q * weights.sum(), positions, values))
+
+    def _extend(self, values: np.ndarray, weights: np.ndarray):
+        """Append weighted values and compact if the buffer is full."""
+        self.values = np.concatenate([self.values, values])
+        self.weights = np.concatenate([self.weights, weights])
+        if len(self.values) > 2 * self.capacity:
+            self._compact()
+
+    def _compact(self):
+        """Replace the buffer with `capacity` equally weighted points."""
+        order = np.argsort(self.values, kind='mergesort')
+        values = self.values[order]
+        cumulative = np.cumsum(self.weights[order])
+        total = cumulative[-1]
+        targets = (np.arange(self.capacity) + 0.5) * total / self.capacity
+        self.values = values[np.searchsorted(cumulative, targets)]
+        self.weights = np.full(self.capacity, total / self.capacity)
+        self.exact = False
+
+
+class StatsAccumulator:
+    """Incremental, mergeable statistics over DataFrame chunks.
+
+    Consumes chunks one at a time and produces the same outputs as
+    DataAnalyzer.get_summary_statistics, get_missing_data_info and
+    get_correlation_matrix without holding the full dataset in memory.
+    Means, variances and correlations use Welford/Chan updates of pairwise
+    co-moments (matching pandas' pairwise-complete correlation); quantiles are
+    approximate once a column exceeds the quantile capacity.
+    """
+
+    def __init__(self, quantile_capacity: int = DEFAULT_QUANTILE_CAPACITY):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            quantile_capacity (int): Points kept per column for quantile estimates
+        """
+        self.quantile_capacity = quantile_capacity
+        self.row_count = 0
+        self.columns: List[str] = []
+        self.null_counts: Dict[str, int] = {}
+        self._numeric: List[str] = []
+        self._non_numeric = set()
+        self._minimum = np.empty(0)
+        self._maximum = np.empty(0)
+        self._quantiles: List[QuantileSummary] = []
+        # Pairwise moments: entry [i, j] describes column i over rows where i and j are both present
+        self._count = np.zeros((0, 0))
+        self._mean = np.zeros((0, 0))
+        self._m2 = np.zeros((0, 0))
+        self._comoment = np.zeros((0, 0))
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], **kwargs) -> 'StatsAccumulator':
+        """
+        Build an accumulator by consuming an iterable of DataFrame chunks.
+
+        Args:
+            chunks (iterable): DataFrame chunks, e.g. from json_utils.iter_json_batches
+            **kwargs: Arguments passed to the constructor
+
+        Returns:
+            StatsAccumulator: Accumulator holding statistics of all chunks
+        """
+        accumulator = cls(**kwargs)
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return accumulator
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        """Columns that were numeric in every chunk where they had values."""
+        return [col for col in self._numeric if col not in self._non_numeric]
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Add a DataFrame chunk to the statistics.
+
+        Args:
+            chunk (pd.DataFrame): Next chunk of rows
+        """
+        self._update_missing(chunk)
+        self._update_types(chunk)
+
+        numeric_in_chunk = [col for col in self._numeric if col in chunk.columns and col not in self._non_numeric]
+        if numeric_in_chunk:
+            other = StatsAccumulator(self.quantile_capacity)
+            other._numeric = list(self._numeric)
+            other._set_moments(chunk, numeric_in_chunk)
+            self._merge_numeric(other)
+        self.row_count += len(chunk)
+
+    def merge(self, other: 'StatsAccumulator'):
+        """
+        Merge statistics gathered by another accumulator, e.g. from a parallel worker.
+
+        Rows of `other` are treated as coming after the rows of this accumulator.
+
+        Args:
+            other (StatsAccumulator): Accumulator to merge
+        """
+        for col in self.columns:
+            if col not in other.null_counts:
+                self.null_counts[col] += other.row_count
+        for col in other.columns:
+            if col not in self.null_counts:
+                self.columns.append(col)
+                self.null_counts[col] = self.row_count
+            self.null_counts[col] += other.null_counts[col]
+        self._non_numeric.update(other._non_numeric)
+        for col in other._numeric:
+            if col not in self._numeric:
+                self._numeric.append(col)
+        self._grow(len(self._numeric))
+        self._merge_numeric(other)
+        self.row_count += other.row_count
+
+    def get_summary_statistics(self) -> pd.DataFrame:
+        """
+        Get summary statistics for numeric columns.
+
+        Returns:
+            pd.DataFrame: Summary statistics in the layout of DataFrame.describe()
+        """
+        columns = self.numeric_columns
+        if not columns:
+            return pd.DataFrame()
+        rows = {name: [] for name in ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']}
+        for col in columns:
+            i = self._numeric.index(col)
+            count = self._count[i, i]
+            rows['count'].append(count)
+            rows['mean'].append(self._mean[i, i] if count > 0 else np.nan)
+            rows['std'].append(np.sqrt(self._m2[i, i] / (count - 1)) if count > 1 else np.nan)
+            rows['min'].append(self._minimum[i] if count > 0 else np.nan)
+            for name, q in [('25%', 0.25), ('50%', 0.5), ('75%', 0.75)]:
+                rows[name].append(self._quantiles[i].quantile(q))
+            rows['max'].append(self._maximum[i] if count > 0 else np.nan)
+        return pd.DataFrame(rows, index=columns).T
+
+    def get_missing_data_info(self) -> pd.DataFrame:
+        """
+        Get information about missing data.
+
+        Returns:
+            pd.DataFrame: Missing data information
+        """
+        missing_data = pd.Series(self.null_counts, index=self.columns, dtype='int64')
+        missing_percent = 100 * missing_data / self.row_count if self.row_count else missing_data * np.nan
+
+        missing_df = pd.DataFrame({
+            'missing_count': missing_data,
+            'missing_percent': missing_percent
+        })
+
+        return missing_df[missing_df['missing_count'] > 0]
+
+    def get_correlation_matrix(self) -> pd.DataFrame:
+        """
+        Get correlation matrix for numeric columns.
+
+        Returns:
+            pd.DataFrame: Correlation matrix
+        """
+        columns = self.numeric_columns
+        if len(columns) <= 1:
+            return pd.DataFrame()
+        idx = [self._numeric.index(col) for col in columns]
+        comoment = self._comoment[np.ix_(idx, idx)]
+        m2 = self._m2[np.ix_(idx, idx)]
+        count = self._count[np.ix_(idx, idx)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = comoment / np.sqrt(m2 * m2.T)
+        corr[(count < 2) | (m2 <= 0) | (m2.T <= 0)] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def _update_missing(self, chunk: pd.DataFrame):
+        """Track null counts, counting rows of chunks that lack a column as missing."""
+        for col in self.columns:
+            if col not in chunk.columns:
+                self.null_counts[col] += len(chunk)
+        chunk_nulls = chunk.isnull().sum()
+        for col in chunk.columns:
+            if col not in self.null_counts:
+                self.columns.append(col)
+                self.null_counts[col] = self.row_count
+            self.null_counts[col] += int(chunk_nulls[col])
+
+    def _update_types(self, chunk: pd.DataFrame):
+        """Register numeric columns and demote columns that hold non-numeric values."""
+        numeric = set(chunk.select_dtypes(include=[np.number]).columns)
+        for col in chunk.columns:
+            if col in numeric:
+                if col not in self._numeric:
+                    self._numeric.append(col)
+            elif chunk[col].notna().any():
+                # A column with non-numeric values would not be numeric in the combined frame
+                self._non_numeric.add(col)
+        self._grow(len(self._numeric))
+
+    def _grow(self, size: int):
+        """Extend per-column state to cover newly seen numeric columns."""
+        old = len(self._minimum)
+        if size == old:
+            return
+        self._minimum = np.concatenate([self._minimum, np.full(size - old, np.inf)])
+        self._maximum = np.concatenate([self._maximum, np.full(size - old, -np.inf)])
+        self._quantiles.extend(QuantileSummary(self.quantile_capacity) for _ in range(size - old))
+        for name in ['_count', '_mean', '_m2', '_comoment']:
+            grown = np.zeros((size, size))
+            grown[:old, :old] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def _set_moments(self, chunk: pd.DataFrame, columns: List[str]):
+        """Compute pairwise moments of one chunk, laid out over all known numeric columns."""
+        self._grow(len(self._numeric))
+        idx = [self._numeric.index(col) for col in columns]
+        values = chunk[columns].to_numpy(dtype=float, na_value=np.nan)
+        present = ~np.isnan(values)
+        mask = present.astype(float)
+
+        # Center on the chunk mean for numerical stability before taking products
+        # (zero for columns without values in the chunk)
+        shift = np.where(present, values, 0.0).sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+        centered = np.where(present, values - shift, 0.0)
+
+        count = mask.T @ mask
+        sums = centered.T @ mask
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(count > 0, sums / count, 0.0)
+            m2 = (centered ** 2).T @ mask - np.where(count > 0, sums ** 2 / count, 0.0)
+            comoment = centered.T @ centered - np.where(count > 0, sums * sums.T / count, 0.0)
+        grid = np.ix_(idx, idx)
+        self._count[grid] = count
+        self._mean[grid] = mean + shift[:, None]
+        self._m2[grid] = np.maximum(m2, 0.0)
+        self._comoment[grid] = comoment
+
+        for position, i in enumerate(idx):
+            column_values = values[present[:, position], position]
+            if len(column_values):
+                self._minimum[i] = column_values.min()
+                self._maximum[i] = column_values.max()
+                self._quantiles[i].update(column_values)
+
+    def _merge_numeric(self, other: 'StatsAccumulator'):
+        """Merge numeric moments of another accumulator (Chan et al. parallel update)."""
+        size = len(self._numeric)
+        idx = [self._numeric.index(col) for col in other._numeric]
+        grid = np.ix_(idx, idx)
+        count_b = np.zeros((size, size))
+        mean_b = np.zeros((size, size))
+        m2_b = np.zeros((size, size))
+        comoment_b = np.zeros((size, size))
+        count_b[grid] = other._count
+        mean_b[grid] = other._mean
+        m2_b[grid] = other._m2
+        comoment_b[grid] = other._comoment
+
+        count_a = self._count
+        total = count_a + count_b
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = mean_b - self._mean
+            weight = np.where(total > 0, count_a * count_b / total, 0.0)
+            self._mean = np.where(total > 0, self._mean + delta * np.where(total > 0, count_b / total, 0.0), 0.0)
+        self._m2 = self._m2 + m2_b + delta ** 2 * weight
+        self._comoment = self._comoment + comoment_b + delta * delta.T * weight
+        self._count = total
+
+        for position, i in enumerate(idx):
+            self._minimum[i] = min(self._minimum[i], other._minimum[position])
+            self._maximum[i] = max(self._maximum[i], other._maximum[position])
+            self._quantiles[i].merge(other._quantiles[position])
+
+
+class ChunkedBackend(ComputeBackend):
+    """Computes the reports of a dataset from chunks of rows, consumed once and not kept.
+
+    Summary statistics, missing data and correlations come from a StatsAccumulator
+    and match pandas on the whole dataset, except for quantiles of long columns.
+    Unique counts and top values of categorical columns are estimated with a
+    CategoricalSketch, so exact value counts are unavailable. Only the first rows
+    are kept, for previews.
+    """
+
+    name = 'chunked'
+    exact_value_counts = False
+
+    def __init__(self, chunks: Iterable[pd.DataFrame], quantile_capacity: int = DEFAULT_QUANTILE_CAPACITY,
+                 head_rows: int = DEFAULT_HEAD_ROWS):
+        """
+        Consume chunks of rows.
+
+        Args:
+            chunks (iterable): DataFrame chunks, e.g. from data_loaders.iter_tabular_batches
+            quantile_capacity (int): Points kept per column for quantile estimates
+            head_rows (int): Rows kept from the first chunks for head()
+
+        Raises:
+            ValueError: If there are no chunks
+        """
+        self.stats = StatsAccumulator(quantile_capacity)
+        self.sketch = CategoricalSketch()
+        categorical = set()
+        # The first values of each chunk carry its dtypes, which combine like the whole read
+        heads = []
+        first_rows = []
+        self._memory_usage = 0
+        for chunk in chunks:
+            self.stats.update(chunk)
+            chunk_categorical = PandasBackend(chunk).categorical_columns()
+            categorical.update(chunk_categorical)
+            self.sketch.update(chunk, chunk_categorical)
+            heads.append(chunk.bfill().iloc[:1])
+            if sum(len(rows) for rows in first_rows) < head_rows:
+                first_rows.append(chunk.iloc[:head_rows])
+            self._memory_usage += int(chunk.memory_usage(deep=True).sum())
+        if not heads:
+            raise ValueError("No rows to analyze")
+        self._types = pd.concat(heads, ignore_index=True).infer_objects()
+        self._head = pd.concat(first_rows, ignore_index=True).iloc[:head_rows]
+        self._categorical = [col for col in PandasBackend(self._types).categorical_columns() if col in categorical]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._types.columns)
+
+    @property
+    def row_count(self) -> int:
+        return self.stats.row_count
+
+    def column_types(self) -> Dict[str, str]:
+        return self._types.dtypes.astype(str).to_dict()
+
+    def numeric_columns(self) -> List[str]:
+        numeric = set(self.stats.numeric_columns)
+        return [col for col in self._types.columns if col in numeric]
+
+    def categorical_columns(self) -> List[str]:
+        return list(self._categorical)
+
+    def memory_usage(self) -> Optional[int]:
+        # Memory the chunks took, one at a time
+        return self._memory_usage
+
+    def describe(self, columns: List[str]) -> pd.DataFrame:
+        return self.stats.get_summary_statistics()[columns]
+
+    def missing_counts(self) -> pd.Series:
+        return pd.Series(self.stats.null_counts, index=self.columns, dtype='int64')
+
+    def value_counts(self, columns: List[str]) -> Dict[str, Optional[pd.Series]]:
+        raise ValueError("Exact value counts need every row; use the approximate categorical summary of chunked data")
+
+    def approximate_categorical_summary(self, columns: List[str], chunk_size: int = 1000000) -> Dict[str, Any]:
+        summary = self.sketch.get_categorical_summary()
+        return {col: summary[col] for col in columns}
+
+    def corr(self, columns: List[str]) -> pd.DataFrame:
+        return self.stats.get_correlation_matrix().loc[columns, columns]
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self._head.head(n)
+
+    def to_pandas(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        raise ValueError("The rows of chunked data are not kept")
@@ -0,0 +1,210 @@
+import contextvars
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable, Iterator
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+
+# Finished spans are logged here as JSON, at DEBUG level
+logger = logging.getLogger('json_visualizer.perf')
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Get the highest resident memory of this process so far.
+
+    Returns:
+        int or None: Peak RSS in bytes, None where the platform does not report it
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+class Span:
+    """One timed stage, with the amount of data it processed."""
+
+    def __init__(self, name: str, parent: Optional['Span'] = None, **attributes):
+        """
+        Start a span.
+
+        Args:
+            name (str): Stage name, e.g. 'json.parse'
+            parent (Span, optional): Enclosing span
+            **attributes: Extra fields recorded with the span
+        """
+        self.name = name
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.rows: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start = time.time()
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.peak_rss: Optional[int] = None
+
+    def finish(self):
+        """Record the duration and the process's peak RSS at the end of the span."""
+        self.duration = time.perf_counter() - self._start
+        self.peak_rss = peak_rss()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe the span as a flat, JSON-serializable record.
+
+        Returns:
+            dict: 'name', 'parent', 'depth', 'start' (Unix time), 'duration' (seconds),
+                'rows', 'bytes', 'peak_rss' (bytes), 'error' and any attributes
+        """
+        return {
+            'name': self.name,
+            'parent': self.parent.name if self.parent is not None else None,
+            'depth': self.depth,
+            'start': self.start,
+            'duration': self.duration,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'peak_rss': self.peak_rss,
+            'error': self.error,
+            **self.attributes
+        }
+
+
+class Tracer:
+    """Collects the spans of one unit of work, e.g. one Streamlit script run."""
+
+    def __init__(self):
+        """Initialize an empty tracer."""
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        """
+        Record a finished span and log it.
+
+        Args:
+            span (Span): Finished span
+        """
+        with self._lock:
+            self._spans.append(span)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(span.to_dict(), default=str))
+
+    @property
+    def spans(self) -> List[Span]:
+        """Finished spans in the order they started."""
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span._start)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Get all spans as records.
+
+        Returns:
+            list: Span.to_dict() of every span, in start order
+        """
+        return [span.to_dict() for span in self.spans]
+
+    def to_json_lines(self) -> str:
+        """
+        Export all spans as structured logs.
+
+        Returns:
+            str: One JSON record per line
+        """
+        return ''.join(json.dumps(record, default=str) + '\n' for record in self.to_records())
+
+
+_current_tracer: contextvars.ContextVar[Optional[Tracer]] = contextvars.ContextVar('tracer', default=None)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('span', default=None)
+
+
+def start_tracing() -> Tracer:
+    """
+    Collect the spans of the current thread (or task) into a new tracer.
+
+    Returns:
+        Tracer: The tracer now receiving spans
+    """
+    tracer = Tracer()
+    _current_tracer.set(tracer)
+    _current_span.set(None)
+    return tracer
+
+
+def stop_tracing():
+    """Stop collecting spans in the current thread (or task)."""
+    _current_tracer.set(None)
+    _current_span.set(None)
+
+
+@contextmanager
+def span(name: str, rows: Optional[int] = None, bytes: Optional[int] = None, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Time a stage if tracing is active.
+
+    The yielded span (None when tracing is off) can be given rows and bytes
+    processed once they are known.
+
+    Args:
+        name (str): Stage name
+        rows (int, optional): Rows processed
+        bytes (int, optional): Bytes processed
+        **attributes: Extra fields recorded with the span
+
+    Yields:
+        Span or None: The running span
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    current = Span(name, _current_span.get(), **attributes)
+    current.rows = rows
+    current.bytes = bytes
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+        tracer.add(current)
+
+
+def traced(name: str, rows: Optional[Callable[..., Optional[int]]] = None) -> Callable:
+    """
+    Decorate a function so each call is recorded as a span.
+
+    Args:
+        name (str): Stage name
+        rows (callable, optional): Given the call's arguments, returns the rows processed
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_tracer.get() is None:
+                return func(*args, **kwargs)
+            with span(name, rows=rows(*args, **kwargs) if rows is not None else None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,366 @@
+import json
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+
+from schema_inference import WILDCARD_PROPERTY, infer_schema_from_records
+
+try:
+    import pyarrow as pa
+except ImportError:  # dtype_backend="pyarrow" is then unavailable
+    pa = None
+
+
+DEFAULT_SEPARATOR = '.'
+
+# How list values are stored: as Python lists (like pd.json_normalize) or as JSON strings
+LIST_MODES = ['keep', 'stringify']
+
+# Column storage options besides the default NumPy/object arrays, as in the pandas readers
+DTYPE_BACKENDS = ['numpy_nullable', 'pyarrow']
+
+# Value of absent fields, as pd.json_normalize leaves them
+_MISSING = np.nan
+
+# Plan entry per object key: (key, column index or None, nested plan or None)
+_Plan = List[Tuple[str, Optional[int], Optional[list]]]
+
+
+class _PlanBuilder:
+    """Turns an inferred record schema into a fill plan and a list of output columns."""
+
+    def __init__(self, max_level: Optional[int], columns: Optional[List[str]], explode: Optional[str], sep: str):
+        self.max_level = max_level
+        self.selected = columns
+        self.explode = explode
+        self.sep = sep
+        self.names: List[str] = []
+        self.types: List[set] = []
+        self.index: Dict[str, int] = {}
+        self.explode_path: Optional[Tuple[str, ...]] = None
+        self.explode_plan: Optional[_Plan] = None
+        self.explode_column: Optional[int] = None
+
+    def wanted(self, name: str) -> bool:
+        """Whether a column is selected, directly or through a parent path."""
+        if self.selected is None:
+            return True
+        return any(name == col or name.startswith(col + self.sep) for col in self.selected)
+
+    def needed(self, prefix: str) -> bool:
+        """Whether any selected column can lie at or below a path."""
+        if self.selected is None:
+            return True
+        return self.wanted(prefix) or any(col.startswith(prefix + self.sep) for col in self.selected)
+
+    def column(self, name: str, types) -> int:
+        """Get the index of an output column, creating it if needed."""
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.types.append(set())
+        col = self.index[name]
+        self.types[col].update(types)
+        return col
+
+    def plan_object(self, node: Dict[str, Any], prefix: str, level: int, path: Tuple[str, ...]) -> _Plan:
+        """Build the plan of an object node; columns are created in schema order."""
+        properties = [(key, child) for key, child in node.get('properties', {}).items() if key != WILDCARD_PROPERTY]
+        flatten = self.max_level is None or level < self.max_level
+        leaves = {}
+        for key, child in properties:
+            name = prefix + key
+            if name == self.explode or not self.wanted(name):
+                continue
+            types = set(child['types'])
+            nested = 'object' in types and bool(child.get('properties'))
+            if types - {'object'} or (nested and not flatten):
+                leaves[key] = self.column(name, types - {'object'} if flatten else types)
+        plan = []
+        for key, child in properties:
+            name = prefix + key
+            if name == self.explode:
+                self.plan_explode(child, name, level, path + (key,))
+                continue
+            sub = None
+            if flatten and 'object' in child['types'] and child.get('properties') and self.needed(name):
+                sub = self.plan_object(child, name + self.sep, level + 1, path + (key,))
+            if key in leaves or sub:
+                plan.append((key, leaves.get(key), sub))
+        return plan
+
+    def plan_explode(self, node: Dict[str, Any], name: str, level: int, path: Tuple[str, ...]):
+        """Build the plan for the elements of the exploded array."""
+        if 'array' not in node['types']:
+            raise ValueError(f"Cannot explode '{name}': it is not an array")
+        self.explode_path = path
+        items = node.get('items', {'types': {}})
+        item_types = set(items['types'])
+        if item_types - {'object'} and self.wanted(name):
+            self.explode_column = self.column(name, item_types - {'object'})
+        if 'object' in item_types and items.get('properties'):
+            self.explode_plan = self.plan_object(items, name + self.sep, level + 1, path)
+
+
+def flattened_columns(schema: Dict[str, Any], max_level: Optional[int] = None,
+                      sep: str = DEFAULT_SEPARATOR, records: Optional[List[Any]] = None) -> List[str]:
+    """
+    List the columns flatten_records produces for records with a given schema.
+
+    Args:
+        schema (dict): Result of infer_json_schema for the records
+        max_level (int, optional): Maximum nesting depth to flatten
+        sep (str): Separator between nested keys in column names
+        records (list, optional): The records, to list the columns in the order
+            flatten_records gives them; in schema order if omitted
+
+    Returns:
+        list: Column names
+    """
+    item_schema = schema.get('items')
+    if item_schema is None:
+        return []
+    builder = _PlanBuilder(max_level, None, None, sep)
+    builder.plan_object(item_schema, '', 0, ())
+    if records is None:
+        return builder.names
+    return _first_seen_order(records, builder.names, max_level, sep)
+
+
+def _record_columns(record: Dict[str, Any], prefix: str, level: int, max_level: Optional[int], sep: str,
+                    names: List[str]):
+    """Append the columns pd.json_normalize makes of one object: top-level scalars first, then nested objects depth-first."""
+    nested = []
+    for key, value in record.items():
+        name = prefix + str(key)
+        if type(value) is dict and (max_level is None or level < max_level):
+            if level == 0:
+                nested.append((name, value))
+            else:
+                _record_columns(value, name + sep, level + 1, max_level, sep, names)
+        else:
+            names.append(name)
+    for name, value in nested:
+        _record_columns(value, name + sep, 1, max_level, sep, names)
+
+
+def _first_seen_order(records: List[Any], names: List[str], max_level: Optional[int], sep: str) -> List[str]:
+    """Order columns as pd.json_normalize does, by the first record that has each; records are read until every column is seen."""
+    wanted = set(names)
+    order: List[str] = []
+    seen = set()
+    for record in records:
+        if type(record) is not dict:
+            continue
+        record_names: List[str] = []
+        _record_columns(record, '', 0, max_level, sep, record_names)
+        for name in record_names:
+            if name in wanted and name not in seen:
+                seen.add(name)
+                order.append(name)
+        if len(seen) == len(wanted):
+            break
+    # Columns no record has (e.g. from the schema of a larger sample) follow in schema order
+    order.extend(name for name in names if name not in seen)
+    return order
+
+
+def _fill(record: Dict[str, Any], plan: _Plan, row: int, buffers: List[list]):
+    """Write one object's values into the column buffers."""
+    for key, col, sub in plan:
+        if key not in record:
+            continue
+        value = record[key]
+        if sub is not None and type(value) is dict:
+            _fill(value, sub, row, buffers)
+        elif col is not None:
+            buffers[col][row] = value
+
+
+def _get_path(record: Any, path: Tuple[str, ...]) -> Any:
+    """Follow object keys, returning None if the path is absent."""
+    for key in path:
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+
+def _to_array(values: list, types: set, exact: bool):
+    """Convert a filled buffer to a typed array, or leave type inference to pandas."""
+    non_null = types - {'NoneType'}
+    if exact and non_null and non_null <= {'int', 'float'}:
+        if non_null == {'int'}:
+            try:
+                return np.array(values, dtype=np.int64)
+            except OverflowError:
+                return values
+            except (TypeError, ValueError):
+                # Missing values: integers with NaN become floats, as in pandas
+                pass
+        return np.array(values, dtype=np.float64)
+    return values
+
+
+def _to_arrow(values) -> Any:
+    """Build an Arrow-backed column, keeping Python objects for values Arrow cannot type."""
+    try:
+        return pd.arrays.ArrowExtensionArray(pa.array(values, from_pandas=True))
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, OverflowError):
+        # Mixed scalar types, e.g. numbers and strings in one field
+        return values
+
+
+def flatten_records(records: List[Any], schema: Optional[Dict[str, Any]] = None, max_level: Optional[int] = None,
+                    list_mode: str = 'keep', explode: Optional[str] = None, columns: Optional[List[str]] = None,
+                    sep: str = DEFAULT_SEPARATOR, dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Flatten JSON records into a DataFrame using their inferred schema.
+
+    The schema fixes the output columns and their types up front, so each column
+    is a pre-allocated buffer filled in a single pass over the records, without
+    building an intermediate dict per row as pd.json_normalize does. Column names
+    and types match pd.json_normalize.
+
+    Args:
+        records (list): JSON objects (None records give empty rows)
+        schema (dict, optional): Result of infer_json_schema for these records;
+            inferred if omitted. Fields missing from a sampled schema are skipped
+        max_level (int, optional): Maximum nesting depth to flatten; deeper objects
+            are kept as dicts. Unlimited if omitted
+        list_mode (str): 'keep' stores lists as Python lists, 'stringify' as JSON strings
+        explode (str, optional): Column of an array field whose elements become rows;
+            object elements are flattened under the column name
+        columns (list, optional): Columns to materialize; a name also selects every
+            column nested under it. Other fields are never read
+        sep (str): Separator between nested keys in column names
+        dtype_backend (str, optional): 'pyarrow' builds Arrow-backed columns straight
+            from the buffers, 'numpy_nullable' uses nullable dtypes. Fields with
+            mixed scalar types stay Python objects
+
+    Returns:
+        pd.DataFrame: Flattened records
+
+    Raises:
+        ValueError: If a record is not an object, list_mode or dtype_backend is
+            unknown, or explode does not name an array field
+    """
+    if list_mode not in LIST_MODES:
+        raise ValueError(f"Unknown list mode '{list_mode}'. Choose from: {', '.join(LIST_MODES)}")
+    if dtype_backend is not None and dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f"Unknown dtype backend '{dtype_backend}'. Choose from: {', '.join(DTYPE_BACKENDS)}")
+    if dtype_backend == 'pyarrow' and pa is None:
+        raise ValueError("dtype_backend='pyarrow' requires the pyarrow package")
+    if schema is None:
+        schema = infer_schema_from_records(records)
+    item_schema = schema.get('items')
+    if item_schema is None:
+        return pd.DataFrame()
+    if set(item_schema['types']) - {'object', 'NoneType'}:
+        raise ValueError("All records must be JSON objects")
+
+    builder = _PlanBuilder(max_level, columns, explode, sep)
+    plan = builder.plan_object(item_schema, '', 0, ())
+    if explode is not None and builder.explode_path is None:
+        raise ValueError(f"Cannot explode '{explode}': no such array field")
+
+    if builder.explode_path is None:
+        n_rows = len(records)
+    else:
+        lengths = []
+        for record in records:
+            items = _get_path(record, builder.explode_path)
+            lengths.append(len(items) if isinstance(items, list) and items else 1)
+        n_rows = sum(lengths)
+
+    buffers = [[_MISSING] * n_rows for _ in builder.names]
+    row = 0
+    for position, record in enumerate(records):
+        if record is None:
+            row += 1
+            continue
+        if type(record) is not dict:
+            raise ValueError("All records must be JSON objects")
+        _fill(record, plan, row, buffers)
+        if builder.explode_path is None:
+            row += 1
+            continue
+        items = _get_path(record, builder.explode_path)
+        count = lengths[position]
+        if count > 1:
+            # Repeat the record's other fields on every row of its elements
+            for buffer in buffers:
+                buffer[row + 1:row + count] = [buffer[row]] * (count - 1)
+        if isinstance(items, list):
+            for offset, item in enumerate(items):
+                if builder.explode_plan is not None and type(item) is dict:
+                    _fill(item, builder.explode_plan, row + offset, buffers)
+                elif builder.explode_column is not None:
+                    buffers[builder.explode_column][row + offset] = item
+        row += count
+
+    exact = schema.get('sampled', schema.get('size')) == schema.get('size') == len(records)
+    data = {}
+    for name, types, buffer in zip(builder.names, builder.types, buffers):
+        if list_mode == 'stringify' and 'array' in types:
+            buffer = [json.dumps(value) if isinstance(value, list) else value for value in buffer]
+        data[name] = _to_arrow(buffer) if dtype_backend == 'pyarrow' else _to_array(buffer, types, exact)
+    names = builder.names
+    if builder.explode_path is None and len(names) > 1:
+        names = _first_seen_order(records, names, max_level, sep)
+    df = pd.DataFrame(data, index=pd.RangeIndex(n_rows), columns=names)
+    if dtype_backend == 'numpy_nullable':
+        df = df.convert_dtypes()
+    return df
+
+
+def concat_flattened(frames: List[pd.DataFrame], columns: Optional[List[str]] = None,
+                     dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Concatenate DataFrames flattened from consecutive batches of records.
+
+    Columns are moved out of the batches one at a time, so memory peaks near the size
+    of the result rather than twice it. A column typed differently by the batches
+    (e.g. integers in one, text in a later one) is typed from all of its values, as
+    flattening every record at once would.
+
+    Args:
+        frames (list): Flattened batches; their columns are removed by the call
+        columns (list, optional): Output column order; by default, and for other
+            columns, the order in which batches first have them
+        dtype_backend (str, optional): Backend the batches were flattened with
+
+    Returns:
+        pd.DataFrame: Rows of all batches; columns a batch lacks are missing in its rows
+    """
+    if not frames:
+        return pd.DataFrame()
+    present = set().union(*(frame.columns for frame in frames))
+    names = [col for col in (columns or []) if col in present]
+    listed = set(names)
+    for frame in frames:
+        for col in frame.columns:
+            if col not in listed:
+                names.append(col)
+                listed.add(col)
+    lengths = [len(frame) for frame in frames]
+    data = {}
+    for name in names:
+        parts = [frame.pop(name) if name in frame.columns else None for frame in frames]
+        if all(part is not None for part in parts) and len({str(part.dtype) for part in parts}) == 1:
+            data[name] = pd.concat(parts, ignore_index=True)
+            continue
+        values = []
+        for part, length in zip(parts, lengths):
+            if part is None:
+                values.extend([_MISSING] * length)
+            elif dtype_backend is None:
+                values.extend(part.tolist())
+            else:
+                values.extend(part.to_numpy(dtype=object, na_value=_MISSING).tolist())
+        if dtype_backend == 'pyarrow':
+            data[name] = _to_arrow(values)
+        else:
+            column = pd.Series(values)
+            data[name] = column.convert_dtypes() if dtype_backend == 'numpy_nullable' else column
+    return pd.DataFrame(data, index=pd.RangeIndex(sum(lengths)), columns=names, copy=False)
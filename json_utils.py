@@ -1,15 +1,38 @@
+import io
 import json
+import re
 import pandas as pd
 import os
-from typing import Union, Dict, Any
+from itertools import islice
+from typing import Union, Dict, Any, Optional, List, Tuple, Callable, BinaryIO, Iterator, TextIO
 
+from schema_inference import DEFAULT_MAX_PROPERTIES, SchemaNode, infer_schema_from_records
+from json_flatten import flatten_records, flattened_columns, concat_flattened
+from lazy_dataset import LazyDataset, DEFAULT_SAMPLE_ROWS
+from instrumentation import span
 
-def load_json_file(file_path: str) -> Union[Dict[str, Any], list]:
+
+MAX_JSON_SIZE = 24 * 1024 * 1024  # 24MB in bytes
+
+# Default memory budget for DataFrames built by the streaming loader
+DEFAULT_MEMORY_BUDGET = int(os.environ.get('JSON_VISUALIZER_MEMORY_BUDGET_MB', 1024)) * 1024 * 1024  # 1GB in bytes
+
+# Number of characters read from a stream per refill
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+BytesSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+# Characters that end a JSON token; a decode error followed by one is not caused by a cut-off record
+_TOKEN_END = re.compile(r'[\s,:\]}]')
+
+
+def load_json_file(file_path: str, max_size: Optional[int] = MAX_JSON_SIZE) -> Union[Dict[str, Any], list]:
     """
     Load JSON data from a file.
     
     Args:
         file_path (str): Path to the JSON file
+        max_size (int, optional): Maximum file size in bytes, None for no limit
         
     Returns:
         dict or list: Parsed JSON data
@@ -18,46 +41,330 @@ def load_json_file(file_path: str) -> Union[Dict[str, Any], list]:
         FileNotFoundError: If the file doesn't exist
         json.JSONDecodeError: If the file is not valid JSON
     """
+    try:
+        return _read_json_file(file_path, max_size)
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(f"Invalid JSON format: {str(e)}", e.doc, e.pos)
+
+
+def load_json_bytes(content: BytesSource, max_size: Optional[int] = MAX_JSON_SIZE) -> Union[Dict[str, Any], list]:
+    """
+    Load JSON data from an in-memory buffer without touching the filesystem.
+    
+    Args:
+        content (bytes, memoryview or binary file object): Raw JSON document
+        max_size (int, optional): Maximum document size in bytes, None for no limit
+        
+    Returns:
+        dict or list: Parsed JSON data
+        
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON
+    """
+    try:
+        return _read_json_bytes(content, max_size)
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(f"Invalid JSON format: {str(e)}", e.doc, e.pos)
+
+
+def _check_json_size(file_size: int, max_size: Optional[int]):
+    """Raise ValueError if a JSON document exceeds the size limit."""
+    if max_size is not None and file_size > max_size:
+        raise ValueError(f"File size exceeds {max_size / (1024*1024):g}MB limit. File size: {file_size / (1024*1024):.2f}MB")
+
+
+def _read_json_file(file_path: str, max_size: Optional[int] = MAX_JSON_SIZE) -> Union[Dict[str, Any], list]:
+    """Check existence and size of a JSON file, then decode it (decoder errors propagate unchanged)."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    # Check file size (24MB limit)
     file_size = os.path.getsize(file_path)
-    max_size = 24 * 1024 * 1024  # 24MB in bytes
-    if file_size > max_size:
-        raise ValueError(f"File size exceeds 24MB limit. File size: {file_size / (1024*1024):.2f}MB")
+    _check_json_size(file_size, max_size)
     
-    with open(file_path, 'r', encoding='utf-8') as file:
-        try:
-            data = json.load(file)
-            return data
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"Invalid JSON format: {str(e)}", e.doc, e.pos)
+    with span('json.parse', bytes=file_size), open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def _read_json_bytes(content: BytesSource, max_size: Optional[int] = MAX_JSON_SIZE) -> Union[Dict[str, Any], list]:
+    """Check size of an in-memory JSON document, then decode it (decoder errors propagate unchanged)."""
+    if hasattr(content, 'read'):
+        content = content.read()
+    elif isinstance(content, memoryview):
+        # json.loads needs a bytes-like object it can decode in one go
+        content = content.tobytes()
+    _check_json_size(len(content), max_size)
+    with span('json.parse', bytes=len(content)):
+        return json.loads(content.decode('utf-8'))
 
 
-def json_to_dataframe(json_data: Union[Dict[str, Any], list]) -> pd.DataFrame:
+def json_to_dataframe(json_data: Union[Dict[str, Any], list], schema: Optional[Dict[str, Any]] = None,
+                      max_level: Optional[int] = None, list_mode: str = 'keep',
+                      explode: Optional[str] = None, columns: Optional[List[str]] = None,
+                      dtype_backend: Optional[str] = None) -> pd.DataFrame:
     """
     Convert JSON data to a pandas DataFrame.
     
+    Nested objects are flattened into dotted column names, as pd.json_normalize does,
+    by the schema-driven columnar flattener.
+    
     Args:
         json_data (dict or list): JSON data to convert
+        schema (dict, optional): Inferred schema of json_data (see infer_json_schema)
+        max_level (int, optional): Maximum nesting depth to flatten
+        list_mode (str): 'keep' lists as Python lists or 'stringify' them to JSON
+        explode (str, optional): Array column whose elements become rows
+        columns (list, optional): Columns to materialize
+        dtype_backend (str, optional): 'pyarrow' for Arrow-backed columns or
+            'numpy_nullable' for nullable dtypes
         
     Returns:
         pd.DataFrame: DataFrame representation of the JSON data
     """
     try:
-        # If it's a dictionary with nested data, we might need to normalize it
-        if isinstance(json_data, dict):
-            # Check if it's a simple dict or a nested structure
-            df = pd.json_normalize(json_data)
-        else:
-            # If it's a list, convert directly
-            df = pd.json_normalize(json_data)
+        records, schema = _as_records(json_data, schema)
+        with span('json.flatten', columns=len(columns) if columns is not None else None) as current:
+            df = flatten_records(records, schema=schema, max_level=max_level, list_mode=list_mode,
+                                 explode=explode, columns=columns, dtype_backend=dtype_backend)
+            if current is not None:
+                current.rows = len(df)
         return df
     except Exception as e:
         raise ValueError(f"Could not convert JSON to DataFrame: {str(e)}")
 
 
+def _as_records(json_data: Union[Dict[str, Any], list],
+                schema: Optional[Dict[str, Any]]) -> Tuple[list, Optional[Dict[str, Any]]]:
+    """Treat a single object as a one-record array, adapting its schema to match."""
+    if isinstance(json_data, list):
+        return json_data, schema
+    if schema is not None:
+        schema = {'type': 'array', 'size': 1, 'sampled': 1, 'items': schema}
+    return [json_data], schema
+
+
+def lazy_json_dataset(json_data: Union[Dict[str, Any], list], schema: Optional[Dict[str, Any]] = None,
+                      initial_columns: Optional[List[str]] = None,
+                      transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                      dtype_backend: Optional[str] = None) -> LazyDataset:
+    """
+    Open parsed JSON data as a LazyDataset that flattens columns on demand.
+    
+    Each fetch flattens only the requested column paths; other fields are not read.
+    
+    Args:
+        json_data (dict or list): Parsed JSON data
+        schema (dict, optional): Inferred schema of json_data; inferred if omitted
+        initial_columns (list, optional): Columns flattened up front
+        transform (callable, optional): Applied to every batch of columns flattened
+        dtype_backend (str, optional): Backend of the flattened columns (see json_to_dataframe)
+        
+    Returns:
+        LazyDataset: Dataset over the flattened records
+    """
+    records, record_schema = _as_records(json_data, schema)
+    if record_schema is None:
+        record_schema = infer_schema_from_records(records)
+        schema = record_schema if isinstance(json_data, list) else record_schema['items']
+    return LazyDataset(lambda columns: json_to_dataframe(json_data, schema=schema, columns=columns,
+                                                         dtype_backend=dtype_backend),
+                       flattened_columns(record_schema, records=records),
+                       initial_columns=initial_columns,
+                       load_sample=lambda: json_to_dataframe(records[:DEFAULT_SAMPLE_ROWS], schema=record_schema,
+                                                             dtype_backend=dtype_backend),
+                       transform=transform)
+
+
+def iter_json_records(source: Union[str, BytesSource, TextIO], lines: bool = False,
+                      chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Iterate over the records of a JSON array or NDJSON stream without decoding it all at once.
+    
+    Only the current chunk and record are held in memory. A document whose top level is
+    not an array is decoded whole and yielded as a single record.
+    
+    Args:
+        source (str, bytes, memoryview or file object): Path, raw content or open stream
+        lines (bool): Treat the input as newline-delimited JSON (one record per line)
+        chunk_size (int): Number of characters read per refill
+        
+    Yields:
+        Decoded top-level array elements or NDJSON lines
+        
+    Raises:
+        FileNotFoundError: If a path is given and the file doesn't exist
+        json.JSONDecodeError: If the input is not valid JSON
+    """
+    if isinstance(source, str):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+        with open(source, 'r', encoding='utf-8') as stream:
+            yield from _iter_stream_records(stream, lines, chunk_size)
+    else:
+        yield from _iter_stream_records(_open_text_stream(source), lines, chunk_size)
+
+
+def _open_text_stream(source: Union[BytesSource, TextIO]) -> TextIO:
+    """Wrap bytes, a memoryview or a binary file object in a UTF-8 text stream."""
+    if isinstance(source, io.TextIOBase):
+        return source
+    if not hasattr(source, 'read'):
+        source = io.BytesIO(source)
+    return io.TextIOWrapper(source, encoding='utf-8')
+
+
+def _iter_stream_records(stream: TextIO, lines: bool, chunk_size: int) -> Iterator[Any]:
+    """Yield records from an open text stream."""
+    if lines:
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise json.JSONDecodeError(f"Invalid JSON format on line {line_number}: {e.msg}", e.doc, e.pos)
+        return
+    
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    offset = 0  # characters consumed before the start of the buffer
+    eof = False
+    
+    def refill() -> bool:
+        nonlocal buffer, pos, offset, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        offset += pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return not eof
+    
+    def next_token() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or not refill():
+                return buffer[pos] if pos < len(buffer) else ''
+    
+    first = next_token()
+    if first != '[':
+        # Not an array: the whole document is one record
+        document = buffer[pos:] + stream.read()
+        if document.strip():
+            yield json.loads(document)
+        return
+    pos += 1
+    
+    if next_token() == ']':
+        return
+    while True:
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+            # A number or literal may continue in the next chunk unless a delimiter follows it
+            if not eof and (end == len(buffer) or (buffer[pos] not in '{["' and buffer[end] not in ' \t\r\n,]')):
+                refill()
+                continue
+        except json.JSONDecodeError as e:
+            error_position = offset + e.pos
+            # Read on only if the record may be cut off by the end of the buffer; an error
+            # followed by more tokens is raised without reading the rest of the input
+            truncated = e.msg.startswith('Unterminated string') or not _TOKEN_END.search(buffer, e.pos)
+            if truncated and refill():
+                continue
+            raise json.JSONDecodeError(f"Invalid JSON format at character {error_position}: {e.msg}", e.doc, e.pos)
+        pos = end
+        yield record
+        
+        separator = next_token()
+        if separator == ']':
+            return
+        if separator != ',':
+            raise json.JSONDecodeError(f"Invalid JSON format at character {offset + pos}: Expecting ',' delimiter", buffer, pos)
+        pos += 1
+        next_token()
+
+
+def iter_json_batches(source: Union[str, BytesSource, TextIO], batch_size: int = 10000,
+                      lines: bool = False, columns: Optional[List[str]] = None,
+                      dtype_backend: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a JSON array or NDJSON input as flattened DataFrames of at most batch_size rows.
+    
+    Args:
+        source (str, bytes, memoryview or file object): Path, raw content or open stream
+        batch_size (int): Maximum number of records per DataFrame
+        lines (bool): Treat the input as newline-delimited JSON
+        columns (list, optional): Columns to materialize; other fields are skipped
+        dtype_backend (str, optional): Backend of the flattened columns (see json_to_dataframe)
+        
+    Yields:
+        pd.DataFrame: Flattened batch of records
+    """
+    batch = []
+    for record in iter_json_records(source, lines=lines):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield json_to_dataframe(batch, columns=columns, dtype_backend=dtype_backend)
+            batch = []
+    if batch:
+        yield json_to_dataframe(batch, columns=columns, dtype_backend=dtype_backend)
+
+
+def load_json_dataframe(source: Union[str, BytesSource, TextIO], lines: bool = False,
+                        batch_size: int = 10000,
+                        memory_budget: Optional[int] = DEFAULT_MEMORY_BUDGET,
+                        columns: Optional[List[str]] = None,
+                        dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Build a flattened DataFrame from a JSON array or NDJSON input by streaming it in batches.
+    
+    Unlike load_json_file there is no limit on the input size; instead the resulting
+    DataFrame must fit within the memory budget. The columns and their types are
+    those of flattening all records at once (see concat_flattened).
+    
+    Args:
+        source (str, bytes, memoryview or file object): Path, raw content or open stream
+        lines (bool): Treat the input as newline-delimited JSON
+        batch_size (int): Number of records flattened at a time
+        memory_budget (int, optional): Maximum DataFrame size in bytes, None for no limit
+        columns (list, optional): Columns to materialize; other fields are skipped
+        dtype_backend (str, optional): Backend of the flattened columns (see json_to_dataframe)
+        
+    Returns:
+        pd.DataFrame: Flattened records
+        
+    Raises:
+        ValueError: If the data exceeds the memory budget
+    """
+    frames = []
+    used = 0
+    rows = 0
+    records = iter_json_records(source, lines=lines)
+    with span('json.stream') as current:
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            node = SchemaNode()
+            node.observe_many(batch)
+            schema = {'type': 'array', 'size': len(batch), 'sampled': len(batch), 'items': node.to_dict()}
+            frame = json_to_dataframe(batch, schema=schema, columns=columns, dtype_backend=dtype_backend)
+            del batch
+            rows += len(frame)
+            used += int(frame.memory_usage(deep=True).sum())
+            if memory_budget is not None and used > memory_budget:
+                raise ValueError(f"Data exceeds the {memory_budget / (1024*1024):g}MB memory budget after {rows} rows")
+            frames.append(frame)
+        if current is not None:
+            current.rows, current.bytes = rows, used
+        if not frames:
+            return pd.DataFrame()
+        # Each batch lists columns in the order its records first have them, so do the batches together
+        return concat_flattened(frames, dtype_backend=dtype_backend)
+
+
 def get_json_structure(data: Union[Dict, list], path: str = "") -> dict:
     """
     Analyze the structure of JSON data.
@@ -102,6 +409,68 @@ def get_json_structure(data: Union[Dict, list], path: str = "") -> dict:
     return structure
 
 
+def infer_json_schema_stream(source: Union[str, BytesSource, TextIO], lines: bool = False,
+                             sample_size: Optional[int] = None,
+                             max_properties: int = DEFAULT_MAX_PROPERTIES) -> Dict[str, Any]:
+    """
+    Infer the schema of a JSON array or NDJSON input without loading it into memory.
+    
+    Records are decoded one at a time, so memory is bounded by the schema size
+    (and the reservoir when sampling) rather than the input size.
+    
+    Args:
+        source (str, bytes, memoryview or file object): Path, raw content or open stream
+        lines (bool): Treat the input as newline-delimited JSON
+        sample_size (int, optional): Infer from a reservoir sample of records
+        max_properties (int): Maximum distinct keys tracked per object path
+        
+    Returns:
+        dict: Inferred schema (see infer_json_schema)
+    """
+    with span('json.infer_schema'):
+        return infer_schema_from_records(iter_json_records(source, lines=lines), sample_size, max_properties)
+
+
+def load_validated_json(file_path: str, max_size: Optional[int] = MAX_JSON_SIZE) -> Tuple[Optional[Union[Dict[str, Any], list]], Optional[Dict[str, Any]]]:
+    """
+    Load and validate a JSON file in a single parse.
+    
+    Args:
+        file_path (str): Path to the JSON file
+        max_size (int, optional): Maximum file size in bytes, None for no limit
+        
+    Returns:
+        tuple: (data, error) where data is the parsed JSON (None on failure) and
+            error is None on success or a dict with 'message', 'line' and 'column'
+            (line/column are None when the failure is not a syntax error)
+    """
+    return _validated(lambda: _read_json_file(file_path, max_size))
+
+
+def load_validated_json_bytes(content: BytesSource, max_size: Optional[int] = MAX_JSON_SIZE) -> Tuple[Optional[Union[Dict[str, Any], list]], Optional[Dict[str, Any]]]:
+    """
+    Load and validate an in-memory JSON document in a single parse.
+    
+    Args:
+        content (bytes, memoryview or binary file object): Raw JSON document
+        max_size (int, optional): Maximum document size in bytes, None for no limit
+        
+    Returns:
+        tuple: (data, error) as returned by load_validated_json
+    """
+    return _validated(lambda: _read_json_bytes(content, max_size))
+
+
+def _validated(read: Callable[[], Any]) -> Tuple[Optional[Union[Dict[str, Any], list]], Optional[Dict[str, Any]]]:
+    """Run a JSON reader and turn its failures into a structured error."""
+    try:
+        return read(), None
+    except json.JSONDecodeError as e:
+        return None, {'message': e.msg, 'line': e.lineno, 'column': e.colno}
+    except (FileNotFoundError, ValueError) as e:
+        return None, {'message': str(e), 'line': None, 'column': None}
+
+
 def validate_json_format(file_path: str) -> bool:
     """
     Validate if a file contains valid JSON.
@@ -112,8 +481,5 @@ def validate_json_format(file_path: str) -> bool:
     Returns:
         bool: True if valid JSON, False otherwise
     """
-    try:
-        load_json_file(file_path)
-        return True
-    except (FileNotFoundError, json.JSONDecodeError, ValueError):
-        return False
\ No newline at end of file
+    _, error = load_validated_json(file_path)
+    return error is None
\ No newline at end of file
@@ -0,0 +1,117 @@
+import threading
+import pandas as pd
+from typing import List, Callable, Optional, Iterable
+
+from instrumentation import span
+
+
+# Rows read from every column to detect column types without loading the data
+DEFAULT_SAMPLE_ROWS = 1000
+
+
+class LazyDataset:
+    """Dataset whose columns are read from their source the first time they are needed.
+
+    The loaded columns live in a single DataFrame (`frame`) that grows in place, so
+    analyzers, visualizers and the results store keep referring to the same object
+    as more columns are fetched. Its columns are in source order.
+    """
+
+    def __init__(self, load_columns: Callable[[List[str]], pd.DataFrame], columns: List[str],
+                 initial_columns: Optional[List[str]] = None,
+                 load_sample: Optional[Callable[[], pd.DataFrame]] = None,
+                 transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None):
+        """
+        Initialize the dataset.
+
+        Args:
+            load_columns (callable): Reads the given columns of every row into a DataFrame
+            columns (list): All columns available from the source
+            initial_columns (list, optional): Columns loaded up front; otherwise nothing
+                is read until the first fetch
+            load_sample (callable, optional): Reads the first rows of every column, used
+                for type detection of columns that are not loaded
+            transform (callable, optional): Applied to every batch of columns read,
+                e.g. a DtypeOptimizer
+        """
+        if not columns:
+            raise ValueError("Dataset has no columns")
+        self.columns = list(columns)
+        self._load_columns = load_columns
+        self._load_sample = load_sample
+        self.transform = transform
+        self._frame: Optional[pd.DataFrame] = None
+        self._sample: Optional[pd.DataFrame] = None
+        self._lock = threading.RLock()
+        if initial_columns:
+            self.fetch(initial_columns)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """DataFrame of the loaded columns (the first column if none was requested yet)."""
+        with self._lock:
+            if self._frame is None:
+                self.fetch(self.columns[:1])
+            return self._frame
+
+    @property
+    def loaded_columns(self) -> List[str]:
+        """Columns that have been read so far."""
+        return list(self._frame.columns) if self._frame is not None else []
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        """First rows of every column (loaded on first access)."""
+        with self._lock:
+            if self._sample is None:
+                self._sample = self._load_sample() if self._load_sample is not None else self.load_all().head(DEFAULT_SAMPLE_ROWS)
+            return self._sample
+
+    def fetch(self, columns: Iterable[Optional[str]]) -> pd.DataFrame:
+        """
+        Make sure columns are loaded, reading the missing ones in a single pass.
+
+        Args:
+            columns (iterable): Column names; unknown names and None are ignored
+
+        Returns:
+            pd.DataFrame: The dataset frame, now including the requested columns
+        """
+        with self._lock:
+            loaded = set(self.loaded_columns)
+            missing = []
+            for col in columns:
+                if col is not None and col in self.columns and col not in loaded and col not in missing:
+                    missing.append(col)
+            if missing:
+                with span('dataset.fetch', columns=len(missing)) as current:
+                    new_columns = self._read(missing)
+                    if current is not None:
+                        current.rows = len(new_columns)
+                if self._frame is None:
+                    self._frame = new_columns
+                else:
+                    # Insert in place at each column's source position, so the frame keeps
+                    # the source's column order however the columns were fetched
+                    position = {col: i for i, col in enumerate(self.columns)}
+                    for col in new_columns.columns:
+                        if col not in loaded:
+                            rank = position.get(col, len(position))
+                            loc = sum(position.get(existing, len(position)) <= rank for existing in self._frame.columns)
+                            self._frame.insert(loc, col, new_columns[col])
+            return self.frame
+
+    def load_all(self) -> pd.DataFrame:
+        """
+        Load every column.
+
+        Returns:
+            pd.DataFrame: The complete dataset frame
+        """
+        return self.fetch(self.columns)
+
+    def _read(self, columns: List[str]) -> pd.DataFrame:
+        """Read columns from the source, keeping the source's column order."""
+        wanted = set(columns)
+        df = self._load_columns([col for col in self.columns if col in wanted])
+        return self.transform(df) if self.transform is not None else df
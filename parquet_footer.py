@@ -0,0 +1,164 @@
+import io
+from typing import Dict, Any, List, Optional, Union, Callable
+
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+from data_loaders import arrow_types_mapper
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet files are then profiled from their loaded columns only
+    pa = None
+    pq = None
+
+
+def read_parquet_footer(content: Union[bytes, io.BytesIO], dtype_backend: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Profile a Parquet file from its footer, without reading any column data.
+
+    The footer holds the row count, the schema and, per row group and column,
+    the null count and min/max values written with the data.
+
+    Args:
+        content (bytes or BytesIO): Raw file content
+        dtype_backend (str, optional): Backend the columns will be loaded with, used
+            for the pandas dtypes reported (see load_tabular_bytes)
+
+    Returns:
+        dict: 'rows', 'row_groups', 'columns' (data column names in file order),
+            'numeric_columns', 'categorical_columns' and 'column_stats', which maps
+            each column to its Parquet 'type', pandas 'dtype', 'null_count', 'min'
+            and 'max'; statistics are None where a row group did not record them
+
+    Raises:
+        ValueError: If pyarrow is not installed or the content is not a Parquet file
+    """
+    if pq is None:
+        raise ValueError("Reading Parquet metadata requires pyarrow")
+    if not hasattr(content, 'read'):
+        content = io.BytesIO(content)
+    try:
+        parquet_file = pq.ParquetFile(content)
+    except pa.ArrowException as e:
+        raise ValueError(f"Invalid Parquet file: {e}") from e
+    metadata = parquet_file.metadata
+    schema = parquet_file.schema_arrow
+    index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+    columns = [name for name in schema.names if name not in index_columns]
+
+    # An empty table converts to a frame with the dtypes the columns will be loaded with
+    empty = schema.empty_table().to_pandas(types_mapper=arrow_types_mapper(dtype_backend))[columns]
+
+    # Statistics are kept per leaf column; top-level columns are leaves unless nested
+    leaf_index = {metadata.schema.column(j).path: j for j in range(metadata.num_columns)}
+    column_stats = {}
+    for name in columns:
+        field = schema.field(name)
+        stats = _column_statistics(metadata, leaf_index.get(name))
+        column_stats[name] = {
+            'type': str(field.type),
+            'dtype': str(empty[name].dtype),
+            **stats
+        }
+
+    # Nested values (lists, structs) are not hashable, unlike the empty column suggests
+    analyzer = DataAnalyzer(empty)
+    categorical_columns = [name for name in analyzer.categorical_columns
+                           if not pa.types.is_nested(schema.field(name).type)]
+    return {
+        'rows': metadata.num_rows,
+        'row_groups': metadata.num_row_groups,
+        'columns': columns,
+        'numeric_columns': analyzer.numeric_columns,
+        'categorical_columns': categorical_columns,
+        'column_stats': column_stats
+    }
+
+
+def _column_statistics(metadata, column_index: Optional[int]) -> Dict[str, Any]:
+    """Combine the null counts and min/max values of one column over all row groups."""
+    unknown = {'null_count': None, 'min': None, 'max': None}
+    if column_index is None:
+        return unknown
+    null_count: Optional[int] = 0
+    minimum = maximum = None
+    has_min_max = True
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column_index).statistics
+        if stats is None:
+            return unknown
+        if null_count is not None:
+            null_count = null_count + stats.null_count if stats.has_null_count else None
+        if not has_min_max:
+            continue
+        if stats.has_min_max:
+            try:
+                minimum = stats.min if minimum is None else min(minimum, stats.min)
+                maximum = stats.max if maximum is None else max(maximum, stats.max)
+            except TypeError:
+                has_min_max = False
+        elif stats.num_values > 0:
+            # Values without a recorded range make the overall range unknown
+            has_min_max = False
+    return {
+        'null_count': null_count,
+        'min': minimum if has_min_max else None,
+        'max': maximum if has_min_max else None
+    }
+
+
+def footer_missing_data(footer: Dict[str, Any], columns: List[str],
+                        load_columns: Optional[Callable[[List[str]], pd.DataFrame]] = None) -> Optional[pd.DataFrame]:
+    """
+    Get missing data information from footer null counts.
+
+    Args:
+        footer (dict): Result of read_parquet_footer
+        columns (list): Columns to report
+        load_columns (callable, optional): Reads the given columns; used to count the
+            missing values of columns without footer statistics (e.g. nested columns)
+
+    Returns:
+        pd.DataFrame or None: Missing data information in the format of
+            DataAnalyzer.get_missing_data_info, None if a column has no null count
+            and load_columns is not given
+    """
+    counts = {col: footer['column_stats'][col]['null_count'] for col in columns}
+    unknown = [col for col, count in counts.items() if count is None]
+    if unknown:
+        if load_columns is None:
+            return None
+        counts.update(load_columns(unknown)[unknown].isnull().sum().to_dict())
+    missing_data = pd.Series(counts, dtype='int64')[columns]
+    missing_df = pd.DataFrame({
+        'missing_count': missing_data,
+        'missing_percent': 100 * missing_data / max(footer['rows'], 1)
+    })
+    return missing_df[missing_df['missing_count'] > 0]
+
+
+def footer_column_types(footer: Dict[str, Any], columns: List[str]) -> pd.DataFrame:
+    """
+    Tabulate the types and recorded statistics of columns.
+
+    Args:
+        footer (dict): Result of read_parquet_footer
+        columns (list): Columns to report
+
+    Returns:
+        pd.DataFrame: One row per column with its Parquet type, pandas dtype, null count,
+            min and max (shown as text, since columns mix types)
+    """
+    rows = {}
+    for col in columns:
+        stats = footer['column_stats'][col]
+        rows[col] = {
+            'parquet_type': stats['type'],
+            'dtype': stats['dtype'],
+            'null_count': stats['null_count'],
+            'min': None if stats['min'] is None else str(stats['min']),
+            'max': None if stats['max'] is None else str(stats['max'])
+        }
+    return pd.DataFrame.from_dict(rows, orient='index').astype({'null_count': 'Int64'})
@@ -0,0 +1,99 @@
+import threading
+import weakref
+import pandas as pd
+from typing import Dict, Any, Callable, Iterable, Tuple
+
+
+class ResultsStore:
+    """Memoized results of expensive computations, shared by analyzers and visualizers.
+
+    Results are keyed by the identity of the DataFrame they were computed from
+    (or of another object standing for its data, such as the LazyDataset it was
+    read from), the operation name and the column set. Entries are dropped
+    automatically when that object is garbage collected. DataFrames are assumed
+    not to be modified in place after results have been stored; call
+    invalidate() if they are.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._results: Dict[int, Dict[Tuple[str, Tuple], Any]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, df: pd.DataFrame, operation: str, columns: Iterable[str], default: Any = None) -> Any:
+        """
+        Get a stored result.
+
+        Args:
+            df (pd.DataFrame): DataFrame the result was computed from
+            operation (str): Name of the computation (e.g. 'corr', 'value_counts')
+            columns (iterable): Columns the computation used
+            default: Value returned when nothing is stored
+
+        Returns:
+            The stored result or default
+        """
+        with self._lock:
+            return self._results.get(id(df), {}).get((operation, tuple(columns)), default)
+
+    def put(self, df: pd.DataFrame, operation: str, columns: Iterable[str], value: Any) -> Any:
+        """
+        Store a result.
+
+        Args:
+            df (pd.DataFrame): DataFrame the result was computed from
+            operation (str): Name of the computation
+            columns (iterable): Columns the computation used
+            value: Result to store
+
+        Returns:
+            The stored value
+        """
+        with self._lock:
+            key = id(df)
+            if key not in self._results:
+                self._results[key] = {}
+                # Forget results once the DataFrame is gone, before its id can be reused
+                weakref.finalize(df, self._forget, key)
+            self._results[key][(operation, tuple(columns))] = value
+        return value
+
+    def get_or_compute(self, df: pd.DataFrame, operation: str, columns: Iterable[str],
+                       compute: Callable[[], Any]) -> Any:
+        """
+        Return a stored result, computing and storing it on a miss.
+
+        Args:
+            df (pd.DataFrame): DataFrame the result is computed from
+            operation (str): Name of the computation
+            columns (iterable): Columns the computation uses
+            compute (callable): Function producing the result
+
+        Returns:
+            The stored or freshly computed result
+        """
+        columns = tuple(columns)
+        missing = object()
+        value = self.get(df, operation, columns, missing)
+        if value is missing:
+            value = self.put(df, operation, columns, compute())
+        return value
+
+    def invalidate(self, df: pd.DataFrame):
+        """
+        Drop all results computed from a DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame whose results are dropped
+        """
+        self._forget(id(df))
+
+    def _forget(self, key: int):
+        """Remove the results stored under a DataFrame id."""
+        with self._lock:
+            self._results.pop(key, None)
+
+
+# Store shared by all analyzers and visualizers unless one is passed explicitly
+default_results_store = ResultsStore()
+
@@ -0,0 +1,231 @@
+import random
+from collections import Counter
+from itertools import islice
+from typing import Union, Dict, Any, List, Optional, Iterable
+
+from instrumentation import traced
+
+
+# Objects with more distinct keys than this have the rest merged into a '*' property,
+# which keeps the schema bounded for documents that use data values as keys
+DEFAULT_MAX_PROPERTIES = 1000
+
+WILDCARD_PROPERTY = '*'
+
+# Records observed together when inferring from a stream
+OBSERVE_BATCH_SIZE = 10000
+
+
+class SchemaNode:
+    """Merged type information for every value observed at one path of a JSON document.
+
+    Types are named as in get_json_structure: 'object', 'array' or the Python
+    type name of scalars ('str', 'int', 'float', 'bool', 'NoneType').
+    """
+
+    def __init__(self, max_properties: int = DEFAULT_MAX_PROPERTIES):
+        """
+        Initialize an empty node.
+
+        Args:
+            max_properties (int): Maximum distinct object keys tracked at this path
+        """
+        self.max_properties = max_properties
+        self.count = 0
+        self.types: Dict[str, int] = {}
+        self.properties: Dict[str, 'SchemaNode'] = {}
+        self.items: Optional['SchemaNode'] = None
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+
+    def observe(self, value: Any):
+        """
+        Merge one value into the node.
+
+        Args:
+            value: Decoded JSON value
+        """
+        self.observe_many([value])
+
+    def observe_many(self, values: List[Any]):
+        """
+        Merge a batch of values into the node.
+
+        Values are grouped by path, so each nested node is visited once per batch
+        rather than once per value.
+
+        Args:
+            values (list): Decoded JSON values
+        """
+        self.count += len(values)
+        objects = arrays = None
+        for value_type, count in Counter(map(type, values)).items():
+            if issubclass(value_type, dict):
+                type_name = 'object'
+                objects = [value for value in values if isinstance(value, dict)]
+            elif issubclass(value_type, list):
+                type_name = 'array'
+                arrays = [value for value in values if isinstance(value, list)]
+            else:
+                type_name = value_type.__name__
+            self.types[type_name] = self.types.get(type_name, 0) + count
+
+        if objects:
+            children: Dict[str, list] = {}
+            for obj in objects:
+                for key, child in obj.items():
+                    group = children.get(key)
+                    if group is None:
+                        group = children[key] = []
+                    group.append(child)
+            for key, group in children.items():
+                self._property(key).observe_many(group)
+
+        if arrays:
+            lengths = list(map(len, arrays))
+            self.min_length = min(lengths) if self.min_length is None else min(self.min_length, min(lengths))
+            self.max_length = max(lengths) if self.max_length is None else max(self.max_length, max(lengths))
+            items = [item for array in arrays for item in array]
+            if items:
+                if self.items is None:
+                    self.items = SchemaNode(self.max_properties)
+                self.items.observe_many(items)
+
+    def merge(self, other: 'SchemaNode'):
+        """
+        Merge another node describing the same path, e.g. from a parallel worker.
+
+        Args:
+            other (SchemaNode): Node to merge
+        """
+        self.count += other.count
+        for type_name, count in other.types.items():
+            self.types[type_name] = self.types.get(type_name, 0) + count
+        for key, child in other.properties.items():
+            self._property(key).merge(child)
+        if other.items is not None:
+            if self.items is None:
+                self.items = SchemaNode(self.max_properties)
+            self.items.merge(other.items)
+        if other.min_length is not None:
+            self.min_length = other.min_length if self.min_length is None else min(self.min_length, other.min_length)
+            self.max_length = other.max_length if self.max_length is None else max(self.max_length, other.max_length)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe the node.
+
+        Returns:
+            dict: 'type' (a name, or a list of names from most to least frequent when
+                mixed), 'types' (count per type), 'nullable' and 'count'; objects add
+                'properties' with a 'presence' fraction per key, arrays add
+                'min_length', 'max_length' and 'items'
+        """
+        non_null = sorted((name for name in self.types if name != 'NoneType'), key=lambda name: -self.types[name])
+        if not non_null:
+            non_null = ['NoneType']
+        structure = {
+            'type': non_null[0] if len(non_null) == 1 else non_null,
+            'types': dict(self.types),
+            'nullable': 'NoneType' in self.types,
+            'count': self.count
+        }
+        objects = self.types.get('object', 0)
+        if objects:
+            structure['properties'] = {}
+            for key, child in self.properties.items():
+                child_structure = child.to_dict()
+                child_structure['presence'] = child.count / objects if key != WILDCARD_PROPERTY else None
+                structure['properties'][key] = child_structure
+        if self.min_length is not None:
+            structure['min_length'] = self.min_length
+            structure['max_length'] = self.max_length
+            if self.items is not None:
+                structure['items'] = self.items.to_dict()
+        return structure
+
+    def _property(self, key: str) -> 'SchemaNode':
+        """Get the child node for an object key, creating it if needed."""
+        child = self.properties.get(key)
+        if child is None:
+            if len(self.properties) >= self.max_properties:
+                key = WILDCARD_PROPERTY
+                child = self.properties.get(key)
+            if child is None:
+                child = self.properties[key] = SchemaNode(self.max_properties)
+        return child
+
+
+def infer_schema_from_records(records: Iterable[Any], sample_size: Optional[int] = None,
+                              max_properties: int = DEFAULT_MAX_PROPERTIES,
+                              random_state: int = 0) -> Dict[str, Any]:
+    """
+    Infer the merged schema of a stream of records in one pass.
+
+    Args:
+        records (iterable): Decoded JSON records
+        sample_size (int, optional): Infer from a uniform reservoir sample of this
+            many records instead of every record
+        max_properties (int): Maximum distinct keys tracked per object path
+        random_state (int): Seed for the reservoir sample
+
+    Returns:
+        dict: {'type': 'array', 'size': number of records, 'sampled': records used,
+            'items': schema of the records}
+    """
+    root = SchemaNode(max_properties)
+    seen = 0
+    if sample_size is None:
+        records = iter(records)
+        while True:
+            batch = list(islice(records, OBSERVE_BATCH_SIZE))
+            if not batch:
+                break
+            root.observe_many(batch)
+            seen += len(batch)
+        used = seen
+    else:
+        # Algorithm R: every record ends up in the sample with equal probability
+        rng = random.Random(random_state)
+        reservoir = []
+        for record in records:
+            if seen < sample_size:
+                reservoir.append(record)
+            else:
+                slot = rng.randint(0, seen)
+                if slot < sample_size:
+                    reservoir[slot] = record
+            seen += 1
+        root.observe_many(reservoir)
+        used = len(reservoir)
+
+    structure = {'type': 'array', 'size': seen, 'sampled': used}
+    if seen:
+        structure['items'] = root.to_dict()
+    return structure
+
+
+@traced('json.infer_schema')
+def infer_json_schema(data: Union[Dict[str, Any], list], sample_size: Optional[int] = None,
+                      max_properties: int = DEFAULT_MAX_PROPERTIES) -> Dict[str, Any]:
+    """
+    Infer the schema of parsed JSON data from all of its records.
+
+    Unlike get_json_structure, which inspects only the first element of each
+    array, every element is merged, so heterogeneous records are reported with
+    all their fields, types, nullability and presence frequency.
+
+    Args:
+        data (dict or list): Parsed JSON data; a list is treated as records
+        sample_size (int, optional): Infer from a reservoir sample of records
+        max_properties (int): Maximum distinct keys tracked per object path
+
+    Returns:
+        dict: Inferred schema
+    """
+    if isinstance(data, list):
+        return infer_schema_from_records(data, sample_size, max_properties)
+    root = SchemaNode(max_properties)
+    root.observe(data)
+    return root.to_dict()
+
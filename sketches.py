@@ -0,0 +1,288 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Iterable, Optional
+
+
+# HyperLogLog precision: 2**14 registers give a relative standard error of about 0.8%
+DEFAULT_HLL_PRECISION = 14
+
+# Number of counters kept by the Space-Saving heavy-hitter summary
+DEFAULT_TOP_CAPACITY = 100
+
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """Hash non-null values to 64-bit integers."""
+    # Skip hash_array's factorization step: CategoricalSketch passes the distinct values
+    # of a chunk, and duplicates from HyperLogLog.update only repeat a register update
+    return pd.util.hash_array(values.to_numpy(), categorize=False)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of unsigned 64-bit integers."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    # frexp gives the binary exponent, which equals the bit length for exact integers
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (HyperLogLog with linear-counting correction)."""
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            precision (int): Number of index bits; the sketch uses 2**precision registers
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of the estimate."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def update(self, values: pd.Series):
+        """
+        Add values to the sketch; nulls are ignored.
+
+        Args:
+            values (pd.Series): Values to add
+        """
+        self.update_hashes(_hash_values(values.dropna()))
+
+    def update_hashes(self, hashes: np.ndarray):
+        """
+        Add pre-computed 64-bit hashes to the sketch.
+
+        Args:
+            hashes (np.ndarray): uint64 hashes
+        """
+        if len(hashes) == 0:
+            return
+        shift = np.uint64(64 - self.precision)
+        index = (hashes >> shift).astype(np.intp)
+        remainder = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64 - precision bits
+        rank = (64 - self.precision) - _bit_length(remainder) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: 'HyperLogLog'):
+        """
+        Merge another sketch of the same precision into this one.
+
+        Args:
+            other (HyperLogLog): Sketch to merge
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        """
+        Estimate the number of distinct values added.
+
+        Returns:
+            int: Estimated distinct count
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+class SpaceSaving:
+    """Mergeable heavy-hitter summary (Space-Saving).
+
+    Keeps at most `capacity` counters. Each reported count overestimates the true
+    count by at most its recorded error, and every error is at most
+    total_count / capacity.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TOP_CAPACITY):
+        """
+        Initialize an empty summary.
+
+        Args:
+            capacity (int): Maximum number of monitored values
+        """
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')
+        self.errors = pd.Series(dtype='int64')
+        self.total_count = 0
+        self._floor = 0  # upper bound on the count of any unmonitored value
+
+    @property
+    def max_error(self) -> int:
+        """Largest possible overestimate of any reported count."""
+        return int(self._floor)
+
+    def update(self, values: pd.Series):
+        """
+        Add values to the summary; nulls are ignored.
+
+        Args:
+            values (pd.Series): Values to add
+        """
+        self.update_counts(values.value_counts())
+
+    def update_counts(self, counts: pd.Series):
+        """
+        Add exact counts of a batch of values, e.g. a chunk's value_counts().
+
+        Args:
+            counts (pd.Series): Counts indexed by value
+        """
+        total = int(counts.sum())
+        floor = 0
+        if len(counts) > self.capacity:
+            # Exact counts truncated to the largest ones form a valid summary whose
+            # unmonitored values are bounded by the largest dropped count
+            counts = counts.nlargest(self.capacity + 1)
+            floor = int(counts.iloc[-1])
+            counts = counts.iloc[:-1]
+        self._combine(counts, pd.Series(0, index=counts.index, dtype='int64'), floor, total)
+
+    def merge(self, other: 'SpaceSaving'):
+        """
+        Merge another summary into this one.
+
+        Args:
+            other (SpaceSaving): Summary to merge
+        """
+        self._combine(other.counts, other.errors, other._floor, other.total_count)
+
+    def top(self, n: int = 5) -> Dict[Any, int]:
+        """
+        Get the most frequent values.
+
+        Args:
+            n (int): Number of values to return
+
+        Returns:
+            dict: Estimated counts of the n most frequent values
+        """
+        return self.counts.head(n).to_dict()
+
+    def _combine(self, counts: pd.Series, errors: pd.Series, floor: int, total: int):
+        """Merge counters, charging unmonitored values the other side's floor, and truncate."""
+        keys = self.counts.index.union(counts.index, sort=False)
+        merged_counts = self.counts.reindex(keys, fill_value=self._floor) + counts.reindex(keys, fill_value=floor)
+        merged_errors = self.errors.reindex(keys, fill_value=self._floor) + errors.reindex(keys, fill_value=floor)
+        self._floor += floor
+        if len(merged_counts) > self.capacity:
+            dropped_max = int(merged_counts.nlargest(self.capacity + 1).iloc[-1])
+            merged_counts = merged_counts.nlargest(self.capacity)
+            self._floor = max(self._floor, dropped_max)
+        self.counts = merged_counts.sort_values(ascending=False, kind='mergesort')
+        # reindex looks values up by label; [] would apply True/False labels as a mask
+        self.errors = merged_errors.reindex(self.counts.index)
+        self.total_count += total
+
+
+class CategoricalSketch:
+    """Chunked, approximate categorical summary built from per-column sketches.
+
+    Each chunk is reduced to one value_counts() pass per column; the distinct
+    values feed a HyperLogLog and the counts feed a Space-Saving summary. Memory
+    stays bounded by the chunk size and sketch sizes, not the column cardinality.
+    """
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION, top_capacity: int = DEFAULT_TOP_CAPACITY):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            precision (int): HyperLogLog precision for unique counts
+            top_capacity (int): Counters kept for top values
+        """
+        self.precision = precision
+        self.top_capacity = top_capacity
+        self.columns: List[str] = []
+        self._distinct: Dict[str, HyperLogLog] = {}
+        self._top: Dict[str, SpaceSaving] = {}
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], columns: Optional[List[str]] = None, **kwargs) -> 'CategoricalSketch':
+        """
+        Build a sketch by consuming an iterable of DataFrame chunks.
+
+        Args:
+            chunks (iterable): DataFrame chunks
+            columns (list, optional): Columns to summarize, all columns if omitted
+            **kwargs: Arguments passed to the constructor
+
+        Returns:
+            CategoricalSketch: Sketch of all chunks
+        """
+        sketch = cls(**kwargs)
+        for chunk in chunks:
+            sketch.update(chunk, columns)
+        return sketch
+
+    def update(self, chunk: pd.DataFrame, columns: Optional[List[str]] = None):
+        """
+        Add a chunk of rows.
+
+        Args:
+            chunk (pd.DataFrame): Next chunk of rows
+            columns (list, optional): Columns to summarize, all columns if omitted
+        """
+        for col in (chunk.columns if columns is None else columns):
+            if col not in chunk.columns:
+                continue
+            if col not in self._distinct:
+                self.columns.append(col)
+                self._distinct[col] = HyperLogLog(self.precision)
+                self._top[col] = SpaceSaving(self.top_capacity)
+            counts = chunk[col].value_counts()
+            # Categorical columns also report categories that are absent from the chunk
+            counts = counts[counts > 0]
+            self._distinct[col].update_hashes(_hash_values(pd.Series(counts.index)))
+            self._top[col].update_counts(counts)
+
+    def merge(self, other: 'CategoricalSketch'):
+        """
+        Merge another sketch, e.g. from a parallel worker.
+
+        Args:
+            other (CategoricalSketch): Sketch to merge
+        """
+        for col in other.columns:
+            if col not in self._distinct:
+                self.columns.append(col)
+                self._distinct[col] = HyperLogLog(self.precision)
+                self._top[col] = SpaceSaving(self.top_capacity)
+            self._distinct[col].merge(other._distinct[col])
+            self._top[col].merge(other._top[col])
+
+    def get_categorical_summary(self, top_n: int = 5) -> Dict[str, Any]:
+        """
+        Get summary for categorical columns with error bounds.
+
+        Args:
+            top_n (int): Number of top values per column
+
+        Returns:
+            dict: Per column 'unique_values' and 'top_values' (as in
+                DataAnalyzer.get_categorical_summary), plus 'unique_values_error'
+                (relative standard error) and 'top_values_error' (maximum overcount)
+        """
+        summary = {}
+        for col in self.columns:
+            distinct = self._distinct[col]
+            top = self._top[col]
+            summary[col] = {
+                'unique_values': distinct.estimate(),
+                'top_values': top.top(top_n),
+                'unique_values_error': distinct.relative_error,
+                'top_values_error': top.max_error
+            }
+        return summary
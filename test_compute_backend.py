@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compute_backend import ComputeBackend, DuckDBBackend, PandasBackend, DUCKDB_MIN_BYTES, choose_engine
+from csv_analyzer import CSVDataAnalyzer
+from data_loaders import load_tabular_file
+from json_utils import load_json_dataframe
+from results_store import ResultsStore
+
+FORMATS = ['parquet', 'csv', 'tsv', 'ndjson']
+
+
+def make_frame(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'x': rng.normal(size=n),
+        'count': rng.integers(-50, 50, n),
+        'y': rng.normal(size=n),
+        "q'uoted \"name\"": rng.choice(['a', 'b', 'c', 'd'], n, p=[0.4, 0.3, 0.2, 0.1]),
+        'flag': rng.random(n) > 0.5,
+        'constant': np.full(n, 3.0),
+    })
+    df['y'] = df['y'] + df['x']
+    # Missing values, NaN included, in numeric and text columns
+    df.loc[::7, 'x'] = np.nan
+    df.loc[::11, "q'uoted \"name\""] = None
+    return df
+
+
+def write(df, path, file_extension):
+    if file_extension == 'parquet':
+        df.to_parquet(path)
+    elif file_extension == 'ndjson':
+        df.to_json(path, orient='records', lines=True)
+    else:
+        df.to_csv(path, sep='\t' if file_extension == 'tsv' else ',', index=False)
+
+
+def load(path, file_extension):
+    if file_extension == 'ndjson':
+        return load_json_dataframe(str(path), lines=True)
+    return load_tabular_file(str(path), file_extension)
+
+
+@pytest.fixture(params=FORMATS)
+def backends(request, tmp_path):
+    pytest.importorskip('duckdb')
+    path = tmp_path / f"data.{request.param}"
+    write(make_frame(), path, request.param)
+    return DuckDBBackend(str(path)), PandasBackend(load(path, request.param), results_store=ResultsStore())
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        ComputeBackend()
+
+
+def test_parallel_columns_match_serial():
+    df = make_frame()
+    serial, parallel = PandasBackend(df, results_store=ResultsStore()), PandasBackend(df, n_jobs=3, results_store=ResultsStore())
+    numeric = serial.numeric_columns()
+    pd.testing.assert_frame_equal(parallel.describe(numeric), serial.describe(numeric))
+    pd.testing.assert_series_equal(parallel.missing_counts(), serial.missing_counts())
+    assert parallel.categorical_columns() == serial.categorical_columns()
+
+
+def test_duckdb_column_kinds_match_pandas(backends):
+    duckdb_backend, pandas_backend = backends
+    assert duckdb_backend.columns == pandas_backend.columns
+    assert duckdb_backend.row_count == pandas_backend.row_count
+    assert duckdb_backend.numeric_columns() == pandas_backend.numeric_columns()
+    assert duckdb_backend.categorical_columns() == pandas_backend.categorical_columns()
+
+
+def test_duckdb_describe_matches_pandas(backends):
+    duckdb_backend, pandas_backend = backends
+    numeric = pandas_backend.numeric_columns()
+    pd.testing.assert_frame_equal(duckdb_backend.describe(numeric), pandas_backend.describe(numeric).astype(float),
+                                  rtol=1e-9)
+
+
+def test_duckdb_missing_counts_match_pandas(backends):
+    duckdb_backend, pandas_backend = backends
+    pd.testing.assert_series_equal(duckdb_backend.missing_counts(), pandas_backend.missing_counts())
+
+
+def test_duckdb_value_counts_match_pandas(backends):
+    duckdb_backend, pandas_backend = backends
+    columns = ["q'uoted \"name\"", 'count']
+    expected = pandas_backend.value_counts(columns)
+    for col, counts in duckdb_backend.value_counts(columns).items():
+        # Ties may come in either order
+        assert counts.to_dict() == expected[col].to_dict()
+        assert counts.is_monotonic_decreasing
+
+
+def test_duckdb_corr_matches_pandas(backends):
+    duckdb_backend, pandas_backend = backends
+    numeric = pandas_backend.numeric_columns()
+    # The constant column has no correlation (NaN) in both
+    pd.testing.assert_frame_equal(duckdb_backend.corr(numeric), pandas_backend.corr(numeric), rtol=1e-9)
+
+
+@pytest.mark.parametrize('strategy', ['fixed', 'fd', 'quantile'])
+@pytest.mark.parametrize('column', ['x', 'count', 'constant'])
+def test_duckdb_histogram_matches_pandas(backends, column, strategy):
+    duckdb_backend, pandas_backend = backends
+    counts, edges = duckdb_backend.histogram(column, 20, strategy)
+    expected_counts, expected_edges = pandas_backend.histogram(column, 20, strategy)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_choose_engine_by_upload_size():
+    pytest.importorskip('duckdb')
+    # The file need not exist when its size is given
+    assert choose_engine('upload.csv', engine='auto', size=DUCKDB_MIN_BYTES) == 'duckdb'
+    assert choose_engine('upload.csv', engine='auto', size=DUCKDB_MIN_BYTES - 1) == 'pandas'
+    assert choose_engine('upload.xlsx', engine='auto', size=DUCKDB_MIN_BYTES) == 'pandas'
+    with pytest.raises(ValueError):
+        choose_engine('upload.xlsx', engine='duckdb')
+
+
+def test_csv_analyzer_rejects_pandas_options_for_duckdb(tmp_path):
+    pytest.importorskip('duckdb')
+    path = tmp_path / "data.csv"
+    write(make_frame(), path, 'csv')
+    with pytest.raises(ValueError, match="n_jobs"):
+        CSVDataAnalyzer.from_csv(str(path), engine='duckdb', n_jobs=4)
+    analyzer = CSVDataAnalyzer.from_csv(str(path), engine='duckdb')
+    expected = CSVDataAnalyzer.from_csv(str(path), engine='pandas', n_jobs=2)
+    pd.testing.assert_frame_equal(analyzer.get_missing_data_info(), expected.get_missing_data_info())
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+from data_cache import DataCache, estimate_size
+
+rng = np.random.default_rng(0)
+FRAME = pd.DataFrame({'a': rng.normal(size=1000), 'b': rng.normal(size=1000),
+                      'label': rng.choice(['x', 'y', 'z'], 1000)})
+
+
+def test_make_key_is_stable_and_option_sensitive():
+    key = DataCache.make_key(b'{"a": 1}', file_extension='json', engine='pandas')
+    assert key == DataCache.make_key(b'{"a": 1}', engine='pandas', file_extension='json')
+    assert key != DataCache.make_key(b'{"a": 2}', file_extension='json', engine='pandas')
+    assert key != DataCache.make_key(b'{"a": 1}', file_extension='json', engine='duckdb')
+    assert key != DataCache.make_key(b'{"a": 1}', file_extension='json')
+
+
+def test_lru_eviction():
+    cache = DataCache(max_bytes=300)
+    cache.put('a', 'value', 'A', size=100)
+    cache.put('b', 'value', 'B', size=100)
+    cache.put('c', 'value', 'C', size=100)
+    # Using 'a' makes 'b' the least recently used entry
+    assert cache.get('a', 'value') == 'A'
+    cache.put('d', 'value', 'D', size=100)
+    assert 'b' not in cache
+    assert all(key in cache for key in ['a', 'c', 'd'])
+    assert cache.total_bytes == 300
+
+
+def test_entry_sizes_add_up():
+    cache = DataCache(max_bytes=250)
+    cache.put('a', 'first', 1, size=100)
+    cache.put('b', 'first', 2, size=100)
+    # The second value takes 'a' over budget together with 'b', so 'b' is evicted
+    cache.put('a', 'second', 3, size=100)
+    assert 'b' not in cache
+    assert cache.get('a', 'first') == 1 and cache.get('a', 'second') == 3
+    assert cache.total_bytes == 200
+
+
+def test_get_or_compute_hit_path():
+    cache = DataCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return FRAME.describe()
+
+    first = cache.get_or_compute('key', 'summary', compute)
+    second = cache.get_or_compute('key', 'summary', compute)
+    assert second is first
+    assert len(calls) == 1
+    assert cache.get('key', 'missing', 'default') == 'default'
+
+
+def test_analyzer_size_counts_frame_and_reports():
+    analyzer = DataAnalyzer(FRAME)
+    frame_size = estimate_size(FRAME)
+    assert estimate_size(analyzer) >= frame_size
+    analyzer.get_correlation_matrix()
+    analyzer.get_categorical_summary()
+    assert estimate_size(analyzer) >= frame_size + estimate_size(analyzer.get_correlation_matrix())
+
+
+def test_cached_analyzer_is_evicted_by_frame_size():
+    cache = DataCache(max_bytes=estimate_size(FRAME) // 2)
+    cache.put('key', 'analyzer', DataAnalyzer(FRAME))
+    assert 'key' not in cache
+
+
+def test_nested_results_are_measured():
+    counts = FRAME['label'].value_counts()
+    assert estimate_size({'label': {'counts': counts}}) >= estimate_size(counts)
+    assert estimate_size([FRAME, FRAME]) >= 2 * estimate_size(FRAME)
@@ -0,0 +1,53 @@
+import io
+
+import pandas as pd
+import pytest
+
+import data_loaders
+from data_loaders import load_tabular_bytes, report_progress
+
+BACKENDS = [None, "numpy_nullable", "pyarrow"]
+
+
+def read_single(content: bytes, dtype_backend, sep=','):
+    """The reference: one read_csv inferring every column from all of its values."""
+    options = {'dtype_backend': dtype_backend} if dtype_backend else {}
+    if dtype_backend == "pyarrow":
+        options['engine'] = "pyarrow"
+    else:
+        options['low_memory'] = False
+    return pd.read_csv(io.BytesIO(content), sep=sep, **options)
+
+
+def read_blocks(content: bytes, dtype_backend, monkeypatch, file_extension="csv"):
+    """Read through the parallel block reader, with blocks small enough to get many."""
+    monkeypatch.setattr(data_loaders, 'CSV_BLOCK_SIZE', 4096)
+    progress = []
+    with report_progress(lambda *args: progress.append(args)):
+        df = load_tabular_bytes(content, file_extension, dtype_backend=dtype_backend)
+    assert len(progress) > 1, "the block reader was not used"
+    return df
+
+
+@pytest.mark.parametrize('dtype_backend', BACKENDS)
+def test_blocks_match_single_read(dtype_backend, monkeypatch):
+    rows = [f"{i},{i * 0.5},name {i % 7},{'' if i % 5 else 'x'},{i % 2 == 0}" for i in range(3000)]
+    content = ("i,f,s,sparse,b\n" + "\n".join(rows) + "\n").encode()
+    pd.testing.assert_frame_equal(read_blocks(content, dtype_backend, monkeypatch), read_single(content, dtype_backend))
+
+
+@pytest.mark.parametrize('dtype_backend', BACKENDS)
+def test_column_numeric_early_and_text_late(dtype_backend, monkeypatch):
+    rows = [f"{i},{i}" for i in range(3000)] + ["abc,3000"]
+    content = ("id,v\n" + "\n".join(rows) + "\n").encode()
+    df = read_blocks(content, dtype_backend, monkeypatch)
+    pd.testing.assert_frame_equal(df, read_single(content, dtype_backend))
+    assert df['id'].map(type).eq(str).all()
+
+
+@pytest.mark.parametrize('dtype_backend', BACKENDS)
+def test_column_empty_in_early_blocks(dtype_backend, monkeypatch):
+    rows = ["1\t" for _ in range(2000)] + ["2\tlate" for _ in range(1000)]
+    content = ("n\tnote\n" + "\n".join(rows) + "\n").encode()
+    df = read_blocks(content, dtype_backend, monkeypatch, file_extension="tsv")
+    pd.testing.assert_frame_equal(df, read_single(content, dtype_backend, sep='\t'))
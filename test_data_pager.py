@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_pager import filter_mask, get_page, page_count, select_rows, sort_order
+
+BACKENDS = [None, "numpy_nullable", "pyarrow"]
+
+
+def make_frame(dtype_backend=None):
+    df = pd.DataFrame({
+        'n': [3, None, 1, 3, 2, None, 1],
+        'name': ['Bob', 'alice', None, 'ALICE', 'carol', 'bob', 'Alice'],
+        'score': [1.5, 2.0, 1.5, None, 10.0, 2.0, 0.5],
+    }, index=[10, 11, 12, 13, 14, 15, 16])
+    return df.convert_dtypes(dtype_backend=dtype_backend) if dtype_backend else df
+
+
+@pytest.mark.parametrize('dtype_backend', BACKENDS)
+@pytest.mark.parametrize('column', ['n', 'name', 'score'])
+@pytest.mark.parametrize('ascending', [True, False])
+def test_sort_order_matches_sort_values(dtype_backend, column, ascending):
+    df = make_frame(dtype_backend)
+    expected = df.sort_values(column, ascending=ascending, kind='stable', na_position='last')
+    pd.testing.assert_frame_equal(df.iloc[sort_order(df, column, ascending)], expected)
+
+
+def test_sort_order_errors():
+    with pytest.raises(ValueError, match="not found"):
+        sort_order(make_frame(), 'missing')
+    with pytest.raises(ValueError, match="cannot be sorted"):
+        sort_order(pd.DataFrame({'mixed': [1, 'a', 2.5]}), 'mixed')
+
+
+@pytest.mark.parametrize('dtype_backend', BACKENDS)
+def test_filter_mask_ignores_case_and_missing_values(dtype_backend):
+    df = make_frame(dtype_backend)
+    np.testing.assert_array_equal(filter_mask(df, 'alice', 'name'), [False, True, False, True, False, False, True])
+    # Numbers are matched by their text, in every column when none is given
+    np.testing.assert_array_equal(filter_mask(df, '10'), df['score'].eq(10).fillna(False).to_numpy(dtype=bool))
+    assert not filter_mask(df, 'nan').any() and not filter_mask(df, 'none').any()
+    with pytest.raises(ValueError, match="not found"):
+        filter_mask(df, 'x', 'missing')
+
+
+def test_filter_mask_nested_values():
+    df = pd.DataFrame({'tags': [['a', 'b'], {'k': 'v'}, None]})
+    np.testing.assert_array_equal(filter_mask(df, "'k'"), [False, True, False])
+
+
+def test_select_rows_filters_sorted_order():
+    df = make_frame()
+    order = sort_order(df, 'score')
+    mask = filter_mask(df, 'b', 'name')
+    expected = df.sort_values('score', kind='stable', na_position='last')
+    expected = expected[expected['name'].str.contains('b', case=False, na=False)]
+    pd.testing.assert_frame_equal(df.iloc[select_rows(len(df), order, mask)], expected)
+    assert select_rows(len(df)) is None
+    np.testing.assert_array_equal(select_rows(len(df), mask=mask), np.flatnonzero(mask))
+    np.testing.assert_array_equal(select_rows(len(df), order=order), order)
+
+
+@pytest.mark.parametrize('page_size', [1, 3, 7, 100])
+def test_pages_cover_every_row_once(page_size):
+    df = make_frame()
+    rows = sort_order(df, 'name')
+    for positions in [None, rows, rows[:0]]:
+        expected = df if positions is None else df.iloc[positions]
+        pages = page_count(len(expected), page_size)
+        parts = [get_page(df, page, page_size, positions) for page in range(pages)]
+        assert all(len(part) <= page_size for part in parts)
+        pd.testing.assert_frame_equal(pd.concat(parts), expected)
+        assert get_page(df, pages, page_size, positions).empty
+
+
+def test_page_count():
+    assert [page_count(n, 50) for n in [0, 1, 50, 51, 100]] == [1, 1, 1, 2, 2]
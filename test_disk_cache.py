@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import disk_cache
+from disk_cache import DiskCache, FRAME_SUFFIX, VALUE_SUFFIX
+
+FRAME = pd.DataFrame({'a': np.arange(100), 'b': np.linspace(0, 1, 100), 'label': [f"row {i}" for i in range(100)]})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path / 'cache'))
+
+
+def stored_files(cache, key):
+    return sorted(os.listdir(os.path.join(cache.directory, key)))
+
+
+def test_frame_round_trip_uses_feather(cache):
+    pytest.importorskip('pyarrow')
+    assert cache.put('key', 'frame', FRAME)
+    assert stored_files(cache, 'key') == ['frame' + FRAME_SUFFIX]
+    pd.testing.assert_frame_equal(cache.get('key', 'frame'), FRAME)
+    dataset = cache.open_dataset('key', 'frame')
+    assert dataset.columns == list(FRAME.columns)
+    pd.testing.assert_frame_equal(dataset.fetch(['b']), FRAME[['b']])
+
+
+def test_object_columns_and_values_are_pickled(cache):
+    frame = pd.DataFrame({'nested': [[1, 2], {'a': 1}, None]})
+    assert cache.put('key', 'frame', frame)
+    assert cache.put('key', 'structure', {'type': 'array', 'length': 3})
+    assert stored_files(cache, 'key') == ['frame' + VALUE_SUFFIX, 'structure' + VALUE_SUFFIX]
+    pd.testing.assert_frame_equal(cache.get('key', 'frame'), frame)
+    assert cache.get('key', 'structure') == {'type': 'array', 'length': 3}
+    assert cache.open_dataset('key', 'frame').fetch(['nested'])['nested'].tolist() == frame['nested'].tolist()
+
+
+def test_missing_values(cache):
+    assert cache.get('key', 'frame', 'default') == 'default'
+    assert not cache.contains('key', 'frame')
+    assert cache.open_dataset('key', 'frame') is None
+
+
+def test_failed_write_leaves_no_partial_value(cache, monkeypatch):
+    assert cache.put('key', 'value', 'old')
+
+    def failing_dump(value, f, protocol=None):
+        f.write(b'partial')
+        raise disk_cache.pickle.PicklingError('cannot pickle')
+
+    monkeypatch.setattr(disk_cache.pickle, 'dump', failing_dump)
+    assert not cache.put('key', 'value', 'new')
+    # The previous value is intact and no temporary file is left behind
+    assert stored_files(cache, 'key') == ['value' + VALUE_SUFFIX]
+    monkeypatch.undo()
+    assert cache.get('key', 'value') == 'old'
+
+
+def test_replacing_a_value_changes_its_format(cache):
+    pytest.importorskip('pyarrow')
+    cache.put('key', 'frame', pd.DataFrame({'nested': [[1], [2]]}))
+    cache.put('key', 'frame', FRAME)
+    assert stored_files(cache, 'key') == ['frame' + FRAME_SUFFIX]
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache'), max_bytes=10 ** 9)
+    payload = os.urandom(1000)
+    for index, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, 'value', payload)
+        os.utime(os.path.join(cache.directory, key), (index, index))
+    # Reading 'a' makes it the most recently used entry
+    assert cache.get('a', 'value') == payload
+    cache.max_bytes = 2 * cache.total_bytes // 3
+    cache.put('c', 'value', payload)
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    assert cache.total_bytes <= cache.max_bytes
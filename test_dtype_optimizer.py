@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dtype_optimizer import DtypeOptimizer, optimize_dtypes
+
+FRAME = pd.DataFrame({
+    'small': np.arange(100, dtype=np.int64),
+    'negative': np.arange(-50, 50, dtype=np.int64),
+    'large': np.arange(100, dtype=np.int64) * 100000,
+    'unsigned': np.arange(100, dtype=np.uint64),
+    'halves': np.arange(100) / 2,
+    'halves_missing': [np.nan if i % 10 == 0 else i / 4 for i in range(100)],
+    'precise': np.arange(100) / 3,
+    'status': ['open', 'closed', None, 'pending'] * 25,
+    'names': [f'name {i}' for i in range(100)],
+    'mixed': [1, 'a'] * 50,
+})
+
+
+def test_lossless_round_trip():
+    optimized, report = optimize_dtypes(FRAME)
+    for col in FRAME.columns:
+        restored = optimized[col].astype(FRAME[col].dtype)
+        pd.testing.assert_series_equal(restored, FRAME[col], check_dtype=False)
+    assert report['memory_after'] < report['memory_before']
+
+
+def test_chosen_dtypes():
+    optimized, report = optimize_dtypes(FRAME)
+    assert optimized['small'].dtype == np.int8
+    assert optimized['negative'].dtype == np.int8
+    assert optimized['large'].dtype == np.int32
+    assert optimized['unsigned'].dtype == np.uint8
+    assert optimized['halves'].dtype == np.float32
+    assert optimized['halves_missing'].dtype == np.float32
+    # 1/3 is not exact in float32
+    assert optimized['precise'].dtype == np.float64
+    assert isinstance(optimized['status'].dtype, pd.CategoricalDtype)
+    assert optimized['status'].isna().sum() == 25
+    assert not isinstance(optimized['names'].dtype, pd.CategoricalDtype)
+    assert optimized['mixed'].dtype == object
+    assert {'small', 'negative', 'large', 'unsigned', 'halves', 'halves_missing', 'status'} <= set(report['changes'])
+    assert 'precise' not in report['changes'] and 'mixed' not in report['changes']
+    assert report['changes']['small'] == ('int64', 'int8')
+
+
+def test_options_disable_conversions():
+    optimized, report = optimize_dtypes(FRAME, downcast=False, strings=False)
+    assert report['changes'] == {}
+    assert optimized is FRAME
+    optimized, _ = optimize_dtypes(FRAME, category_threshold=0.01)
+    assert not isinstance(optimized['status'].dtype, pd.CategoricalDtype)
+
+
+def test_arrow_columns_stay_arrow_backed():
+    pa = pytest.importorskip('pyarrow')
+    frame = pd.DataFrame({
+        'ints': pd.array(range(100), dtype=pd.ArrowDtype(pa.int64())),
+        'floats': pd.array([i / 2 for i in range(99)] + [None], dtype=pd.ArrowDtype(pa.float64())),
+        'precise': pd.array([i / 3 for i in range(100)], dtype=pd.ArrowDtype(pa.float64())),
+    })
+    optimized, _ = optimize_dtypes(frame)
+    assert optimized['ints'].dtype == pd.ArrowDtype(pa.int8())
+    assert optimized['floats'].dtype == pd.ArrowDtype(pa.float32())
+    assert optimized['precise'].dtype == pd.ArrowDtype(pa.float64())
+    for col in frame.columns:
+        pd.testing.assert_series_equal(optimized[col].astype(frame[col].dtype), frame[col])
+
+
+def test_optimizer_accumulates_report():
+    optimizer = DtypeOptimizer()
+    first = optimizer(FRAME[['small', 'halves']])
+    second = optimizer(FRAME[['status']])
+    report = optimizer.get_report()
+    assert set(report['changes']) == {'small', 'halves', 'status'}
+    assert report['memory_after'] == int(first.memory_usage(deep=True).sum() + second.memory_usage(deep=True).sum())
+    assert report['memory_before'] == int(FRAME[['small', 'halves']].memory_usage(deep=True).sum()
+                                          + FRAME[['status']].memory_usage(deep=True).sum())
@@ -0,0 +1,87 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('openpyxl')
+
+import data_loaders
+import excel_loader
+from data_loaders import lazy_excel_bytes
+from excel_loader import (combine_sheets, list_excel_columns, list_excel_sheets, read_excel_sheet,
+                          read_excel_sheets, SHEET_COLUMN)
+
+SHEETS = {
+    'numbers': pd.DataFrame({'id': range(300), 'value': np.linspace(0, 1, 300),
+                             'gaps': [None if i % 7 == 0 else i * 0.5 for i in range(300)]}),
+    'mixed': pd.DataFrame({'id': range(40), 'label': [f"item {i}" if i % 3 else None for i in range(40)],
+                           'mixed': [i if i % 2 else str(i) for i in range(40)],
+                           'flag': [i % 2 == 0 for i in range(40)],
+                           'when': pd.date_range('2024-01-01', periods=40, freq='h')}),
+    'extra': pd.DataFrame({'value': [1.5, 2.5], 'only_here': ['a', 'b']}),
+}
+
+
+@pytest.fixture(scope='module')
+def workbook():
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for name, df in SHEETS.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return buffer.getvalue()
+
+
+def read_reference(content, sheet_name, **kwargs):
+    return pd.read_excel(io.BytesIO(content), sheet_name=sheet_name, **kwargs)
+
+
+def test_list_sheets_and_columns(workbook):
+    assert list_excel_sheets(workbook) == list(SHEETS)
+    assert list_excel_columns(workbook, 'xlsx', ['numbers']) == ['id', 'value', 'gaps']
+    assert list_excel_columns(workbook, 'xlsx', ['numbers', 'extra']) == [SHEET_COLUMN, 'id', 'value', 'gaps', 'only_here']
+
+
+@pytest.mark.parametrize('name', list(SHEETS))
+def test_sheet_matches_read_excel(workbook, name):
+    pd.testing.assert_frame_equal(read_excel_sheet(workbook, 'xlsx', name), read_reference(workbook, name))
+    pd.testing.assert_frame_equal(read_excel_sheet(workbook, 'xlsx', name, nrows=5), read_reference(workbook, name, nrows=5))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parallel_sheets_match_read_excel(workbook, workers):
+    frames = read_excel_sheets(workbook, 'xlsx', list(SHEETS), workers=workers)
+    assert list(frames) == list(SHEETS)
+    for name, df in frames.items():
+        pd.testing.assert_frame_equal(df, read_reference(workbook, name))
+
+
+def test_parallel_sheets_read_only_requested_columns(workbook):
+    frames = read_excel_sheets(workbook, 'xlsx', list(SHEETS), columns=['value', 'label'], workers=2)
+    for name, df in frames.items():
+        expected = read_reference(workbook, name)
+        pd.testing.assert_frame_equal(df, expected[[col for col in ['value', 'label'] if col in expected.columns]])
+
+
+def test_lazy_dataset_over_sheets_matches_read_excel(workbook, monkeypatch):
+    reads = []
+    original = data_loaders.read_excel_sheets
+
+    def recording(*args, **kwargs):
+        reads.append(kwargs['columns'])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(data_loaders, 'read_excel_sheets', recording)
+    dataset = lazy_excel_bytes(workbook, 'xlsx', ['numbers', 'mixed'])
+    expected = combine_sheets({name: read_reference(workbook, name) for name in ['numbers', 'mixed']})
+    assert dataset.columns == [SHEET_COLUMN] + [col for col in expected.columns if col != SHEET_COLUMN]
+    dataset.fetch(['label', SHEET_COLUMN])
+    dataset.load_all()
+    # Each fetch reads its own columns from the workbook; nothing else is kept
+    assert reads == [['label'], ['id', 'value', 'gaps', 'mixed', 'flag', 'when']]
+    pd.testing.assert_frame_equal(dataset.frame, expected[dataset.columns])
+
+
+def test_missing_sheet(workbook):
+    with pytest.raises(ValueError, match="not found"):
+        read_excel_sheet(workbook, 'xlsx', 'absent')
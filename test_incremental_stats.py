@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analyzer import DataAnalyzer
+from incremental_stats import QuantileSummary, StatsAccumulator
+
+
+def chunked(df, size):
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+def make_frame(n=1200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'x': rng.normal(size=n),
+        'count': rng.integers(0, 100, n),
+        'text': rng.choice(['a', 'b', None], n),
+    })
+    df['y'] = 2 * df['x'] + rng.normal(scale=0.1, size=n)
+    df.loc[::5, 'x'] = np.nan
+    df.loc[400:799, 'y'] = np.nan
+    return df
+
+
+def assert_matches_pandas(accumulator, df):
+    analyzer = DataAnalyzer(df)
+    pd.testing.assert_frame_equal(accumulator.get_summary_statistics(), analyzer.get_summary_statistics(),
+                                  rtol=1e-9, check_dtype=False)
+    pd.testing.assert_frame_equal(accumulator.get_missing_data_info(), analyzer.get_missing_data_info())
+    pd.testing.assert_frame_equal(accumulator.get_correlation_matrix(), analyzer.get_correlation_matrix(), rtol=1e-9)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 500, 5000])
+def test_chunks_match_pandas(chunk_size):
+    df = make_frame()
+    assert_matches_pandas(StatsAccumulator.from_chunks(chunked(df, chunk_size)), df)
+
+
+def test_merged_accumulators_match_pandas():
+    df = make_frame()
+    parts = [StatsAccumulator.from_chunks(chunked(part, 120)) for part in chunked(df, 500)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert_matches_pandas(merged, df)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 500])
+def test_large_offset_keeps_precision(chunk_size):
+    rng = np.random.default_rng(3)
+    noise = rng.normal(size=1200)
+    df = pd.DataFrame({'x': rng.normal(size=1200) + noise / 10, 'offset': 1e9 + noise})
+    accumulator = StatsAccumulator.from_chunks(chunked(df, chunk_size))
+    # Subtracting the offset is exact, so the centered values give the reference
+    centered = df.assign(offset=df['offset'] - 1e9)
+    stats = accumulator.get_summary_statistics()['offset']
+    assert stats['std'] == pytest.approx(centered['offset'].std(), rel=1e-7)
+    assert stats['mean'] - 1e9 == pytest.approx(centered['offset'].mean(), abs=1e-5)
+    assert accumulator.get_correlation_matrix().loc['x', 'offset'] == pytest.approx(centered.corr().loc['x', 'offset'], rel=1e-5)
+
+
+def test_columns_missing_from_some_chunks():
+    chunks = [pd.DataFrame({'a': [1.0, 2.0, np.nan], 'b': [1, 2, 3]}),
+              pd.DataFrame({'b': [4, 5]}),
+              pd.DataFrame({'c': [0.5, 1.5], 'a': [7.0, 3.0], 'b': [6, 9]})]
+    assert_matches_pandas(StatsAccumulator.from_chunks(chunks), pd.concat(chunks, ignore_index=True))
+
+
+def test_all_missing_chunk_and_constant_column():
+    chunks = [pd.DataFrame({'a': [np.nan, np.nan], 'k': [2.0, 2.0]}),
+              pd.DataFrame({'a': [1.0, 4.0, 2.0], 'k': [2.0, 2.0, 2.0]})]
+    # The constant column has no correlation (NaN) in both
+    assert_matches_pandas(StatsAccumulator.from_chunks(chunks), pd.concat(chunks, ignore_index=True))
+
+
+def test_column_turning_to_text_is_not_numeric():
+    chunks = [pd.DataFrame({'a': [1, 2], 'v': [1.0, 2.0]}), pd.DataFrame({'a': ['x', None], 'v': [3.0, 5.0]})]
+    accumulator = StatsAccumulator.from_chunks(chunks)
+    assert accumulator.numeric_columns == ['v']
+    assert_matches_pandas(accumulator, pd.concat(chunks, ignore_index=True))
+
+
+def test_quantiles_within_rank_error_after_compaction():
+    values = np.random.default_rng(2).exponential(size=100000)
+    summary = QuantileSummary(capacity=1000)
+    for chunk in np.array_split(values, 37):
+        summary.update(chunk)
+    assert not summary.exact
+    for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+        rank = (values < summary.quantile(q)).mean()
+        assert abs(rank - q) <= 2 / summary.capacity
+
+
+@pytest.mark.parametrize('chunk_size', [7, 500, 5000])
+def test_analyzer_from_chunks_matches_in_memory_analyzer(chunk_size):
+    df = make_frame()
+    chunked_analyzer = DataAnalyzer.from_chunks(chunked(df, chunk_size))
+    analyzer = DataAnalyzer(df)
+    pd.testing.assert_frame_equal(chunked_analyzer.get_summary_statistics(), analyzer.get_summary_statistics(),
+                                  rtol=1e-9, check_dtype=False)
+    pd.testing.assert_frame_equal(chunked_analyzer.get_missing_data_info(), analyzer.get_missing_data_info())
+    pd.testing.assert_frame_equal(chunked_analyzer.get_correlation_matrix(), analyzer.get_correlation_matrix(), rtol=1e-9)
+    info, expected = chunked_analyzer.get_basic_info(), analyzer.get_basic_info()
+    for key in ['shape', 'columns', 'numeric_columns', 'categorical_columns']:
+        assert info[key] == expected[key]
+    assert chunked_analyzer.get_column_types() == analyzer.get_column_types()
+    # Few distinct values: the sketches are exact
+    summary = chunked_analyzer.get_categorical_summary()['text']
+    assert summary['top_values'] == analyzer.get_categorical_summary()['text']['top_values']
+    assert summary['top_values_error'] == 0
+    pd.testing.assert_frame_equal(chunked_analyzer.backend.head(3), df.head(3).reset_index(drop=True))
+
+
+def test_analyzer_from_chunks_keeps_no_rows():
+    analyzer = DataAnalyzer.from_chunks(chunked(make_frame(), 100))
+    with pytest.raises(ValueError):
+        analyzer.df
+    with pytest.raises(ValueError):
+        analyzer.get_value_counts(['text'])
+    with pytest.raises(ValueError, match="No rows"):
+        DataAnalyzer.from_chunks([])
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from json_flatten import flatten_records, flattened_columns
+from schema_inference import infer_json_schema
+
+CASES = {
+    'object then scalar': [{'a': {'b': {'c': 1}}}, {'a': {'b': 5}}],
+    'scalar then object': [{'a': {'b': 5}}, {'a': {'b': {'c': 1}}}],
+    'nested before scalars': [{'n': {'x': 1, 'k': {'z': 1}, 'y': 2}, 'a': 1, 'm': {'q': 1}, 'b': 2}],
+    'keys appearing late': [{'a': 1, 'n': {'x': 1}}, {'b': 2, 'n': {'y': 'text'}}, {'c': None}],
+    'object and scalar at top level': [{'a': {'x': 1}, 'b': 1}, {'a': 3}],
+    'lists': [{'id': 1, 'tags': ['a', 'b'], 'items': [{'k': 1}]}, {'id': 2, 'tags': []}, {'id': 3}],
+    'missing keys and nulls': [{'a': 1, 'b': None}, {'b': 2.5}, {'a': None, 'c': {'d': None}}, {}],
+    'mixed scalar types': [{'v': 1}, {'v': 'one'}, {'v': 1.5}, {'v': True}],
+    'empty objects': [{'a': {}, 'b': 1}, {'a': {'c': 2}}],
+    'integers with gaps': [{'i': 1, 'f': 1.0}, {'f': 2}, {'i': 3}],
+}
+
+
+@pytest.mark.parametrize('name', list(CASES))
+def test_matches_json_normalize(name):
+    records = CASES[name]
+    pd.testing.assert_frame_equal(flatten_records(records), pd.json_normalize(records))
+
+
+@pytest.mark.parametrize('max_level', [0, 1])
+def test_max_level_matches_json_normalize(max_level):
+    records = [{'a': 1, 'n': {'x': {'y': 1}, 'z': 2}, 'c': 3}, {'n': {'w': 4}, 'd': {'e': {'f': 5}}}]
+    pd.testing.assert_frame_equal(flatten_records(records, max_level=max_level),
+                                  pd.json_normalize(records, max_level=max_level))
+
+
+@pytest.mark.parametrize('name', list(CASES))
+def test_flattened_columns_list_the_output_columns(name):
+    records = CASES[name]
+    columns = flattened_columns(infer_json_schema(records), records=records)
+    assert columns == list(flatten_records(records).columns)
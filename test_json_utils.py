@@ -0,0 +1,70 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from json_flatten import flatten_records
+from json_utils import iter_json_records, load_json_dataframe
+
+BACKENDS = [None, "numpy_nullable", "pyarrow"]
+
+
+class CountingStream(io.StringIO):
+    """Text stream counting the reads made from it."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+RECORDS = [{"id": i, "name": f"name {i}", "tags": ["a", "b"][:i % 3], "nested": {"x": i * 1.5, "flag": i % 2 == 0}}
+           for i in range(2000)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 4096])
+def test_records_cut_by_refills(chunk_size):
+    text = json.dumps(RECORDS + [None, 3, "text", -1.5e3, True, {"u": "café \\\"q\\\""}])
+    assert list(iter_json_records(io.StringIO(text), chunk_size=chunk_size)) == json.loads(text)
+
+
+@pytest.mark.parametrize('malformed', ['{"id": x}', '{"id": 1 "b": 2}', '{"id": "abc}', '{"id": tru}'])
+def test_malformed_record_mid_stream_raises_without_reading_on(malformed):
+    records = [json.dumps(record) for record in RECORDS]
+    stream = CountingStream("[" + ",".join(records[:10] + [malformed] + records * 20) + "]")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(stream, chunk_size=4096))
+    # The error is in the first chunk; nothing after it is read
+    assert stream.reads <= 2
+
+
+def test_truncated_document_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(io.StringIO(json.dumps(RECORDS)[:-30]), chunk_size=64))
+
+
+@pytest.mark.parametrize('dtype_backend', BACKENDS)
+def test_key_type_changing_across_batches(dtype_backend):
+    records = ([{"id": i, "value": i, "nested": {"x": i}} for i in range(250)]
+               + [{"id": "abc", "value": 2.5, "late": True, "nested": {"x": None, "y": "q"}}]
+               + [{"id": i} for i in range(100)])
+    content = json.dumps(records).encode()
+    df = load_json_dataframe(content, batch_size=100, dtype_backend=dtype_backend)
+    pd.testing.assert_frame_equal(df, flatten_records(records, dtype_backend=dtype_backend))
+    assert df['id'].map(type).isin([int, str]).all()
+
+
+@pytest.mark.parametrize('dtype_backend', BACKENDS)
+def test_ndjson_batches_match_single_flatten(dtype_backend):
+    content = "\n".join(json.dumps(record) for record in RECORDS).encode()
+    df = load_json_dataframe(content, lines=True, batch_size=300, dtype_backend=dtype_backend)
+    pd.testing.assert_frame_equal(df, flatten_records(RECORDS, dtype_backend=dtype_backend))
+
+
+def test_memory_budget():
+    with pytest.raises(ValueError, match="memory budget"):
+        load_json_dataframe(json.dumps(RECORDS).encode(), batch_size=100, memory_budget=10000)
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from lazy_dataset import LazyDataset
+
+SOURCE = pd.DataFrame({name: range(i, i + 5) for i, name in enumerate(['a', 'b', 'c', 'd', 'e'])})
+
+
+def make_dataset(reads=None, **kwargs):
+    def load_columns(columns):
+        if reads is not None:
+            reads.append(list(columns))
+        return SOURCE[columns].copy()
+    return LazyDataset(load_columns, list(SOURCE.columns), **kwargs)
+
+
+@pytest.mark.parametrize('fetches', [[['e', 'a'], ['c'], ['d', 'b']],
+                                     [['d'], ['b'], ['e'], ['a'], ['c']],
+                                     [['c'], ['a', 'b', 'c', 'd', 'e']]])
+def test_fetched_columns_in_source_order(fetches):
+    dataset = make_dataset()
+    frame = dataset.fetch(fetches[0])
+    for columns in fetches[1:]:
+        dataset.fetch(columns)
+        assert dataset.loaded_columns == [col for col in SOURCE.columns if col in dataset.loaded_columns]
+    # The frame grows in place
+    assert dataset.frame is frame
+    pd.testing.assert_frame_equal(dataset.load_all(), SOURCE)
+
+
+def test_fetch_reads_each_column_once():
+    reads = []
+    dataset = make_dataset(reads, initial_columns=['b'])
+    dataset.fetch(['d', 'b', None, 'unknown', 'a'])
+    dataset.load_all()
+    assert reads == [['b'], ['a', 'd'], ['c', 'e']]
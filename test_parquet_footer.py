@@ -0,0 +1,79 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from data_analyzer import DataAnalyzer
+from parquet_footer import footer_column_types, footer_missing_data, read_parquet_footer
+
+rng = np.random.default_rng(0)
+ROWS = 1000
+FRAME = pd.DataFrame({
+    'id': np.arange(ROWS),
+    'value': rng.normal(size=ROWS),
+    'gaps': np.where(rng.random(ROWS) < 0.1, np.nan, rng.random(ROWS)),
+    'label': rng.choice(['a', 'b', 'c', None], ROWS),
+    'when': pd.date_range('2024-01-01', periods=ROWS, freq='min'),
+    'tags': [[i] if i % 3 else None for i in range(ROWS)],
+})
+
+
+def parquet_bytes(df, **kwargs):
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df), buffer, **kwargs)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('row_group_size', [None, 128])
+def test_footer_matches_loaded_frame(row_group_size):
+    content = parquet_bytes(FRAME, row_group_size=row_group_size)
+    footer = read_parquet_footer(content)
+    loaded = pd.read_parquet(io.BytesIO(content))
+    assert footer['rows'] == len(loaded)
+    assert footer['row_groups'] == (1 if row_group_size is None else -(-ROWS // row_group_size))
+    assert footer['columns'] == list(loaded.columns)
+    for col in ['id', 'value', 'gaps', 'label', 'when']:
+        stats = footer['column_stats'][col]
+        assert stats['null_count'] == loaded[col].isnull().sum(), col
+        assert stats['min'] == loaded[col].min() and stats['max'] == loaded[col].max(), col
+        assert stats['dtype'] == str(loaded[col].dtype), col
+
+
+def test_footer_column_types_match_analyzer():
+    content = parquet_bytes(FRAME)
+    footer = read_parquet_footer(content)
+    analyzer = DataAnalyzer(pd.read_parquet(io.BytesIO(content)))
+    assert footer['numeric_columns'] == analyzer.numeric_columns
+    # Lists are not hashable, so they are not counted like categories
+    assert footer['categorical_columns'] == ['label']
+    table = footer_column_types(footer, footer['columns'])
+    assert list(table.index) == footer['columns']
+    assert table.loc['id', 'min'] == '0' and table.loc['id', 'max'] == str(ROWS - 1)
+
+
+def test_footer_missing_data_matches_analyzer():
+    content = parquet_bytes(FRAME, row_group_size=300)
+    footer = read_parquet_footer(content)
+    loaded = pd.read_parquet(io.BytesIO(content))
+    scalar_columns = ['id', 'value', 'gaps', 'label', 'when']
+    expected = DataAnalyzer(loaded[scalar_columns]).get_missing_data_info()
+    pd.testing.assert_frame_equal(footer_missing_data(footer, scalar_columns), expected, check_names=False)
+    # The nested column has no footer statistics and is counted from its loaded values
+    assert footer['column_stats']['tags']['null_count'] is None
+    assert footer_missing_data(footer, footer['columns']) is None
+    missing = footer_missing_data(footer, footer['columns'], load_columns=lambda columns: loaded[columns])
+    assert missing.loc['tags', 'missing_count'] == loaded['tags'].isnull().sum()
+
+
+def test_index_columns_are_not_data_columns():
+    content = parquet_bytes(FRAME.set_index('id'))
+    assert 'id' not in read_parquet_footer(content)['columns']
+
+
+def test_invalid_content():
+    with pytest.raises(ValueError, match="Invalid Parquet file"):
+        read_parquet_footer(b'not a parquet file')
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analyzer import DataAnalyzer
+from lazy_dataset import LazyDataset
+from results_store import ResultsStore
+from visualizer import JSONVisualizer
+
+rng = np.random.default_rng(0)
+SOURCE = pd.DataFrame({'a': rng.normal(size=500), 'b': rng.normal(size=500), 'c': rng.normal(size=500),
+                       'label': rng.choice(['x', 'y', 'z'], 500)})
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Count the correlation and value count computations."""
+    counts = {'corr': 0, 'value_counts': 0}
+
+    def counting(name, method):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return method(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(pd.DataFrame, 'corr', counting('corr', pd.DataFrame.corr))
+    monkeypatch.setattr(pd.Series, 'value_counts', counting('value_counts', pd.Series.value_counts))
+    return counts
+
+
+def make_dataset():
+    return LazyDataset(lambda columns: SOURCE[columns].copy(), list(SOURCE.columns))
+
+
+def test_analyzer_and_visualizer_of_a_dataframe_share_results(calls):
+    store = ResultsStore()
+    analyzer = DataAnalyzer(SOURCE, results_store=store)
+    visualizer = JSONVisualizer(SOURCE, results_store=store)
+    assert visualizer.backend is visualizer.backend
+    expected = analyzer.get_correlation_matrix()
+    visualizer.create_correlation_heatmap(analyzer.numeric_columns)
+    assert calls['corr'] == 1
+    assert analyzer.get_categorical_summary()['label']['top_values'] == SOURCE['label'].value_counts().head(5).to_dict()
+    calls['value_counts'] = 0
+    visualizer.create_bar_chart('label')
+    visualizer.create_pie_chart('label')
+    assert calls['value_counts'] == 0
+    pd.testing.assert_frame_equal(expected, SOURCE[['a', 'b', 'c']].corr())
+
+
+def test_column_selection_shares_results_with_dataset_visualizer(calls):
+    store = ResultsStore()
+    dataset = make_dataset()
+    selection = ['a', 'c', 'label']
+    # A frame of the selected columns, as the app analyzes, and a visualizer over the whole dataset
+    df = dataset.fetch(selection)[selection]
+    analyzer = DataAnalyzer(df, results_store=store, results_key=dataset)
+    visualizer = JSONVisualizer(dataset, results_store=store)
+    analyzer.get_correlation_matrix()
+    # Charts load another column into the dataset's frame
+    visualizer.create_histogram('b')
+    visualizer.create_correlation_heatmap(analyzer.numeric_columns)
+    assert calls['corr'] == 1
+    analyzer.get_categorical_summary()
+    counted = calls['value_counts']
+    visualizer.create_bar_chart('label')
+    assert calls['value_counts'] == counted
+
+
+def test_different_datasets_do_not_share_results(calls):
+    store = ResultsStore()
+    first, second = make_dataset(), make_dataset()
+    DataAnalyzer(first.fetch(['a', 'b'])[['a', 'b']], results_store=store, results_key=first).get_correlation_matrix()
+    JSONVisualizer(second, results_store=store).create_correlation_heatmap(['a', 'b'])
+    assert calls['corr'] == 2
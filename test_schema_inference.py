@@ -0,0 +1,86 @@
+from schema_inference import SchemaNode, infer_json_schema, infer_schema_from_records, WILDCARD_PROPERTY
+
+RECORDS = [
+    {'id': 1, 'name': 'a', 'score': 1.5, 'tags': ['x']},
+    {'id': 2, 'name': None, 'score': 2, 'tags': []},
+    {'id': '3', 'score': 'high', 'extra': {'nested': True}},
+    {'id': 4, 'name': 'd', 'score': 3.5, 'tags': ['y', 'z', 'w']},
+]
+
+
+def test_mixed_types_are_merged():
+    items = infer_json_schema(RECORDS)['items']
+    assert items['type'] == 'object' and items['count'] == 4
+    properties = items['properties']
+    assert properties['id']['type'] == ['int', 'str']
+    assert properties['id']['types'] == {'int': 3, 'str': 1}
+    assert properties['score']['type'] == ['float', 'int', 'str']
+    assert properties['name']['type'] == 'str' and properties['name']['nullable']
+    assert properties['name']['presence'] == 0.75
+    assert properties['extra']['presence'] == 0.25
+    assert properties['extra']['properties']['nested']['type'] == 'bool'
+    tags = properties['tags']
+    assert (tags['min_length'], tags['max_length']) == (0, 3)
+    assert tags['items']['type'] == 'str' and tags['items']['count'] == 4
+
+
+def test_merge_matches_single_pass():
+    left, right = SchemaNode(), SchemaNode()
+    left.observe_many(RECORDS[:2])
+    right.observe_many(RECORDS[2:])
+    left.merge(right)
+    whole = SchemaNode()
+    whole.observe_many(RECORDS)
+    assert left.to_dict() == whole.to_dict()
+
+
+def test_keys_beyond_max_properties_collapse_into_wildcard():
+    records = [{f'key{i}': i for i in range(start, start + 5)} for start in range(0, 50, 5)]
+    properties = infer_json_schema(records, max_properties=10)['items']['properties']
+    assert len(properties) == 11
+    assert [f'key{i}' for i in range(10)] == [key for key in properties if key != WILDCARD_PROPERTY]
+    wildcard = properties[WILDCARD_PROPERTY]
+    assert wildcard['count'] == 40 and wildcard['type'] == 'int'
+    assert wildcard['presence'] is None
+
+
+def test_wildcard_limit_applies_to_nested_objects():
+    document = {'users': {f'user{i}': {'age': i} for i in range(20)}}
+    users = infer_json_schema(document, max_properties=5)['properties']['users']['properties']
+    assert len(users) == 6
+    assert users[WILDCARD_PROPERTY]['properties']['age']['count'] == 15
+
+
+def test_reservoir_sample_size():
+    records = ({'id': i, 'odd': i % 2 == 1} for i in range(10000))
+    schema = infer_schema_from_records(records, sample_size=100)
+    assert (schema['size'], schema['sampled']) == (10000, 100)
+    assert schema['items']['count'] == 100
+    small = infer_schema_from_records(RECORDS, sample_size=100)
+    assert (small['size'], small['sampled']) == (4, 4)
+    assert small['items'] == infer_json_schema(RECORDS)['items']
+
+
+def test_reservoir_sample_is_reproducible_and_uniform(monkeypatch):
+    observed = []
+    original = SchemaNode.observe_many
+
+    def recording(node, values):
+        if values and isinstance(values[0], dict):
+            observed.append([value['id'] for value in values])
+        return original(node, values)
+
+    monkeypatch.setattr(SchemaNode, 'observe_many', recording)
+    records = [{'id': i} for i in range(10000)]
+    infer_schema_from_records(records, sample_size=1000, random_state=3)
+    infer_schema_from_records(records, sample_size=1000, random_state=3)
+    first, second = observed
+    assert first == second
+    assert len(set(first)) == 1000
+    # Later records are as likely to be kept as earlier ones
+    assert 4000 < sum(first) / len(first) < 6000
+    assert sum(record_id >= 9000 for record_id in first) > 50
+
+
+def test_empty_records():
+    assert infer_schema_from_records([]) == {'type': 'array', 'size': 0, 'sampled': 0}
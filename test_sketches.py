@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sketches import CategoricalSketch, HyperLogLog, SpaceSaving
+
+
+def skewed(values, n=60000, seed=0):
+    """Values with distinct frequencies, so the top values have no ties."""
+    weights = np.arange(len(values), 0, -1, dtype=float) ** 2
+    return np.random.default_rng(seed).choice(np.array(values, dtype=object), n, p=weights / weights.sum())
+
+
+COLUMNS = {
+    'bool': pd.Series(skewed([True, False]), dtype=object),
+    'int': pd.Series(skewed(list(range(40)))).astype('int64'),
+    'str': pd.Series(skewed([f"value {i}" for i in range(40)])).astype(str),
+}
+
+
+@pytest.mark.parametrize('name', list(COLUMNS))
+def test_top_values_match_value_counts(name):
+    series = COLUMNS[name].rename(name)
+    chunks = [series.iloc[start:start + 7000].to_frame() for start in range(0, len(series), 7000)]
+    summary = CategoricalSketch.from_chunks(chunks).get_categorical_summary()[name]
+    expected = series.value_counts()
+    # Fewer distinct values than counters: the sketch is exact
+    assert summary['top_values'] == expected.head(5).to_dict()
+    assert summary['top_values_error'] == 0
+    assert summary['unique_values'] == len(expected)
+
+
+@pytest.mark.parametrize('name', list(COLUMNS))
+def test_merged_summaries_match_value_counts(name):
+    series = COLUMNS[name]
+    left, right = SpaceSaving(), SpaceSaving()
+    left.update(series.iloc[:30000])
+    right.update(series.iloc[30000:])
+    left.merge(right)
+    expected = series.value_counts()
+    assert left.top(len(expected)) == expected.to_dict()
+    assert left.errors.index.equals(left.counts.index)
+    assert left.total_count == len(series)
+
+
+def test_heavy_hitters_survive_truncation():
+    rng = np.random.default_rng(1)
+    series = pd.Series(np.concatenate([np.repeat(['a', 'b', 'c'], [30000, 20000, 10000]),
+                                       [f"rare {i}" for i in rng.integers(0, 5000, 20000)]]))
+    sketch = SpaceSaving(capacity=50)
+    for start in range(0, len(series), 4000):
+        sketch.update(series.iloc[start:start + 4000])
+    top = sketch.top(3)
+    assert list(top) == ['a', 'b', 'c']
+    for value, count in top.items():
+        # Estimates overcount by at most the reported error
+        exact = int((series == value).sum())
+        assert exact <= count <= exact + sketch.max_error
+
+
+def test_unique_count_within_error():
+    series = pd.Series([f"id {i}" for i in range(200000)])
+    sketch = HyperLogLog()
+    for start in range(0, len(series), 50000):
+        sketch.update(series.iloc[start:start + 50000])
+    assert abs(sketch.estimate() - len(series)) <= 4 * sketch.relative_error * len(series)
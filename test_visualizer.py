@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compute_backend import compute_histogram_bins, BIN_STRATEGIES
+from visualizer import JSONVisualizer, downsample_points
+
+rng = np.random.default_rng(0)
+VALUES = np.concatenate([rng.lognormal(size=5000), [np.nan, np.inf, -np.inf]])
+FINITE = VALUES[np.isfinite(VALUES)]
+FRAME = pd.DataFrame({'value': VALUES, 'label': rng.choice(['a', 'b'], len(VALUES))})
+
+
+@pytest.mark.parametrize('strategy', BIN_STRATEGIES)
+def test_bin_counts_sum_to_finite_values(strategy):
+    counts, edges = compute_histogram_bins(VALUES, bins=30, strategy=strategy)
+    assert counts.sum() == len(FINITE)
+    assert len(edges) == len(counts) + 1
+    assert np.all(np.diff(edges) > 0)
+    assert edges[0] == FINITE.min() and edges[-1] == FINITE.max()
+
+
+def test_fixed_bins_match_numpy():
+    counts, edges = compute_histogram_bins(VALUES, bins=30)
+    expected_counts, expected_edges = np.histogram(FINITE, bins=30)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_quantile_bins_hold_similar_counts():
+    counts, _ = compute_histogram_bins(VALUES, bins=10, strategy='quantile')
+    assert len(counts) == 10
+    assert counts.max() - counts.min() <= 2
+
+
+def test_degenerate_values():
+    counts, edges = compute_histogram_bins(np.array([np.nan, np.inf]))
+    assert len(counts) == 0 and len(edges) == 0
+    for strategy in BIN_STRATEGIES:
+        counts, _ = compute_histogram_bins(np.full(10, 3.0), bins=5, strategy=strategy)
+        assert counts.sum() == 10
+    with pytest.raises(ValueError, match="Unknown bin strategy"):
+        compute_histogram_bins(VALUES, strategy='sturges')
+
+
+@pytest.mark.parametrize('strategy', BIN_STRATEGIES)
+def test_binned_histogram_sends_one_bar_per_bin(strategy):
+    fig = JSONVisualizer(FRAME).create_binned_histogram('value', bins=25, bin_strategy=strategy)
+    counts, edges = compute_histogram_bins(VALUES, bins=25, strategy=strategy)
+    bar = fig.data[0]
+    np.testing.assert_array_equal(bar.y, counts)
+    np.testing.assert_allclose(bar.width, np.diff(edges))
+    np.testing.assert_allclose(bar.x, (edges[:-1] + edges[1:]) / 2)
+
+
+def test_histogram_is_prebinned_on_request():
+    visualizer = JSONVisualizer(FRAME)
+    assert visualizer.create_histogram('value', prebinned=True).data[0].type == 'bar'
+    assert visualizer.create_histogram('value').data[0].type == 'histogram'
+    with pytest.raises(ValueError, match="not numeric"):
+        visualizer.create_binned_histogram('label')
+
+
+def scatter_frame(rows=20000):
+    generator = np.random.default_rng(1)
+    labels = np.where(generator.random(rows) < 0.002, 'rare', generator.choice(['common', 'frequent'], rows))
+    return pd.DataFrame({'x': generator.normal(size=rows), 'y': generator.normal(size=rows),
+                         'weight': generator.random(rows), 'label': labels})
+
+
+@pytest.mark.parametrize('max_points', [50, 500, 5000])
+def test_downsample_respects_point_cap(max_points):
+    df = scatter_frame()
+    sample = downsample_points(df, 'x', 'y', max_points)
+    assert len(sample) == max_points
+    assert sample.index.is_monotonic_increasing and sample.index.is_unique
+    assert sample.index.isin(df.index).all()
+
+
+def test_downsample_keeps_outliers_and_every_category():
+    df = scatter_frame()
+    sample = downsample_points(df, 'x', 'y', 1000, stratify_column='label')
+    assert len(sample) <= 1000
+    assert set(sample['label']) == set(df['label'])
+    # The extremes of both axes are kept
+    for column in ['x', 'y']:
+        assert df[column].idxmin() in sample.index and df[column].idxmax() in sample.index
+
+
+def test_downsample_small_data_drops_only_missing_points():
+    df = scatter_frame(100)
+    df.loc[[3, 7], 'x'] = np.nan
+    sample = downsample_points(df, 'x', 'y', 1000)
+    assert list(sample.index) == [i for i in df.index if i not in (3, 7)]
+
+
+def test_density_plot_counts_every_point():
+    df = scatter_frame()
+    fig = JSONVisualizer(df).create_density_plot('x', 'y', grid_size=50)
+    assert np.nansum(np.asarray(fig.data[0].z, dtype=float)) == len(df)
+
+
+def test_density_plot_colors():
+    df = scatter_frame()
+    visualizer = JSONVisualizer(df)
+    means = np.asarray(visualizer.create_density_plot('x', 'y', 'weight', grid_size=20).data[0].z, dtype=float)
+    assert np.nanmin(means) >= 0 and np.nanmax(means) <= 1
+    heatmap = visualizer.create_density_plot('x', 'y', 'label', grid_size=20).data[0]
+    assert set(heatmap.colorbar.ticktext) == set(df['label'])
+
+
+def test_scatter_large_data_modes():
+    df = scatter_frame()
+    visualizer = JSONVisualizer(df)
+    assert visualizer.create_scatter_plot('x', 'y', max_points=1000).data[0].type == 'heatmap'
+    sampled = visualizer.create_scatter_plot('x', 'y', 'label', max_points=1000)
+    assert sum(len(trace.x) for trace in sampled.data) <= 1000
+    assert {trace.name for trace in sampled.data} == set(df['label'])
@@ -1,42 +1,270 @@
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import List, Optional, Union
 import numpy as np
+from results_store import ResultsStore, default_results_store
+from lazy_dataset import LazyDataset
+from compute_backend import ComputeBackend, PandasBackend
+from instrumentation import traced
+
+
+# Above this many rows histograms are binned on the server instead of in the browser
+PREBIN_THRESHOLD = 100000
+
+# Above this many points scatter plots switch to a large-data mode
+SCATTER_POINT_THRESHOLD = 50000
+
+SCATTER_MODES = ['density', 'sample']
+
+# Categories shown individually in density plots colored by a categorical column
+MAX_DENSITY_CATEGORIES = 10
+
+
+def downsample_points(df: pd.DataFrame, x_column: str, y_column: str, max_points: int,
+                      stratify_column: Optional[str] = None, grid_size: int = 64,
+                      outlier_quantile: float = 0.001, random_state: int = 0) -> pd.DataFrame:
+    """
+    Downsample rows for a scatter plot while preserving its shape and outliers.
+    
+    Points beyond the outlier quantiles of either axis are always kept (as far as
+    the budget allows). The remaining budget is spread over a grid of x/y cells
+    (and categories of stratify_column) with an equal per-cell quota, so sparse
+    regions keep all their points and only dense regions are thinned.
+    
+    Args:
+        df (pd.DataFrame): Data to sample
+        x_column (str): Column for the x-axis
+        y_column (str): Column for the y-axis
+        max_points (int): Maximum number of rows to return
+        stratify_column (str, optional): Categorical column sampled per category
+        grid_size (int): Number of grid cells along each axis
+        outlier_quantile (float): Tail fraction of each axis treated as outliers
+        random_state (int): Seed for reproducible samples
+        
+    Returns:
+        pd.DataFrame: At most max_points rows of df, in original order
+    """
+    x = df[x_column].to_numpy(dtype=float, na_value=np.nan)
+    y = df[y_column].to_numpy(dtype=float, na_value=np.nan)
+    rows = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(rows) <= max_points:
+        return df.iloc[rows]
+    x, y = x[rows], y[rows]
+    rng = np.random.default_rng(random_state)
+    
+    # Always keep the tails of both axes, sampling them only if they alone exceed the budget
+    x_low, x_high = np.quantile(x, [outlier_quantile, 1 - outlier_quantile])
+    y_low, y_high = np.quantile(y, [outlier_quantile, 1 - outlier_quantile])
+    is_outlier = (x < x_low) | (x > x_high) | (y < y_low) | (y > y_high)
+    outliers = np.flatnonzero(is_outlier)
+    if len(outliers) > max_points // 2:
+        outliers = rng.choice(outliers, max_points // 2, replace=False)
+    budget = max_points - len(outliers)
+    
+    # Stratify the remaining points by grid cell (and category)
+    inliers = np.flatnonzero(~is_outlier)
+    x_bin = np.clip(((x[inliers] - x_low) / ((x_high - x_low) or 1) * grid_size).astype(int), 0, grid_size - 1)
+    y_bin = np.clip(((y[inliers] - y_low) / ((y_high - y_low) or 1) * grid_size).astype(int), 0, grid_size - 1)
+    strata = x_bin * grid_size + y_bin
+    if stratify_column is not None:
+        codes = pd.factorize(df[stratify_column].iloc[rows[inliers]])[0] + 1
+        strata = codes.astype(np.int64) * grid_size * grid_size + strata
+    strata = pd.factorize(strata)[0]
+    counts = np.bincount(strata)
+    
+    # Largest per-stratum quota that fits the budget
+    low, high = 0, int(counts.max())
+    while low < high:
+        quota = (low + high + 1) // 2
+        if np.minimum(counts, quota).sum() <= budget:
+            low = quota
+        else:
+            high = quota - 1
+    
+    order = rng.permutation(len(inliers))
+    rank = pd.Series(strata[order]).groupby(strata[order]).cumcount().to_numpy()
+    selected = rank < low
+    # Spend what is left of the budget on one more point from randomly chosen strata
+    remaining = budget - int(selected.sum())
+    candidates = np.flatnonzero(rank == low)
+    if remaining > 0 and len(candidates):
+        selected[rng.choice(candidates, min(remaining, len(candidates)), replace=False)] = True
+    kept = inliers[order[selected]]
+    keep = np.sort(np.concatenate([outliers, kept]))
+    return df.iloc[rows[keep]]
+
+
+def _plotted_rows(visualizer: 'JSONVisualizer', *args, **kwargs) -> Optional[int]:
+    """Rows available to a chart method, recorded with its span."""
+    if visualizer.dataset is not None and not visualizer.dataset.loaded_columns:
+        # Unknown until the chart loads its first columns
+        return None
+    return len(visualizer.df)
 
 
 class JSONVisualizer:
-    """Visualizer for JSON data that creates interactive plots."""
+    """Visualizer for JSON data that creates interactive plots.
+    
+    Aggregated charts (binned histograms, bar and pie charts, correlation heatmaps)
+    are computed by a ComputeBackend, so with a backend querying a file only their
+    results are read; other charts read the columns they plot.
+    """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: Union[pd.DataFrame, LazyDataset, ComputeBackend],
+                 results_store: Optional[ResultsStore] = None):
         """
         Initialize the visualizer with a DataFrame.
         
         Args:
-            df (pd.DataFrame): DataFrame to visualize
+            df (pd.DataFrame, LazyDataset or ComputeBackend): Data to visualize; columns
+                of a LazyDataset or a file queried by a backend are loaded the first
+                time a plot uses them
+            results_store (ResultsStore, optional): Store for results shared with
+                analyzers of the same DataFrame; the default store if omitted
         """
-        self.df = df
+        self.results_store = results_store if results_store is not None else default_results_store
+        # Backend of aggregated charts over the data in memory; for a LazyDataset it is
+        # built on first use, since nothing is read until a plot needs it
+        self._pandas_backend = None
+        if isinstance(df, PandasBackend):
+            self._pandas_backend = df
+            df = df.df
+        elif isinstance(df, pd.DataFrame):
+            self._pandas_backend = PandasBackend(df, results_store=self.results_store)
+        self.dataset = df if isinstance(df, LazyDataset) else None
+        self._backend = df if isinstance(df, ComputeBackend) else None
+        if self._backend is not None:
+            df = pd.DataFrame(index=pd.RangeIndex(self._backend.row_count))
+        self._df = df if self.dataset is None else None
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """Data to visualize; for a LazyDataset or backend, a frame of the columns loaded so far."""
+        # Nothing is read from a LazyDataset until a plot needs it
+        return self.dataset.frame if self.dataset is not None else self._df
+    
+    @property
+    def backend(self) -> ComputeBackend:
+        """Backend computing aggregated charts; pandas over df unless a backend was given."""
+        if self._backend is not None:
+            return self._backend
+        if self._pandas_backend is None:
+            # The dataset's frame grows in place, so one backend serves every plot; results
+            # are stored under the dataset and shared with analyzers of its column selections
+            self._pandas_backend = PandasBackend(self.dataset.frame, results_store=self.results_store,
+                                                 results_key=self.dataset)
+        return self._pandas_backend
+    
+    @property
+    def columns(self) -> List[str]:
+        """Columns aggregated charts can use without loading them."""
+        return self._backend.columns if self._backend is not None else list(self.df.columns)
     
-    def create_histogram(self, column: str, title: Optional[str] = None) -> go.Figure:
+    def _require(self, *columns: Optional[str], aggregated: bool = False):
+        """
+        Load columns of a lazy dataset that a plot is about to use.
+        
+        Args:
+            columns (str): Column names; None and unknown names are skipped
+            aggregated (bool): The plot only uses backend aggregates of the columns,
+                which a backend computes without loading them
+        """
+        if self.dataset is not None:
+            self.dataset.fetch(columns)
+        elif self._backend is not None and not aggregated:
+            missing = [col for col in dict.fromkeys(columns)
+                       if col is not None and col in self._backend.columns and col not in self._df.columns]
+            if missing:
+                self._df = pd.concat([self._df, self._backend.to_pandas(missing)], axis=1)
+    
+    def _is_numeric(self, column: str) -> bool:
+        if self._backend is not None:
+            return column in self._backend.numeric_columns()
+        return pd.api.types.is_numeric_dtype(self.df[column])
+    
+    def _value_counts(self, column: str) -> pd.Series:
+        """Get value counts of a column, shared with analyzers through the results store."""
+        counts = self.backend.value_counts([column])[column]
+        if counts is None:
+            raise ValueError(f"Column '{column}' has values that cannot be counted")
+        return counts
+    
+    @traced('visualizer.histogram', rows=_plotted_rows)
+    def create_histogram(self, column: str, title: Optional[str] = None,
+                         prebinned: Optional[bool] = None, bins: int = 50,
+                         bin_strategy: str = 'fixed') -> go.Figure:
         """
         Create a histogram for a numeric column.
         
         Args:
             column (str): Column name to plot
             title (str, optional): Plot title
+            prebinned (bool, optional): Bin on the server and send only bar data;
+                by default enabled above PREBIN_THRESHOLD rows
+            bins (int): Number of bins when prebinned
+            bin_strategy (str): Bin strategy when prebinned ('fixed', 'fd' or 'quantile')
             
         Returns:
             go.Figure: Plotly figure object
         """
-        if column not in self.df.columns:
+        self._require(column, aggregated=True)
+        if column not in self.columns:
             raise ValueError(f"Column '{column}' not found in DataFrame")
         
         if title is None:
             title = f'Distribution of {column}'
-            
+        
+        if prebinned is None:
+            prebinned = len(self.df) > PREBIN_THRESHOLD
+        if prebinned:
+            return self.create_binned_histogram(column, title, bins, bin_strategy)
+        
+        self._require(column)
         fig = px.histogram(self.df, x=column, title=title)
         return fig
     
+    @traced('visualizer.binned_histogram', rows=_plotted_rows)
+    def create_binned_histogram(self, column: str, title: Optional[str] = None,
+                                bins: int = 50, bin_strategy: str = 'fixed') -> go.Figure:
+        """
+        Create a histogram from bin counts computed on the server.
+        
+        Only one bar per bin is sent to the browser, so the figure size does not
+        grow with the number of rows.
+        
+        Args:
+            column (str): Column name to plot
+            title (str, optional): Plot title
+            bins (int): Number of bins for the 'fixed' and 'quantile' strategies
+            bin_strategy (str): 'fixed', 'fd' (Freedman-Diaconis) or 'quantile'
+            
+        Returns:
+            go.Figure: Plotly figure object
+        """
+        self._require(column, aggregated=True)
+        if column not in self.columns:
+            raise ValueError(f"Column '{column}' not found in DataFrame")
+        if not self._is_numeric(column):
+            raise ValueError(f"Column '{column}' is not numeric")
+        
+        if title is None:
+            title = f'Distribution of {column}'
+        
+        counts, edges = self.backend.histogram(column, bins, bin_strategy)
+        fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            customdata=np.column_stack([edges[:-1], edges[1:]]),
+            hovertemplate='%{customdata[0]:.4g} to %{customdata[1]:.4g}<br>Count: %{y}<extra></extra>'
+        ))
+        fig.update_layout(title=title, bargap=0)
+        fig.update_xaxes(title_text=column)
+        fig.update_yaxes(title_text='count')
+        return fig
+    
+    @traced('visualizer.bar_chart', rows=_plotted_rows)
     def create_bar_chart(self, column: str, title: Optional[str] = None) -> go.Figure:
         """
         Create a bar chart for a categorical column.
@@ -48,48 +276,163 @@ class JSONVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
-        if column not in self.df.columns:
+        self._require(column, aggregated=True)
+        if column not in self.columns:
             raise ValueError(f"Column '{column}' not found in DataFrame")
         
         if title is None:
             title = f'Count of {column}'
         
-        value_counts = self.df[column].value_counts().head(20)  # Limit to top 20
+        value_counts = self._value_counts(column).head(20)  # Limit to top 20
         fig = px.bar(x=value_counts.index, y=value_counts.values, title=title)
         fig.update_xaxes(title_text=column)
         fig.update_yaxes(title_text='Count')
         return fig
     
+    @traced('visualizer.scatter_plot', rows=_plotted_rows)
     def create_scatter_plot(self, x_column: str, y_column: str, 
                            color_column: Optional[str] = None,
-                           title: Optional[str] = None) -> go.Figure:
+                           title: Optional[str] = None,
+                           large_data_mode: Optional[str] = None,
+                           max_points: int = SCATTER_POINT_THRESHOLD) -> go.Figure:
         """
         Create a scatter plot for two numeric columns.
         
+        Above max_points rows a large-data mode is chosen automatically: a density
+        heatmap, or a downsample when coloring by a categorical column.
+        
         Args:
             x_column (str): Column name for x-axis
             y_column (str): Column name for y-axis
             color_column (str, optional): Column name for color coding
             title (str, optional): Plot title
+            large_data_mode (str, optional): Force 'density' or 'sample' mode
+            max_points (int): Point threshold for the automatic mode and sample size
             
         Returns:
             go.Figure: Plotly figure object
         """
+        self._require(x_column, y_column, color_column)
         if x_column not in self.df.columns:
             raise ValueError(f"Column '{x_column}' not found in DataFrame")
         if y_column not in self.df.columns:
             raise ValueError(f"Column '{y_column}' not found in DataFrame")
+        if large_data_mode is not None and large_data_mode not in SCATTER_MODES:
+            raise ValueError(f"Unknown scatter mode '{large_data_mode}'. Use one of: {', '.join(SCATTER_MODES)}")
         
         if title is None:
             title = f'{y_column} vs {x_column}'
+        
+        if not (color_column and color_column in self.df.columns):
+            color_column = None
+        color_is_numeric = color_column is not None and pd.api.types.is_numeric_dtype(self.df[color_column])
+        
+        if large_data_mode is None and len(self.df) > max_points:
+            large_data_mode = 'density' if color_column is None or color_is_numeric else 'sample'
+        if large_data_mode == 'density':
+            return self.create_density_plot(x_column, y_column, color_column, title)
+        
+        data = self.df
+        if large_data_mode == 'sample':
+            data = downsample_points(self.df, x_column, y_column, max_points,
+                                     stratify_column=None if color_is_numeric else color_column)
+            title = f'{title} (sample of {len(data):,} of {len(self.df):,} points)'
             
-        if color_column and color_column in self.df.columns:
-            fig = px.scatter(self.df, x=x_column, y=y_column, color=color_column, title=title)
+        if color_column:
+            fig = px.scatter(data, x=x_column, y=y_column, color=color_column, title=title)
         else:
-            fig = px.scatter(self.df, x=x_column, y=y_column, title=title)
+            fig = px.scatter(data, x=x_column, y=y_column, title=title)
+            
+        return fig
+    
+    @traced('visualizer.density_plot', rows=_plotted_rows)
+    def create_density_plot(self, x_column: str, y_column: str,
+                            color_column: Optional[str] = None,
+                            title: Optional[str] = None,
+                            grid_size: int = 200) -> go.Figure:
+        """
+        Create a 2D density heatmap of two numeric columns with counts computed on the server.
+        
+        Without a color column each cell shows its point count. A numeric color
+        column is shown as its mean per cell; a categorical one as the most
+        frequent category per cell.
+        
+        Args:
+            x_column (str): Column name for x-axis
+            y_column (str): Column name for y-axis
+            color_column (str, optional): Column name for color coding
+            title (str, optional): Plot title
+            grid_size (int): Number of cells along each axis
             
+        Returns:
+            go.Figure: Plotly figure object
+        """
+        self._require(x_column, y_column, color_column)
+        if x_column not in self.df.columns:
+            raise ValueError(f"Column '{x_column}' not found in DataFrame")
+        if y_column not in self.df.columns:
+            raise ValueError(f"Column '{y_column}' not found in DataFrame")
+        
+        if title is None:
+            title = f'{y_column} vs {x_column}'
+        
+        x = self.df[x_column].to_numpy(dtype=float, na_value=np.nan)
+        y = self.df[y_column].to_numpy(dtype=float, na_value=np.nan)
+        valid = np.isfinite(x) & np.isfinite(y)
+        if not valid.any():
+            raise ValueError(f"No numeric values to plot for '{x_column}' and '{y_column}'")
+        x_edges = np.histogram_bin_edges(x[valid], bins=grid_size)
+        y_edges = np.histogram_bin_edges(y[valid], bins=grid_size)
+        x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+        y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+        counts, _, _ = np.histogram2d(x[valid], y[valid], bins=[x_edges, y_edges])
+        
+        if color_column is None or color_column not in self.df.columns:
+            z = np.where(counts > 0, counts, np.nan).T
+            heatmap = go.Heatmap(x=x_centers, y=y_centers, z=z, colorscale='Viridis',
+                                 colorbar=dict(title='count'),
+                                 hovertemplate=f'{x_column}: %{{x}}<br>{y_column}: %{{y}}<br>Count: %{{z}}<extra></extra>')
+        elif pd.api.types.is_numeric_dtype(self.df[color_column]):
+            color = self.df[color_column].to_numpy(dtype=float, na_value=np.nan)
+            has_color = valid & np.isfinite(color)
+            sums, _, _ = np.histogram2d(x[has_color], y[has_color], bins=[x_edges, y_edges], weights=color[has_color])
+            color_counts, _, _ = np.histogram2d(x[has_color], y[has_color], bins=[x_edges, y_edges])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                z = np.where(color_counts > 0, sums / color_counts, np.nan).T
+            heatmap = go.Heatmap(x=x_centers, y=y_centers, z=z, colorscale='Viridis',
+                                 colorbar=dict(title=f'mean {color_column}'),
+                                 hovertemplate=f'{x_column}: %{{x}}<br>{y_column}: %{{y}}<br>Mean {color_column}: %{{z}}<extra></extra>')
+        else:
+            categories = self.df[color_column][valid].astype(str)
+            top = list(categories.value_counts().head(MAX_DENSITY_CATEGORIES).index)
+            if categories.nunique() > len(top):
+                categories = categories.where(categories.isin(top), 'Other')
+                top.append('Other')
+            per_category = np.stack([
+                np.histogram2d(x[valid][(categories == category).to_numpy()], y[valid][(categories == category).to_numpy()],
+                               bins=[x_edges, y_edges])[0]
+                for category in top
+            ])
+            dominant = np.where(counts > 0, per_category.argmax(axis=0), -1).T
+            z = np.where(dominant >= 0, dominant, np.nan)
+            labels = np.where(dominant >= 0, np.array(top, dtype=object)[np.maximum(dominant, 0)], '')
+            palette = px.colors.qualitative.Plotly
+            colorscale = []
+            for i in range(len(top)):
+                colorscale.append([i / len(top), palette[i % len(palette)]])
+                colorscale.append([(i + 1) / len(top), palette[i % len(palette)]])
+            heatmap = go.Heatmap(x=x_centers, y=y_centers, z=z, customdata=labels, colorscale=colorscale,
+                                 zmin=-0.5, zmax=len(top) - 0.5,
+                                 colorbar=dict(title=color_column, tickvals=list(range(len(top))), ticktext=top),
+                                 hovertemplate=f'{x_column}: %{{x}}<br>{y_column}: %{{y}}<br>Most frequent {color_column}: %{{customdata}}<extra></extra>')
+        
+        fig = go.Figure(heatmap)
+        fig.update_layout(title=f'{title} (density of {int(valid.sum()):,} points)')
+        fig.update_xaxes(title_text=x_column)
+        fig.update_yaxes(title_text=y_column)
         return fig
     
+    @traced('visualizer.box_plot', rows=_plotted_rows)
     def create_box_plot(self, column: str, group_column: Optional[str] = None,
                        title: Optional[str] = None) -> go.Figure:
         """
@@ -103,6 +446,7 @@ class JSONVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
+        self._require(column, group_column)
         if column not in self.df.columns:
             raise ValueError(f"Column '{column}' not found in DataFrame")
         
@@ -116,6 +460,7 @@ class JSONVisualizer:
             
         return fig
     
+    @traced('visualizer.correlation_heatmap', rows=_plotted_rows)
     def create_correlation_heatmap(self, columns: Optional[List[str]] = None,
                                   title: Optional[str] = None) -> go.Figure:
         """
@@ -129,20 +474,24 @@ class JSONVisualizer:
             go.Figure: Plotly figure object
         """
         if columns:
-            numeric_df = self.df[columns].select_dtypes(include=[np.number])
+            self._require(*columns, aggregated=True)
+            numeric = set(self.backend.numeric_columns())
+            numeric_columns = [col for col in columns if col in numeric]
         else:
-            numeric_df = self.df.select_dtypes(include=[np.number])
+            numeric_columns = self.backend.numeric_columns()
         
-        if numeric_df.empty or len(numeric_df.columns) < 2:
+        if len(numeric_columns) < 2:
             raise ValueError("Not enough numeric columns for correlation heatmap")
         
         if title is None:
             title = 'Correlation Heatmap'
         
-        corr_matrix = numeric_df.corr()
+        # Shared with DataAnalyzer.get_correlation_matrix for the same columns
+        corr_matrix = self.backend.corr(numeric_columns)
         fig = px.imshow(corr_matrix, text_auto=True, title=title)
         return fig
     
+    @traced('visualizer.line_chart', rows=_plotted_rows)
     def create_line_chart(self, x_column: str, y_column: str,
                          title: Optional[str] = None) -> go.Figure:
         """
@@ -156,6 +505,7 @@ class JSONVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
+        self._require(x_column, y_column)
         if x_column not in self.df.columns:
             raise ValueError(f"Column '{x_column}' not found in DataFrame")
         if y_column not in self.df.columns:
@@ -167,6 +517,7 @@ class JSONVisualizer:
         fig = px.line(self.df, x=x_column, y=y_column, title=title)
         return fig
     
+    @traced('visualizer.pie_chart', rows=_plotted_rows)
     def create_pie_chart(self, column: str, title: Optional[str] = None) -> go.Figure:
         """
         Create a pie chart for a categorical column.
@@ -178,12 +529,13 @@ class JSONVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
-        if column not in self.df.columns:
+        self._require(column, aggregated=True)
+        if column not in self.columns:
             raise ValueError(f"Column '{column}' not found in DataFrame")
         
         if title is None:
             title = f'Distribution of {column}'
         
-        value_counts = self.df[column].value_counts().head(15)  # Limit to top 15
+        value_counts = self._value_counts(column).head(15)  # Limit to top 15
         fig = px.pie(values=value_counts.values, names=value_counts.index, title=title)
         return fig
\ No newline at end of file